@@ -1,13 +1,25 @@
 # File: app.py
 from config import Config
 from services.ChromeRemote import ChromeRemote
+from services.ChromeCdpRemote import ChromeCdpRemote
 from services.Browser import Browser
+from services.DomainScheduler import DomainScheduler
+from services.DriverLifecycleManager import DriverLifecycleManager
+from services.GridBalancer import GridBalancer
+from services.cache.PageCache import PageCache
+from services.HttpEngine import HttpEngine
+from services.ResourceBlocker import ResourceBlocker
+from services.StandbyPool import StandbyPool
 from model.OreillySite import OreillySite
+from services.session.AuthStateCache import AuthStateCache
 from services.session.SessionManager import SessionManager
+from services.session.SQLiteSessionStrategy import SQLiteSessionStrategy
 from services.utils.FileLogger import FileLogger
+from services.utils.Instrumentation import Instrumentation
+from services.utils.MetricsAggregator import MetricsAggregator
 
 # Initialize logger
-logger = FileLogger(log_file=Config.LOG_FILE, log_level=Config.LOG_LEVEL)
+logger = FileLogger(log_file=Config.LOG_FILE, log_level=Config.LOG_LEVEL, async_mode=Config.LOG_ASYNC)
 if __name__ == "__main__":
 
     # Log the start of the application
@@ -16,22 +28,64 @@ if __name__ == "__main__":
     browser = None;
     chrome = None;
     session_manager = None;
+    balancer = None
+    standby = None
+    instrumentation = Instrumentation()
+    metrics = MetricsAggregator().attach(instrumentation)
 
     try:
         # Set up ChromeRemote with specified options
         logger.log_debug("Initializing ChromeRemote.")
-        chrome = ChromeRemote(logger=logger, options=Config.BROWSER_OPTIONS)
+        blocker = ResourceBlocker.from_config(logger=logger)
+        balancer = GridBalancer.from_config(logger=logger) if Config.REMOTE_URLS else None
+        engine_class = ChromeCdpRemote if Config.BROWSER_ENGINE == 'cdp' else ChromeRemote
+        if Config.REATTACH_SESSION:
+            # Reuse the Grid session left running by the previous run, if it is still alive
+            chrome = engine_class.from_saved_session(logger=logger, options=Config.BROWSER_OPTIONS, blocker=blocker,
+                                                     balancer=balancer)
+        else:
+            chrome = engine_class(logger=logger, options=Config.BROWSER_OPTIONS, blocker=blocker, balancer=balancer)
 
         ## If there no need to store cookies for future sessions, then we can pass None
         logger.log_debug("Initializing SessionManager.")
-        session_manager = SessionManager(logger=logger)
+        session_manager = SessionManager(
+            strategy=SQLiteSessionStrategy if Config.SESSION_BACKEND == 'sqlite' else None,
+            logger=logger,
+            write_behind=Config.SESSION_WRITE_BEHIND,
+            flush_interval=Config.SESSION_FLUSH_INTERVAL,
+            flush_every=Config.SESSION_FLUSH_EVERY
+        )
 
         logger.log_debug("Initializing Browser.")        
-        browser = Browser(engine=chrome,logger=logger, session_manager=session_manager)
+        page_cache = PageCache.from_config(logger=logger) if Config.CACHE_ENABLED else None
+        http_engine = HttpEngine.from_config(session_manager=session_manager, logger=logger) if Config.HTTP_ENABLED else None
+        scheduler = DomainScheduler.from_config(logger=logger) if Config.SCHEDULER_ENABLED else None
+        lifecycle = None
+        if Config.DRIVER_LIFECYCLE_ENABLED:
+            # Replacement drivers are always new sessions, even when the first one was reattached
+            make_engine = lambda: engine_class(logger=logger, options=Config.BROWSER_OPTIONS, blocker=blocker, balancer=balancer)
+            engine_factory = make_engine
+            if Config.STANDBY_SIZE > 0:
+                # Keep warmed drivers ready, so a recycled or dead driver is replaced without startup time
+                standby = StandbyPool(
+                    browser_factory=lambda: Browser(engine=make_engine(), logger=logger,
+                                                    session_manager=SessionManager(
+                                                        strategy=SQLiteSessionStrategy if Config.SESSION_BACKEND == 'sqlite' else None,
+                                                        logger=logger), shared=False),
+                    warm_up=lambda standby_browser: standby_browser.perform_interaction(Config.SITES["oreilly"]["open_url"]),
+                    size=Config.STANDBY_SIZE,
+                    logger=logger
+                )
+                engine_factory = lambda: standby.take_engine(fallback=make_engine)
+            lifecycle = DriverLifecycleManager.from_config(engine_factory=engine_factory, logger=logger)
+        browser = Browser(engine=chrome,logger=logger, session_manager=session_manager, cache=page_cache, http_engine=http_engine,
+                          instrumentation=instrumentation, scheduler=scheduler, lifecycle=lifecycle)
 
         # Initialize the OreillySite model
         site_config = Config.SITES["oreilly"]
-        oreilly_site = OreillySite(browser=browser, logger=logger, config=site_config)
+        auth_cache = AuthStateCache.from_config(session_manager=session_manager, logger=logger)
+        oreilly_site = OreillySite(browser=browser, logger=logger, config=site_config, warm_up=not chrome.reattached,
+                                   auth_cache=auth_cache)
         
         # Check if the user is authenticated
         if oreilly_site.check_authentication():
@@ -45,4 +99,14 @@ if __name__ == "__main__":
 
     finally:
         browser.close()   
-        logger.log_info("Application stopped.")
\ No newline at end of file
+        if standby:
+            standby.close()
+        if balancer:
+            logger.log_info("Grid endpoints: %s", balancer.stats())
+            balancer.close()
+        if Config.METRICS_PROM_FILE:
+            metrics.write_prometheus(Config.METRICS_PROM_FILE)
+        if Config.METRICS_JSON_FILE:
+            metrics.write_json(Config.METRICS_JSON_FILE)
+        logger.log_info("Application stopped.")
+        logger.close()
\ No newline at end of file
@@ -0,0 +1,62 @@
+# File: benchmarks/FakeGrid.py
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        grid = self.server.grid
+        if not self.path.rstrip('/').endswith('/status'):
+            self.send_error(404)
+            return
+        if grid.delay:
+            time.sleep(grid.delay)
+        if grid.down:
+            self.send_error(503)
+            return
+        payload = json.dumps(grid.status()).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+class FakeGrid:
+    def __init__(self, slots: int = 4, busy: int = 0, delay: float = 0.0):
+        """
+        Starts a local HTTP server answering /status like a Selenium Grid 4 hub with one node.
+
+        Args:
+            slots (int): The number of slots on the node.
+            busy (int): The number of slots running a session.
+            delay (float): Seconds added to every response, to model a slow or distant hub.
+        """
+        self.slots = slots
+        self.busy = busy
+        self.delay = delay
+        self.down = False
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _StatusHandler)
+        self.server.grid = self
+        self.url = f"http://127.0.0.1:{self.server.server_port}/wd/hub"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def status(self) -> dict:
+        slots = [{'id': {'id': str(index)}, 'session': {'sessionId': f'session-{index}'} if index < self.busy else None}
+                 for index in range(self.slots)]
+        return {'value': {
+            'ready': self.busy < self.slots,
+            'message': 'Selenium Grid ready.',
+            'nodes': [{'availability': 'UP', 'maxSessions': self.slots, 'slots': slots}]
+        }}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
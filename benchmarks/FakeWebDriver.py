@@ -0,0 +1,131 @@
+# File: benchmarks/FakeWebDriver.py
+import time
+import uuid
+from urllib.parse import urlsplit
+import requests
+from requests.cookies import create_cookie
+from selenium.common.exceptions import WebDriverException
+
+class FakeWebDriver:
+    def __init__(self, latency: float = 0.0, support_cdp: bool = True):
+        """
+        An in-process stand-in for a remote WebDriver. Navigation is a real HTTP request (usually to
+        LocalSite), cookies live in a requests cookie jar and storage in dicts.
+
+        Args:
+            latency (float): Seconds added to every command, to model the Grid round-trip.
+            support_cdp (bool): If True, execute_cdp_cmd handles Network.setCookies, so the bulk
+                session restore path is exercised; otherwise the per-cookie fallback is.
+        """
+        self.latency = latency
+        self.support_cdp = support_cdp
+        self.session_id = uuid.uuid4().hex
+        self.caps = {}
+        self.current_url = 'about:blank'
+        self.page_source = ''
+        self.status = 0
+        self.local_storage = {}
+        self.session_storage = {}
+        self.commands = 0
+        self._http = requests.Session()
+
+    def _command(self):
+        self.commands += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def get(self, url: str) -> None:
+        self._command()
+        response = self._http.get(url)
+        self.current_url = response.url
+        self.status = response.status_code
+        self.page_source = response.text
+
+    def refresh(self) -> None:
+        self.get(self.current_url)
+
+    def get_cookies(self) -> list:
+        self._command()
+        host = urlsplit(self.current_url).hostname or ''
+        cookies = []
+        for cookie in self._http.cookies:
+            if cookie.domain.lstrip('.') in host:
+                entry = {'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path,
+                         'secure': cookie.secure, 'httpOnly': cookie.has_nonstandard_attr('HttpOnly')}
+                if cookie.expires:
+                    entry['expiry'] = cookie.expires
+                cookies.append(entry)
+        return cookies
+
+    def _set_cookie(self, cookie: dict) -> None:
+        self._http.cookies.set_cookie(create_cookie(
+            name=cookie['name'], value=cookie['value'],
+            domain=cookie.get('domain') or urlsplit(self.current_url).hostname,
+            path=cookie.get('path', '/'), secure=cookie.get('secure', False),
+            expires=cookie.get('expiry', cookie.get('expires'))
+        ))
+
+    def add_cookie(self, cookie: dict) -> None:
+        self._command()
+        self._set_cookie(cookie)
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> dict:
+        self._command()
+        if not self.support_cdp:
+            raise WebDriverException(f"unknown command: {cmd}")
+        if cmd == 'Network.setCookies':
+            for cookie in params['cookies']:
+                self._set_cookie(cookie)
+        elif cmd == 'Network.clearBrowserCookies':
+            self._http.cookies.clear()
+        return {}
+
+    def delete_all_cookies(self) -> None:
+        self._command()
+        self._http.cookies.clear()
+
+    def execute_script(self, script: str, *args):
+        """
+        Emulates the scripts this project sends, recognised by their content.
+        """
+        self._command()
+        if 'Object.assign({}, window.localStorage)' in script:
+            return [dict(self.local_storage), dict(self.session_storage)]
+        if 'window.localStorage, arguments[0]' in script:
+            self.local_storage.update(args[0])
+            self.session_storage.update(args[1])
+            return bool(self.page_source)
+        if "performance.getEntriesByType('resource')" in script:
+            return [True, 0]
+        if 'localStorage.clear()' in script:
+            self.local_storage.clear()
+            self.session_storage.clear()
+            return None
+        if 'responseStatus' in script:
+            return [self.current_url, self.status]
+        if 'document.readyState' in script:
+            return 'complete'
+        return None
+
+    def find_elements(self, by, value) -> list:
+        self._command()
+        return []
+
+    def quit(self) -> None:
+        self._command()
+        self._http.close()
+
+class FakeEngine:
+    """
+    A WebDriverInterface-compatible engine wrapping a FakeWebDriver.
+    """
+    def __init__(self, latency: float = 0.0, support_cdp: bool = True):
+        self.driver = FakeWebDriver(latency=latency, support_cdp=support_cdp)
+        self.restored_domains = []
+        self.blocker = None
+
+    def get_driver(self):
+        return self.driver
+
+    def quit_driver(self):
+        self.driver.quit()
@@ -0,0 +1,96 @@
+# File: benchmarks/LocalSite.py
+import secrets
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+SESSION_COOKIE = 'bench_session'
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """
+    Mimics the open/login/authed flow OreillySite expects:
+
+    - /open sets a tracking cookie, like a landing page
+    - /login shows the login form; /login?email=..&password=.. signs in and redirects to /secure
+    - /secure redirects to /login unless the session cookie is present
+    - any other path returns a page of the configured size
+    """
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this, Nagle + delayed ACK add ~40ms per response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _cookies(self) -> dict:
+        cookies = {}
+        for part in (self.headers.get('Cookie') or '').split(';'):
+            if '=' in part:
+                name, value = part.strip().split('=', 1)
+                cookies[name] = value
+        return cookies
+
+    def _send(self, status: int, body: str = '', headers: dict = None):
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        if parts.path == '/open':
+            self._send(200, '<html><body><h1>Welcome</h1></body></html>', {'Set-Cookie': 'visitor=1; Path=/'})
+        elif parts.path == '/login' and 'email' in query:
+            token = secrets.token_hex(16)
+            self.server.sessions.add(token)
+            self._send(302, headers={'Location': '/secure', 'Set-Cookie': f'{SESSION_COOKIE}={token}; Path=/; HttpOnly'})
+        elif parts.path == '/login':
+            self._send(200, '<html><body><form><input name="email"><input name="password" type="password"></form></body></html>')
+        elif parts.path == '/secure':
+            if self._cookies().get(SESSION_COOKIE) in self.server.sessions:
+                self._send(200, '<html><body><h1>Library</h1></body></html>')
+            else:
+                self._send(302, headers={'Location': '/login'})
+        else:
+            filler = 'x' * self.server.page_bytes
+            self._send(200, f'<html><head><title>{parts.path}</title></head><body><h1>{parts.path}</h1><p>{filler}</p></body></html>')
+
+class LocalSite:
+    def __init__(self, page_bytes: int = 50_000):
+        """
+        Starts a local HTTP server standing in for the scraped site.
+
+        Args:
+            page_bytes (int): The size of the filler content on ordinary pages.
+        """
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _SiteHandler)
+        self.server.sessions = set()
+        self.server.page_bytes = page_bytes
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def site_config(self) -> dict:
+        """
+        Returns a Config.SITES-style entry pointing at this server.
+        """
+        return {
+            'open_url': self.url('/open'),
+            'login_url': self.url('/login'),
+            'authed_url': self.url('/secure'),
+            'credentials': {'email': 'bench@example.com', 'password': 'bench'},
+            'ready_timeout': 1,
+            'idle_ms': 0
+        }
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,277 @@
+# File: benchmarks/run.py
+"""
+Offline benchmarks for the overhead this project adds around Chrome.
+
+Runs entirely in-process against LocalSite and FakeWebDriver, so no Grid or network is needed:
+
+    python -m benchmarks.run                   # run and compare with the saved baseline
+    python -m benchmarks.run --save-baseline   # run and store the results as the new baseline
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from urllib.parse import urlparse
+
+# Keep sessions and logs out of the working tree; must happen before config is imported
+_WORKDIR = tempfile.mkdtemp(prefix='bench-')
+os.environ['SESSIONS_DIR'] = _WORKDIR + os.sep
+os.environ.setdefault('LOG_FILE', os.path.join(_WORKDIR, 'bench.log'))
+
+from benchmarks.FakeGrid import FakeGrid
+from benchmarks.FakeWebDriver import FakeEngine
+from benchmarks.LocalSite import LocalSite
+from services.Browser import Browser
+from services.GridBalancer import GridBalancer
+from services.session.SessionManager import SessionManager
+from services.session.FileSessionStrategy import FileSessionStrategy
+from services.session.SQLiteSessionStrategy import SQLiteSessionStrategy
+from services.utils.FileLogger import FileLogger
+from services.utils.URLUtils import URLUtils
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+def _percentile(samples: list, percent: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(percent / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def _summary(samples: list) -> dict:
+    total = sum(samples)
+    return {
+        'ops_per_sec': len(samples) / total if total else 0.0,
+        'p50_ms': _percentile(samples, 50) * 1000,
+        'p99_ms': _percentile(samples, 99) * 1000,
+        'mean_ms': statistics.fmean(samples) * 1000
+    }
+
+def bench_interactions(site: LocalSite, logger: FileLogger, iterations: int, latency: float, write_behind: bool) -> dict:
+    """
+    perform_interaction throughput with the SessionManager hook, against local pages.
+    """
+    engine = FakeEngine(latency=latency)
+    session_manager = SessionManager(logger=logger, write_behind=write_behind)
+    browser = Browser(engine=engine, logger=logger, session_manager=session_manager, shared=False)
+    samples = []
+    for index in range(iterations):
+        url = site.url(f'/page/{index % 50}')
+        start = time.perf_counter()
+        browser.perform_interaction(url)
+        samples.append(time.perf_counter() - start)
+    browser.close()
+    result = _summary(samples)
+    result['driver_commands_per_interaction'] = engine.driver.commands / iterations
+    return result
+
+def bench_session(site: LocalSite, logger: FileLogger, cookie_counts: list, strategy, support_cdp: bool, repeats: int = 5) -> dict:
+    """
+    Session save and restore cost as the number of stored cookies grows.
+    """
+    results = {}
+    url = site.url('/page/session')
+    domain = '127.0.0.1'
+    for count in cookie_counts:
+        engine = FakeEngine(support_cdp=support_cdp)
+        driver = engine.driver
+        driver.get(url)
+        for index in range(count):
+            driver.add_cookie({'name': f'cookie{index}', 'value': 'v' * 32, 'domain': domain, 'path': '/'})
+        driver.local_storage = {f'key{index}': 'value' for index in range(max(1, count // 10))}
+        session_key = f"bench-{strategy.__name__}-{count}"
+        save_samples, restore_samples = [], []
+        for _ in range(repeats):
+            session_manager = SessionManager(strategy=strategy, logger=logger)
+            session_manager.set_driver(driver)
+            session_manager.strategy = strategy(session_key)
+            start = time.perf_counter()
+            session_manager._save_session(domain, session_key)
+            save_samples.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            session_manager._restore_session(domain, session_key)
+            restore_samples.append(time.perf_counter() - start)
+        results[str(count)] = {
+            'save_ms': statistics.median(save_samples) * 1000,
+            'restore_ms': statistics.median(restore_samples) * 1000
+        }
+    return results
+
+def bench_auth_check(site: LocalSite, logger: FileLogger, repeats: int) -> dict:
+    """
+    Warm-up plus check_authentication for an already signed-in session, through OreillySite.
+    """
+    from model.OreillySite import OreillySite
+    engine = FakeEngine()
+    session_manager = SessionManager(logger=logger)
+    browser = Browser(engine=engine, logger=logger, session_manager=session_manager, shared=False)
+    config = site.site_config()
+    browser.perform_interaction(config['login_url'] + '?email=bench&password=bench')
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        site_model = OreillySite(browser=browser, logger=logger, config=config)
+        if not site_model.check_authentication():
+            raise RuntimeError("Local site did not accept the benchmark session.")
+        samples.append(time.perf_counter() - start)
+    browser.close()
+    return _summary(samples)
+
+def bench_grid(sessions: int) -> dict:
+    """
+    GridBalancer status polling and placement across a free, a busy, a slow and an unreachable fake Grid.
+    """
+    grids = [FakeGrid(slots=8), FakeGrid(slots=8, busy=6), FakeGrid(slots=8, delay=0.05)]
+    down = FakeGrid(slots=8)
+    down.down = True
+    balancer = GridBalancer([grid.url for grid in grids + [down]], poll_interval=0, slow_threshold=0.02)
+    try:
+        start = time.perf_counter()
+        balancer.poll()
+        poll = time.perf_counter() - start
+        placements = {grid.url: 0 for grid in grids + [down]}
+        start = time.perf_counter()
+        for _ in range(sessions):
+            placements[balancer.choose()] += 1
+        choose = (time.perf_counter() - start) / sessions
+    finally:
+        balancer.close()
+        for grid in grids + [down]:
+            grid.close()
+    if placements[down.url] or max(placements, key=placements.get) != grids[0].url:
+        raise RuntimeError(f"Unexpected GridBalancer placements: {placements}")
+    return {'poll_ms': poll * 1000, 'choose_us': choose * 1e6}
+
+def _legacy_session_key(url: str) -> tuple:
+    # What SessionManager.validate did per interaction before URLUtils: parse twice, keep the last two labels
+    keys = []
+    for _ in range(2):
+        parts = urlparse(url).netloc.split('.')
+        keys.append('.'.join(parts[-2:]) if len(parts) > 2 else '.'.join(parts))
+    return keys[0], str(uuid.uuid5(uuid.NAMESPACE_URL, keys[1]))
+
+def bench_urls(lookups: int) -> dict:
+    """
+    Per-URL cost of the domain, session UUID and canonical URL lookups done on every interaction,
+    with a warm memo, with cold memos (suffix trie walk and parsing) and the previous per-call parsing.
+    """
+    hosts = ['www.example.com', 'books.example.co.uk', 'learning.oreilly.com', 'a.b.github.io', '127.0.0.1:8080']
+    urls = [f"https://{hosts[index % len(hosts)]}/library/view/{index % 200}?b=2&a=1#top" for index in range(lookups)]
+
+    def lookup(url):
+        return URLUtils.registrable_domain(url), URLUtils.session_uuid(url), URLUtils.canonicalize(url)
+
+    URLUtils.registrable_domain('https://warm.example.com/')
+    for name in ('host', 'registrable_domain', 'session_uuid', 'canonicalize'):
+        getattr(URLUtils, name).cache_clear()
+    start = time.perf_counter()
+    for url in urls:
+        lookup(url)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    for url in urls:
+        lookup(url)
+    memo = time.perf_counter() - start
+    start = time.perf_counter()
+    for url in urls:
+        _legacy_session_key(url)
+    legacy = time.perf_counter() - start
+    if URLUtils.registrable_domain('https://books.example.co.uk/') != 'example.co.uk':
+        raise RuntimeError("Public suffix lookup returned the wrong registrable domain.")
+    return {'first_us': first / lookups * 1e6, 'memo_us': memo / lookups * 1e6, 'legacy_us': legacy / lookups * 1e6}
+
+def bench_logger(logger: FileLogger, records: int) -> dict:
+    """
+    Cost per record for emitted and filtered-out records.
+    """
+    payload = {'cookies': [{'name': f'c{index}', 'value': 'v'} for index in range(50)]}
+    start = time.perf_counter()
+    for _ in range(records):
+        logger.log_info("Benchmark record %s", payload)
+    emitted = (time.perf_counter() - start) / records
+    start = time.perf_counter()
+    for _ in range(records):
+        logger.log_debug("Filtered record %s", payload)
+    filtered = (time.perf_counter() - start) / records
+    return {'emitted_us': emitted * 1e6, 'filtered_us': filtered * 1e6}
+
+def _flatten(results: dict, prefix: str = '') -> dict:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name))
+        else:
+            flat[name] = value
+    return flat
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Returns (metric, baseline, current, change) for metrics that got worse by more than threshold.
+    Throughput metrics are worse when lower, all other metrics when higher.
+    """
+    regressions = []
+    current, previous = _flatten(results), _flatten(baseline)
+    for metric, value in current.items():
+        old = previous.get(metric)
+        if not old:
+            continue
+        change = (value - old) / old
+        worse = -change if metric.endswith('ops_per_sec') else change
+        if worse > threshold:
+            regressions.append((metric, old, value, change))
+    return regressions
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the scraping framework overhead.")
+    parser.add_argument('--iterations', type=int, default=200, help="Interactions per throughput run.")
+    parser.add_argument('--latency', type=float, default=0.0, help="Simulated seconds per WebDriver command.")
+    parser.add_argument('--cookies', default='10,100,1000', help="Comma-separated cookie counts for session benchmarks.")
+    parser.add_argument('--log-records', type=int, default=2000, help="Records per logger benchmark.")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON file.")
+    parser.add_argument('--save-baseline', action='store_true', help="Store the results as the new baseline.")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Relative change reported as a regression.")
+    parser.add_argument('--output', help="Also write the results to this JSON file.")
+    args = parser.parse_args(argv)
+
+    cookie_counts = [int(count) for count in args.cookies.split(',') if count]
+    logger = FileLogger(log_file=os.environ['LOG_FILE'], log_level='INFO')
+    site = LocalSite()
+    try:
+        results = {
+            'interactions': bench_interactions(site, logger, args.iterations, args.latency, write_behind=False),
+            'interactions_write_behind': bench_interactions(site, logger, args.iterations, args.latency, write_behind=True),
+            'session_file': bench_session(site, logger, cookie_counts, FileSessionStrategy, support_cdp=True),
+            'session_sqlite': bench_session(site, logger, cookie_counts, SQLiteSessionStrategy, support_cdp=True),
+            'session_file_no_cdp': bench_session(site, logger, cookie_counts, FileSessionStrategy, support_cdp=False),
+            'auth_check': bench_auth_check(site, logger, repeats=max(5, args.iterations // 20)),
+            'grid': bench_grid(sessions=12),
+            'urls': bench_urls(lookups=5000),
+            'logger': bench_logger(logger, args.log_records)
+        }
+    finally:
+        site.close()
+
+    for metric, value in _flatten(results).items():
+        print(f"{metric:<55} {value:12.3f}")
+
+    exit_code = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r') as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for metric, old, new, change in regressions:
+            print(f"REGRESSION {metric}: {old:.3f} -> {new:.3f} ({change:+.0%})")
+        exit_code = 1 if regressions else 0
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    return exit_code
+
+if __name__ == '__main__':
+    sys.exit(main())
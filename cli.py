@@ -0,0 +1,330 @@
+# File: cli.py
+"""
+Command-line batch runner: streams URLs from a file or stdin through the site model and writes one
+JSON line per result.
+
+    python cli.py urls.txt -o results.jsonl --workers 4
+    cat urls.txt | python cli.py - --no-content
+    python cli.py urls.txt --dry-run             # validate the input without starting a browser
+
+Selenium, .env and Config are only loaded once a browser is needed, so --help and dry runs start instantly.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from urllib.parse import urlsplit
+
+def read_urls(stream, progress=None):
+    """
+    Yields URLs from a text stream one line at a time, skipping blank lines and '#' comments.
+
+    Args:
+        stream: A binary stream, e.g. an open file or sys.stdin.buffer.
+        progress (Progress, optional): Told how many input bytes were consumed, for the ETA.
+    """
+    for raw in stream:
+        line = raw.decode('utf-8', errors='replace').strip()
+        is_url = bool(line) and not line.startswith('#')
+        if progress:
+            # Blank and comment lines count towards the bytes read, but not the URLs
+            progress.consumed(len(raw), is_url)
+        if is_url:
+            yield line
+
+def is_valid_url(url: str) -> bool:
+    parts = urlsplit(url)
+    return parts.scheme in ('http', 'https') and bool(parts.netloc)
+
+class Progress:
+    def __init__(self, stream=sys.stderr, interval: float = 2.0, total_bytes: int = None, total: int = None):
+        """
+        Initializes a live throughput and ETA line.
+
+        The total number of URLs is rarely known for a stream. For a file, it is estimated from the bytes
+        read so far; for stdin there is no ETA unless a total is given (e.g. the frontier's pending count).
+
+        Args:
+            stream: Where the progress line is written.
+            interval (float): Seconds between updates. 0 disables the live line; the summary is still written.
+            total_bytes (int, optional): The size of the input file.
+            total (int, optional): The number of URLs to process, if known.
+        """
+        self.stream = stream
+        self.interval = interval
+        self.total_bytes = total_bytes
+        self.total = total
+        self.processed = 0
+        self.failed = 0
+        self.read_bytes = 0
+        self.read_urls = 0
+        self.live = interval > 0 and stream.isatty()
+        self._started = time.monotonic()
+        self._shown = 0.0
+
+    def consumed(self, length: int, is_url: bool = True) -> None:
+        self.read_bytes += length
+        self.read_urls += is_url
+
+    def _estimated_total(self):
+        if self.total is not None:
+            return self.total
+        if self.total_bytes and self.read_bytes:
+            return max(self.read_urls, round(self.read_urls * self.total_bytes / self.read_bytes))
+        return None
+
+    def line(self) -> str:
+        elapsed = time.monotonic() - self._started
+        rate = self.processed / elapsed if elapsed else 0.0
+        text = f"{self.processed} done, {self.failed} failed, {rate:.1f} URLs/s, {elapsed:.0f}s elapsed"
+        total = self._estimated_total()
+        if total and rate:
+            remaining = max(0, total - self.processed)
+            text += f", ~{total} total, ETA {remaining / rate:.0f}s"
+        return text
+
+    def update(self, ok: bool) -> None:
+        self.processed += 1
+        if not ok:
+            self.failed += 1
+        now = time.monotonic()
+        if self.interval > 0 and now - self._shown >= self.interval:
+            self._shown = now
+            self.stream.write(f"\r{self.line()}\033[K" if self.live else f"{self.line()}\n")
+            self.stream.flush()
+
+    def finish(self) -> None:
+        self.stream.write(f"\r{self.line()}\033[K\n" if self.live else f"{self.line()}\n")
+        self.stream.flush()
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Stream URLs through the site model and write results as JSON Lines.")
+    parser.add_argument('input', nargs='?', default='-', help="File with one URL per line, or '-' for stdin (default).")
+    parser.add_argument('-o', '--output', default='-', help="JSON Lines output file, or '-' for stdout (default).")
+    parser.add_argument('-w', '--workers', type=int, help="Concurrent browsers. Defaults to POOL_SIZE; 1 uses no pool.")
+    parser.add_argument('--site', default='oreilly', help="The Config.SITES entry to use (default: oreilly).")
+    parser.add_argument('--ordered', action='store_true', help="Write results in input order.")
+    parser.add_argument('--no-content', action='store_true', help="Leave page content out of the output.")
+    parser.add_argument('--frontier', nargs='?', const='', metavar='DB',
+                        help="Queue URLs in a persistent frontier (FRONTIER_DB unless given) so reruns resume.")
+    parser.add_argument('--store', nargs='?', const='', metavar='DIR',
+                        help="Write pages to a PageStore (PAGE_STORE_DIR unless given).")
+    parser.add_argument('--recrawl', action='store_true', help="Only render pages that changed since the last run.")
+    parser.add_argument('--dry-run', action='store_true', help="Validate the input and write it out without a browser.")
+    parser.add_argument('--progress', type=float, default=2.0, metavar='SECONDS',
+                        help="Seconds between progress updates on stderr; 0 prints only the summary.")
+    return parser.parse_args(argv)
+
+def dry_run(urls, output, progress: Progress) -> int:
+    invalid = 0
+    for index, url in enumerate(urls):
+        valid = is_valid_url(url)
+        invalid += not valid
+        output.write(json.dumps({'index': index, 'url': url, 'ok': valid}) + '\n')
+        progress.update(valid)
+    progress.finish()
+    return 1 if invalid else 0
+
+class Runner:
+    def __init__(self, args: argparse.Namespace):
+        """
+        Initializes the browser-backed part of the CLI. Nothing heavy is imported until start() runs.
+        """
+        self.args = args
+        self.logger = None
+        self.browser = None
+        self.pool = None
+        self.site = None
+        self.frontier = None
+        self.store = None
+        self.recrawl = None
+        self.http_engine = None
+        self.standby = None
+        self.balancer = None
+
+    def start(self) -> None:
+        """
+        Builds the browser (and a pool for several workers), the site model and the optional frontier,
+        store and recrawler from Config, then makes sure the session is authenticated.
+        """
+        from config import Config
+        from services.ChromeRemote import ChromeRemote
+        from services.Browser import Browser
+        from services.BrowserPool import BrowserPool
+        from services.DomainScheduler import DomainScheduler
+        from services.DriverLifecycleManager import DriverLifecycleManager
+        from services.GridBalancer import GridBalancer
+        from services.HttpEngine import HttpEngine
+        from services.IdentityPool import IdentityPool
+        from services.ResourceBlocker import ResourceBlocker
+        from services.StandbyPool import StandbyPool
+        from services.cache.PageCache import PageCache
+        from services.session.AuthStateCache import AuthStateCache
+        from services.session.SessionManager import SessionManager
+        from services.session.SQLiteSessionStrategy import SQLiteSessionStrategy
+        from services.utils.FileLogger import FileLogger
+        from model.OreillySite import OreillySite
+
+        args = self.args
+        if args.site not in Config.SITES:
+            raise SystemExit(f"Unknown site '{args.site}'. Configured sites: {', '.join(Config.SITES)}")
+        site_config = Config.SITES[args.site]
+        workers = args.workers or Config.POOL_SIZE
+        self.logger = logger = FileLogger(log_file=Config.LOG_FILE, log_level=Config.LOG_LEVEL, async_mode=Config.LOG_ASYNC)
+        blocker = ResourceBlocker.from_config(logger=logger)
+        self.balancer = balancer = GridBalancer.from_config(logger=logger) if Config.REMOTE_URLS else None
+
+        def make_session_manager():
+            return SessionManager(
+                strategy=SQLiteSessionStrategy if Config.SESSION_BACKEND == 'sqlite' else None,
+                logger=logger,
+                write_behind=Config.SESSION_WRITE_BEHIND,
+                flush_interval=Config.SESSION_FLUSH_INTERVAL,
+                flush_every=Config.SESSION_FLUSH_EVERY
+            )
+
+        if Config.BROWSER_ENGINE == 'cdp':
+            from services.ChromeCdpRemote import ChromeCdpRemote as engine_class
+        else:
+            engine_class = ChromeRemote
+
+        def make_engine():
+            return engine_class(logger=logger, options=Config.BROWSER_OPTIONS, blocker=blocker, balancer=balancer)
+
+        def make_replacement_engine():
+            # Recycled and dead drivers are replaced with warmed ones while a standby is running
+            if self.standby:
+                return self.standby.take_engine(fallback=make_engine)
+            return make_engine()
+
+        lifecycle_factory = None
+        if Config.DRIVER_LIFECYCLE_ENABLED:
+            lifecycle_factory = lambda: DriverLifecycleManager.from_config(engine_factory=make_replacement_engine, logger=logger)
+
+        session_manager = make_session_manager()
+        scheduler = DomainScheduler.from_config(logger=logger) if Config.SCHEDULER_ENABLED else None
+        if Config.HTTP_ENABLED or args.recrawl:
+            self.http_engine = HttpEngine.from_config(session_manager=session_manager, logger=logger)
+        page_cache = PageCache.from_config(logger=logger) if Config.CACHE_ENABLED else None
+        self.browser = Browser(engine=make_engine(), logger=logger, session_manager=session_manager, shared=False,
+                               cache=page_cache, http_engine=self.http_engine if Config.HTTP_ENABLED else None,
+                               scheduler=scheduler, lifecycle=lifecycle_factory() if lifecycle_factory else None)
+        if Config.STANDBY_SIZE > 0 and (workers > 1 or lifecycle_factory):
+            # Pooled browsers and replacement drivers are taken warmed from the standby
+            self.standby = StandbyPool(
+                browser_factory=lambda: Browser(engine=make_engine(), logger=logger,
+                                                session_manager=make_session_manager(), shared=False,
+                                                instrumentation=self.browser.instrumentation, scheduler=scheduler),
+                warm_up=lambda browser: browser.perform_interaction(site_config['open_url']),
+                size=Config.STANDBY_SIZE,
+                logger=logger
+            )
+        if workers > 1:
+            identities = IdentityPool.from_config(site_config, logger=logger) if site_config.get('identities') else None
+            self.pool = BrowserPool(engine_factory=make_engine, logger=logger, session_manager_factory=make_session_manager,
+                                    size=workers, instrumentation=self.browser.instrumentation, scheduler=scheduler,
+                                    cache=page_cache, http_engine=self.http_engine if Config.HTTP_ENABLED else None,
+                                    browser_factory=self.standby.take if self.standby else None,
+                                    lifecycle_factory=lifecycle_factory, identities=identities)
+        if self.standby and not lifecycle_factory:
+            # The pool is full and nothing else takes from the standby
+            self.standby.close()
+            self.standby = None
+        auth_cache = AuthStateCache.from_config(session_manager=session_manager, logger=logger)
+        self.site = OreillySite(browser=self.browser, logger=logger, config=site_config, pool=self.pool,
+                                auth_cache=auth_cache)
+        if not self.site.check_authentication():
+            self.site.authenticate(site_config['credentials'])
+        # In write-behind mode, pooled browsers would otherwise load the session from before the sign-in
+        self.browser.session_manager.flush()
+        if self.pool and self.pool.identities:
+            self.site.authenticate_identities()
+
+        if args.frontier is not None:
+            from services.Frontier import Frontier
+            self.frontier = Frontier(args.frontier, logger=logger) if args.frontier else Frontier.from_config(logger=logger)
+        if args.store is not None:
+            from services.PageStore import PageStore
+            self.store = PageStore(args.store, logger=logger) if args.store else PageStore.from_config(logger=logger)
+        if args.recrawl:
+            from services.Recrawler import Recrawler
+            self.recrawl = Recrawler.from_config(http_engine=self.http_engine, logger=logger)
+
+    def run(self, urls, output, progress: Progress) -> int:
+        """
+        Processes the URLs and writes each result as it completes.
+
+        Returns:
+            int: 1 if any URL failed, 0 otherwise.
+        """
+        if self.frontier is not None:
+            # Add the whole input first, so the ETA can use the frontier's pending count
+            added = self.frontier.add_many(urls)
+            counts = self.frontier.counts()
+            progress.total = counts['pending'] + counts['in_flight']
+            self.logger.log_info(f"Added {added} new URLs to the frontier.")
+            urls = None
+        results = self.site.process_urls(urls, ordered=self.args.ordered, frontier=self.frontier, store=self.store,
+                                         recrawl=self.recrawl)
+        for result in results:
+            record = {'index': result.index, 'url': result.url, 'ok': result.ok}
+            if result.error is not None:
+                record['error'] = f"{type(result.error).__name__}: {result.error}"
+            if result.status is not None:
+                record['status'] = result.status
+            if result.content_hash is not None:
+                record['content_hash'] = result.content_hash
+            if not self.args.no_content:
+                record['content'] = result.content
+            output.write(json.dumps(record, default=str, ensure_ascii=False) + '\n')
+            output.flush()
+            progress.update(result.ok)
+        progress.finish()
+        return 1 if progress.failed else 0
+
+    def close(self) -> None:
+        for component in (self.recrawl, self.store, self.frontier, self.pool, self.browser, self.standby, self.balancer):
+            if component is None:
+                continue
+            try:
+                component.close()
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_error(f"Error closing {type(component).__name__}: {e}")
+        if self.logger:
+            self.logger.close()
+
+def main(argv: list = None) -> int:
+    args = parse_args(argv)
+    if args.input == '-':
+        source, total_bytes = sys.stdin.buffer, None
+    else:
+        source = open(args.input, 'rb')
+        total_bytes = os.path.getsize(args.input)
+    # A resumed frontier run appends to the results of the interrupted one
+    mode = 'a' if args.frontier is not None else 'w'
+    output = sys.stdout if args.output == '-' else open(args.output, mode, encoding='utf-8')
+    progress = Progress(interval=args.progress, total_bytes=total_bytes)
+    urls = read_urls(source, progress)
+    try:
+        if args.dry_run:
+            return dry_run(urls, output, progress)
+        runner = Runner(args)
+        try:
+            runner.start()
+            return runner.run(urls, output, progress)
+        finally:
+            runner.close()
+    except KeyboardInterrupt:
+        progress.finish()
+        sys.stderr.write("Interrupted.\n")
+        return 130
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,5 @@
 # config.py
+import json
 import os
 from dotenv import load_dotenv
 
@@ -7,12 +8,91 @@ load_dotenv()  # Load environment variables from .env file
 class Config:
     LOG_FILE = os.getenv('LOG_FILE', 'logs/logfile.log')
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_ASYNC = os.getenv('LOG_ASYNC', 'false').lower() == 'true'
     REMOTE_URL = os.getenv('REMOTE_URL', 'http://<selenium-grid-docker>:4444/wd/hub')
+    # Several Grids/standalone nodes, comma-separated; when set, sessions are placed by GridBalancer
+    REMOTE_URLS = [url for url in os.getenv('REMOTE_URLS', '').split(',') if url]
+    GRID_POLL_INTERVAL = float(os.getenv('GRID_POLL_INTERVAL', '5'))
+    GRID_SLOW_THRESHOLD = float(os.getenv('GRID_SLOW_THRESHOLD', '2'))
     SESSIONS_DIR = os.getenv('SESSIONS_DIR', 'data/')
+    POOL_SIZE = int(os.getenv('POOL_SIZE', '4'))
+
+    # Faster startup: pre-warmed standby browsers and reattaching to the Grid session of a previous process
+    STANDBY_SIZE = int(os.getenv('STANDBY_SIZE', '0'))
+    REATTACH_SESSION = os.getenv('REATTACH_SESSION', 'false').lower() == 'true'
+    DRIVER_SESSION_FILE = os.getenv('DRIVER_SESSION_FILE', os.path.join(SESSIONS_DIR, 'driver_session.json'))
+
+    # Session storage backend: 'file' (one pickle per domain) or 'sqlite' (indexed, incremental)
+    SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'file')
+
+    # Write-behind session persistence
+    SESSION_WRITE_BEHIND = os.getenv('SESSION_WRITE_BEHIND', 'false').lower() == 'true'
+    SESSION_FLUSH_INTERVAL = float(os.getenv('SESSION_FLUSH_INTERVAL', '30'))
+    SESSION_FLUSH_EVERY = int(os.getenv('SESSION_FLUSH_EVERY', '20'))
     
+    # Page cache in front of Browser.perform_interaction (enabled per site through 'cache_ttl')
+    CACHE_ENABLED = os.getenv('CACHE_ENABLED', 'false').lower() == 'true'
+    CACHE_DIR = os.getenv('CACHE_DIR', 'data/cache/')
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '256'))
+    CACHE_MAX_BYTES = int(os.getenv('CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+
+    # HTTP fast path for pages that don't need JavaScript (see 'fetch_mode'/'fetch_rules' per site)
+    HTTP_ENABLED = os.getenv('HTTP_ENABLED', 'false').lower() == 'true'
+    HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+    HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '30'))
+
+    # Count blocked vs. allowed requests per page (enables Chrome performance logging)
+    BLOCK_STATS = os.getenv('BLOCK_STATS', 'false').lower() == 'true'
+
+    # Persistent crawl frontier used by process_urls(frontier=...) to resume interrupted batches
+    FRONTIER_DB = os.getenv('FRONTIER_DB', os.path.join(SESSIONS_DIR, 'frontier.sqlite3'))
+    FRONTIER_CAPACITY = int(os.getenv('FRONTIER_CAPACITY', '1000000'))
+    FRONTIER_MAX_ATTEMPTS = int(os.getenv('FRONTIER_MAX_ATTEMPTS', '3'))
+
+    # Content-addressed, compressed storage of scraped pages (process_urls(store=...))
+    PAGE_STORE_DIR = os.getenv('PAGE_STORE_DIR', 'data/pages/')
+    PAGE_STORE_BATCH_BYTES = int(os.getenv('PAGE_STORE_BATCH_BYTES', str(1024 * 1024)))
+    PAGE_STORE_SEGMENT_BYTES = int(os.getenv('PAGE_STORE_SEGMENT_BYTES', str(1024 * 1024 * 1024)))
+
+    # Public Suffix List used for registrable domains; empty uses the subset bundled in services/utils
+    PUBLIC_SUFFIX_FILE = os.getenv('PUBLIC_SUFFIX_FILE', '')
+
+    # Incremental recrawl (process_urls(recrawl=...)): per-URL validators and the minimum seconds between checks
+    RECRAWL_DB = os.getenv('RECRAWL_DB', os.path.join(SESSIONS_DIR, 'validators.sqlite3'))
+    RECRAWL_MIN_AGE = float(os.getenv('RECRAWL_MIN_AGE', '0'))
+
+    # Accounts rotated by an IdentityPool: concurrent workers per account and the base rest after throttling
+    IDENTITY_MAX_LEASES = int(os.getenv('IDENTITY_MAX_LEASES', '1'))
+    IDENTITY_COOLDOWN = float(os.getenv('IDENTITY_COOLDOWN', '60'))
+
+    # When each site last authenticated, used with the site's 'auth_ttl' to skip the authentication probe
+    AUTH_STATE_FILE = os.getenv('AUTH_STATE_FILE', os.path.join(SESSIONS_DIR, 'auth_state.json'))
+
+    # Per-domain pacing: token bucket rate and adaptive (AIMD) concurrency cap, overridable per site with 'rate_limit'
+    SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'false').lower() == 'true'
+    RATE_LIMIT = float(os.getenv('RATE_LIMIT', '2'))
+    RATE_BURST = float(os.getenv('RATE_BURST', '4'))
+    DOMAIN_MAX_CONCURRENCY = int(os.getenv('DOMAIN_MAX_CONCURRENCY', '4'))
+
+    # Driver health checks and recycling (0 disables a limit)
+    DRIVER_LIFECYCLE_ENABLED = os.getenv('DRIVER_LIFECYCLE_ENABLED', 'false').lower() == 'true'
+    DRIVER_MAX_PAGES = int(os.getenv('DRIVER_MAX_PAGES', '0'))
+    DRIVER_MAX_AGE = float(os.getenv('DRIVER_MAX_AGE', '0'))
+    DRIVER_MAX_MEMORY_MB = float(os.getenv('DRIVER_MAX_MEMORY_MB', '0'))
+    DRIVER_PROBE_INTERVAL = float(os.getenv('DRIVER_PROBE_INTERVAL', '60'))
+    DRIVER_RETRIES = int(os.getenv('DRIVER_RETRIES', '1'))
+
+    # Metrics export: Prometheus text file and/or JSON snapshot, written when the application stops
+    METRICS_PROM_FILE = os.getenv('METRICS_PROM_FILE', '')
+    METRICS_JSON_FILE = os.getenv('METRICS_JSON_FILE', '')
+
     # Parse BROWSER_OPTIONS from a single string into a list
     BROWSER_OPTIONS = os.getenv('BROWSER_OPTIONS', '').split(' ')
 
+    # 'webdriver' (ChromeRemote) or 'cdp' (ChromeCdpRemote: page loads and session I/O over the Grid's DevTools WebSocket)
+    BROWSER_ENGINE = os.getenv('BROWSER_ENGINE', 'webdriver').lower()
+    CDP_TIMEOUT = float(os.getenv('CDP_TIMEOUT', '30'))
+
     # Site-specific configurations
     SITES = {
         "oreilly": {
@@ -22,6 +102,34 @@ class Config:
             "credentials": {
                 "email": os.getenv('OREILLY_EMAIL', 'username@example.com'),
                 "password": os.getenv('OREILLY_PASSWORD', 'password')
-            }
+            },
+            # Accounts for an IdentityPool: [{"name": ..., "email": ..., "password": ...}]
+            "identities": json.loads(os.getenv('OREILLY_IDENTITIES', '[]')),
+            # 'browser' or 'http' for the whole site; 'fetch_rules' are (regex, mode) pairs checked first
+            "fetch_mode": os.getenv('OREILLY_FETCH_MODE', 'browser'),
+            "fetch_rules": [(pattern, 'http') for pattern in os.getenv('OREILLY_HTTP_PATTERNS', '').split(',') if pattern],
+            # Readiness waits used instead of fixed sleeps
+            "ready_timeout": float(os.getenv('OREILLY_READY_TIMEOUT', '10')),
+            "idle_ms": int(os.getenv('OREILLY_IDLE_MS', '500')),
+            # In-browser extraction for process_urls: {name: css selector or {'selector', 'attr', 'all'}}.
+            # Empty means the full page source is returned.
+            "fields": json.loads(os.getenv('OREILLY_FIELDS', '{}')),
+            "include_source": os.getenv('OREILLY_INCLUDE_SOURCE', 'false').lower() == 'true',
+            # Resources the browser never downloads: types from ResourceBlocker.RESOURCE_PATTERNS
+            # and Network.setBlockedURLs patterns such as '*google-analytics.com*'
+            "block": {
+                "resource_types": [t for t in os.getenv('OREILLY_BLOCK_TYPES', '').split(',') if t],
+                "url_patterns": [p for p in os.getenv('OREILLY_BLOCK_PATTERNS', '').split(',') if p]
+            },
+            # DomainScheduler overrides: 'rate' (requests/s), 'burst', 'max_concurrency'
+            "rate_limit": json.loads(os.getenv('OREILLY_RATE_LIMIT', '{}')),
+            "cache_ttl": float(os.getenv('OREILLY_CACHE_TTL', '0')),
+            # Seconds a successful authentication is trusted without a probe (capped by cookie expiry); 0 always probes
+            "auth_ttl": float(os.getenv('OREILLY_AUTH_TTL', '0')),
+            # Pages whose final URL is inspected after navigating must always hit the driver
+            "cache_exclude": [
+                os.getenv('OREILLY_LOGIN_URL', 'https://www.example.com/login'),
+                os.getenv('OREILLY_AUTHED_URL', 'https://www.example.com/secure')
+            ]
         }
     }
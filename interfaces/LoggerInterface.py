@@ -2,9 +2,9 @@ from abc import ABC, abstractmethod
 
 class LoggerInterface(ABC):
     @abstractmethod
-    def log_info(self, message: str):
+    def log_info(self, message: str, *args):
         pass
 
     @abstractmethod
-    def log_error(self, message: str):
+    def log_error(self, message: str, *args):
         pass
@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
 from selenium.common.exceptions import WebDriverException
 
 class WebScrapeInterface(ABC):
+    # Optional services.Extractor describing the data to pull from each page in the browser;
+    # when None, URL processing returns the full page source.
+    extractor = None
+
     def __init__(self, driver):
         self.driver = driver
         self.is_authenticated = False
@@ -15,7 +20,7 @@ class WebScrapeInterface(ABC):
         pass
     
     @abstractmethod
-    def process_urls(self, urls: list)-> list:
+    def process_urls(self, urls: Iterable[str] = None, frontier=None)-> Iterator:
         pass
 
     @abstractmethod
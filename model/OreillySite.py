@@ -2,29 +2,68 @@
 
 from interfaces.WebScrapeInterface import WebScrapeInterface
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from services.utils.FileLogger import FileLogger
 from services.Browser import Browser
-import time
+from services.utils.StreamingExecutor import StreamingExecutor
+from services.utils.PageReadiness import PageReadiness
+from services.Extractor import Extractor
+from services.Frontier import Frontier
+from services.PageStore import PageStore
+from services.Recrawler import Recrawler, FETCHED
+from model.ScrapeResult import ScrapeResult
+from typing import Iterable, Iterator
+import threading
 
 class OreillySite(WebScrapeInterface):
-    def __init__(self, browser: Browser, logger: FileLogger, config: dict):
+    def __init__(self, browser: Browser, logger: FileLogger, config: dict, pool=None, warm_up: bool = True,
+                 auth_cache=None):
         self.logger = logger
         self.is_authenticated = False
         self.browser = browser
+        # Optional BrowserPool used by process_urls; pooled drivers pick up the authenticated
+        # session through their SessionManager on their first visit to the domain.
+        self.pool = pool
         self.config = config
+        # Optional AuthStateCache; with a site 'auth_ttl', a fresh session skips the authentication probe
+        # and is only checked again once a page lands on the login URL
+        self.auth_cache = auth_cache if config.get('auth_ttl') else None
+        self._login_redirected = False
+        self._auth_lock = threading.Lock()
+        # Interactions run in the calling worker's thread, so each worker sees only its own redirects
+        self._redirects = threading.local()
+        if self.auth_cache:
+            for pooled in [browser] + (pool.browsers if pool else []):
+                pooled.add_hook('after_interaction',
+                                lambda url_provider, pooled=pooled: self._detect_login_redirect(pooled, url_provider()))
         self.logger.log_info("OreillySite model initialized.")
-        self.driver = self.browser.driver
+        self._readiness = PageReadiness(self.driver, logger=logger, timeout=config.get('ready_timeout', 10))
+        if config.get('fields'):
+            self.extractor = Extractor(fields=config['fields'], include_source=config.get('include_source', False))
 
-        # Warm up the URL
-        logger.log_info("Warming up the URL.")
-        self._warm_up_url()        
+        # Warm up the URL; a reattached or standby browser is already warm
+        if warm_up:
+            logger.log_info("Warming up the URL.")
+            self._warm_up_url()        
         
+    @property
+    def driver(self):
+        # Read through the browser, which may have replaced a dead or recycled driver
+        return self.browser.driver
+
+    @property
+    def readiness(self) -> PageReadiness:
+        self._readiness.driver = self.browser.driver
+        return self._readiness
+
     def _warm_up_url(self):
         self.browser.perform_interaction(self.config['open_url'], method='GET')
-        time.sleep(2)
+        try:
+            # Let the landing page finish setting its cookies before they are used
+            self.readiness.wait_for(PageReadiness.network_idle(self.config.get('idle_ms', 500)))
+        except TimeoutException:
+            self.logger.log_info("Warm-up page did not become idle in time, continuing.")
 
     def authenticate(self, credentials):
         try:
@@ -34,31 +73,26 @@ class OreillySite(WebScrapeInterface):
             # Save the current URL
             current_url = self.driver.current_url
 
-            # Define a function to wait for URL change
-            def wait_for_url_change(driver, old_url, timeout=10):
-                wait = WebDriverWait(driver, timeout)
-                wait.until(lambda driver: driver.current_url != old_url)
-                return driver.current_url             
-
             # Fill in the email and submit
             self.logger.log_info("Filling in the email...")
-            email_elem = self.driver.find_element(By.NAME, 'email')
+            email_elem = self.readiness.wait_for(PageReadiness.element_interactable(By.NAME, 'email'))
             email_elem.send_keys(credentials['email'])
             email_elem.send_keys(Keys.RETURN)
             
-            time.sleep(2)  # Wait for the AJAX request to complete
-            
-            # Fill in the password and submit
+            # The password field appears once the AJAX email step completes
             self.logger.log_info("Filling in the password...")
-            password_elem = self.driver.find_element(By.NAME, 'password')
+            password_elem = self.readiness.wait_for(PageReadiness.element_interactable(By.NAME, 'password'))
             password_elem.send_keys(credentials['password'])
             password_elem.send_keys(Keys.RETURN)
             
             # Wait for the URL to change
-            new_url = wait_for_url_change(self.driver, current_url)
+            new_url = self.readiness.wait_for(PageReadiness.url_changed(current_url))
             self.logger.log_info(f"Detected URL change to: {new_url}")
             self.browser.perform_interaction(new_url, method='GET')
             self.is_authenticated = True            
+            self._login_redirected = False
+            if self.auth_cache:
+                self.auth_cache.record_success(self.config['authed_url'], self.config['authed_url'])
             self.logger.log_info("Authentication completed successfully.")
         except NoSuchElementException as e:
             self.logger.log_error(f"Element not found during authentication: {e}")
@@ -73,22 +107,191 @@ class OreillySite(WebScrapeInterface):
     def check_authentication(self) -> bool:
         try:
             self.logger.log_info("Will check if session is authenticated")
-            self.browser.perform_interaction(self.config['authed_url'], method='GET') 
-            driver = self.browser.driver
-            if self.config['authed_url'] in driver.current_url:
-                self.logger.log_info("Found previous authentication.")
-                self.is_authenticated = True
-                return True
-            else:
-                self.logger.log_info(f"Unable to find previous authentication. Url is: {driver.current_url}")                
-                self.is_authenticated = False
-                return False
+            with self.browser.instrumentation.span('auth.check', site='oreilly', driver=self.browser.driver_label()) as span:
+                if (self.auth_cache and not self._login_redirected
+                        and self.auth_cache.is_fresh(self.config['authed_url'], self.config['authed_url'], self.config['auth_ttl'])):
+                    self.logger.log_info("Previous authentication is still fresh, skipping the check.")
+                    span['authenticated'] = span['cached'] = True
+                    self.is_authenticated = True
+                    return True
+                self.browser.perform_interaction(self.config['authed_url'], method='GET') 
+                driver = self.browser.driver
+                span['authenticated'] = self.config['authed_url'] in driver.current_url
+                if span['authenticated']:
+                    self.logger.log_info("Found previous authentication.")
+                    self.is_authenticated = True
+                    self._login_redirected = False
+                    if self.auth_cache:
+                        self.auth_cache.record_success(self.config['authed_url'], self.config['authed_url'])
+                    return True
+                else:
+                    self.logger.log_info(f"Unable to find previous authentication. Url is: {driver.current_url}")                
+                    self.is_authenticated = False
+                    if self.auth_cache:
+                        self.auth_cache.invalidate(self.config['authed_url'])
+                    return False
         except Exception as e:
             self.logger.log_error(f"An error occurred during authentication: {e}")
             raise
     
-    def process_urls(self, urls: list) -> list:
-        pass
+    def _detect_login_redirect(self, browser: Browser, url: str) -> None:
+        login_url = self.config['login_url']
+        if url.startswith(login_url) or not browser.driver.current_url.startswith(login_url):
+            return
+        self.logger.log_info(f"Request for {url} was redirected to the login page; authentication will be checked again.")
+        self.is_authenticated = False
+        self._login_redirected = True
+        self._redirects.seen = True
+        self.auth_cache.invalidate(self.config['authed_url'])
+
+    def ensure_authenticated(self) -> bool:
+        """
+        Checks the authentication, signing in again if it was lost. Concurrent workers that hit a login
+        redirect at the same time authenticate only once.
+
+        Returns:
+            bool: True if the session is authenticated.
+        """
+        with self._auth_lock:
+            if self.is_authenticated:
+                return True
+            if not self.check_authentication():
+                self.authenticate(self.config['credentials'])
+                # Write the new session before pooled browsers restore it, or write-behind leaves them the expired one
+                if self.browser.session_manager:
+                    self.browser.session_manager.flush()
+                # Pooled browsers restore the new session on their next visit instead of saving the expired one
+                for pooled in self.pool.browsers if self.pool else []:
+                    if pooled.session_manager:
+                        pooled.session_manager.history.clear()
+            return self.is_authenticated
+
+    def authenticate_identities(self) -> dict:
+        """
+        Signs in every identity of the pool's IdentityPool once, on one pooled browser, so each has a
+        stored session before workers rotate between them.
+
+        Returns:
+            dict: Whether each identity is authenticated, by name.
+        """
+        identities = self.pool.identities
+        results = {}
+        browser = self.pool.acquire()
+        bound = browser.identity
+        try:
+            for name in identities.names:
+                browser.switch_identity(name)
+                site = OreillySite(browser=browser, logger=self.logger, config=self.config)
+                if not site.check_authentication():
+                    site.authenticate(identities.credentials(name))
+                browser.session_manager.flush()
+                results[name] = site.is_authenticated
+        finally:
+            browser.switch_identity(bound)
+            self.pool.release(browser, throttled=False)
+        self.logger.log_info(f"Authenticated identities: {results}")
+        return results
+
+    def process_urls(self, urls: Iterable[str] = None, workers: int = None, ordered: bool = False,
+                     frontier: Frontier = None, store: PageStore = None,
+                     recrawl: Recrawler = None) -> Iterator[ScrapeResult]:
+        """
+        Processes a stream of URLs, yielding one ScrapeResult per URL as soon as it completes.
+
+        URLs are pulled from the input lazily and results are not retained, so the input may be
+        a large iterator. A failure on one URL is captured in its result and does not stop the batch.
+
+        Args:
+            urls (Iterable[str], optional): The URLs to process. With a frontier, they are added to it first.
+            workers (int, optional): The number of concurrent workers. Defaults to the pool size,
+                or 1 when no pool is configured, since a single Browser is not thread-safe.
+            ordered (bool): If True, results are yielded in input order.
+            frontier (Frontier, optional): A persistent work queue. Its pending URLs are processed
+                and each one is marked done or failed, so an interrupted batch resumes where it stopped.
+                Failed URLs are retried in the same run until they reach the frontier's max_attempts.
+            store (PageStore, optional): Successful results are written to it as they complete,
+                and their content_hash is set.
+            recrawl (Recrawler, optional): Renders only pages that changed since the last crawl. Unchanged
+                and skipped pages are served from the store when one is given, and have no content otherwise.
+
+        Yields:
+            ScrapeResult: The result for each URL.
+        """
+        if self.pool is None:
+            workers = 1
+        elif workers is None:
+            workers = self.pool.size
+        if frontier is not None:
+            if urls is not None:
+                self.logger.log_info(f"Added {frontier.add_many(urls)} new URLs to the frontier.")
+            urls = frontier.stream(batch_size=workers * 2)
+            if store is not None:
+                frontier.checkpoint_hooks.append(store.flush)
+        self.logger.log_info(f"Processing URLs with {workers} workers (ordered={ordered}).")
+        processed = failed = 0
+        executor = StreamingExecutor(workers=workers)
+        process = self._process_single_url
+        if recrawl is not None:
+            process = lambda url: recrawl.process(url, self._process_single_url)
+        try:
+            offset = 0
+            while True:
+                retried = 0
+                for index, url, content, error in executor.map(process, urls, ordered=ordered):
+                    processed += 1
+                    status = content_hash = None
+                    if not error and recrawl is not None:
+                        status, content = content
+                        if status != FETCHED and store is not None:
+                            fetches = store.history(url)
+                            if fetches:
+                                content_hash = fetches[-1][1]
+                                content = store.get_by_hash(content_hash)
+                    result = ScrapeResult(index=offset + index, url=url, content=content, error=error, status=status,
+                                          content_hash=content_hash)
+                    if store is not None and not error and content is not None and status in (None, FETCHED):
+                        try:
+                            result.content_hash = store.put(url, content)
+                        except Exception as e:
+                            # e.g. extractor output that can't be serialized; fail this URL, not the batch
+                            result.error = e
+                    if result.error:
+                        failed += 1
+                        self.logger.log_error(f"Failed to process {url}: {result.error}")
+                    if frontier is not None:
+                        if result.error:
+                            retried += frontier.fail(url, result.error)
+                        else:
+                            frontier.complete(url)
+                    yield result
+                # The frontier stream ends when nothing is left to claim, while URLs still in flight may
+                # fail and go back to pending; another pass picks those up until their attempts run out
+                if not retried:
+                    break
+                offset = processed
+                urls = frontier.stream(batch_size=workers * 2)
+        finally:
+            # Pages are written before their URLs are committed as done, here and at every frontier checkpoint
+            if store is not None:
+                store.flush()
+            if frontier is not None:
+                frontier.checkpoint()
+                if store is not None:
+                    frontier.checkpoint_hooks.remove(store.flush)
+        self.logger.log_info(f"Finished processing {processed} URLs ({failed} failed).")
+        if recrawl is not None:
+            self.logger.log_info("Recrawl: %s", recrawl.stats)
+
+    def _process_single_url(self, url: str):
+        self._redirects.seen = False
+        content = self._interact(url)
+        if self.auth_cache and self._redirects.seen:
+            # The session was trusted without a probe and has expired; sign in again and retry once
+            self.ensure_authenticated()
+            content = self._interact(url)
+        return content
 
-    def _process_single_url(self, url: str) -> str:
-        pass
+    def _interact(self, url: str):
+        if self.pool is not None:
+            return self.pool.perform_interaction(url, method='GET', extractor=self.extractor)
+        return self.browser.perform_interaction(url, method='GET', extractor=self.extractor)
@@ -0,0 +1,27 @@
+# model/ScrapeResult.py
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class ScrapeResult:
+    """
+    The outcome of processing a single URL in a batch.
+
+    Attributes:
+        index (int): The position of the URL in the input.
+        url (str): The URL that was processed.
+        content: The value returned by the interaction, or None if it failed.
+        error (Exception, optional): The exception raised while processing the URL, if any.
+        content_hash (str, optional): The content's hash when it was written to a PageStore.
+        status (str, optional): With a Recrawler, 'fetched', 'unchanged' or 'skipped'.
+    """
+    index: int
+    url: str
+    content: object = None
+    error: Optional[Exception] = None
+    content_hash: Optional[str] = None
+    status: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
@@ -1,30 +1,131 @@
+from contextlib import nullcontext
+from urllib.parse import urlsplit
 from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import WebDriverException
 from interfaces.LoggerInterface import LoggerInterface
+from services.utils.DevTools import DevTools
+from services.utils.Instrumentation import Instrumentation
+from services.utils.URLUtils import URLUtils
+
+NAVIGATION_STATUS_SCRIPT = (
+    "var entry = performance.getEntriesByType('navigation')[0];"
+    "return [location.href, (entry && entry.responseStatus) || 0];"
+)
 
 class Browser:
 
     _instance = None
 
-    def __new__(cls, *args, **kwargs):
+    def __new__(cls, *args, shared=True, **kwargs):
+        # Pooled browsers pass shared=False to get their own instance instead of the singleton
+        if not shared:
+            return super(Browser, cls).__new__(cls)
         if cls._instance is None:
             cls._instance = super(Browser, cls).__new__(cls)
         return cls._instance
 
-    def __init__(self, engine=None, logger: LoggerInterface = None, session_manager=None):
+    def __init__(self, engine=None, logger: LoggerInterface = None, session_manager=None, shared=True, cache=None,
+                 http_engine=None, instrumentation: Instrumentation = None, scheduler=None, lifecycle=None):
         if not hasattr(self, 'initialized'):
             self.engine = engine
+            # Optional PageCache; hits are served without touching the driver
+            self.cache = cache
+            # Optional HttpEngine; URLs its rules map to 'http' are fetched without the browser
+            self.http_engine = http_engine
+            # Optional DomainScheduler shared by every browser hitting the same sites
+            self.scheduler = scheduler
             self.driver = self.engine.get_driver()
             self.logger = logger
+            self.last_resource_stats = None
+            # The scheduler outcome ('status', 'final_url') and URL of the last non-cached interaction
+            self.last_outcome = {}
+            # Timing spans for every stage of an interaction; subscribers decide what to do with them
+            self.instrumentation = instrumentation or Instrumentation()
             self.hooks = {}
             self.session_manager = session_manager
             if self.session_manager:
                 session_manager.set_driver(self.driver)
+                session_manager.instrumentation = self.instrumentation
+                # A reattached browser already holds the sessions it restored in a previous process
+                session_manager.history.update(getattr(self.engine, 'restored_domains', []))
                 self._set_hook("after_interaction", lambda url_provider: self.session_manager.validate(url_provider()))
+            # Optional DriverLifecycleManager that probes, recycles and replaces the driver
+            self.lifecycle = lifecycle
+            if self.lifecycle:
+                self.lifecycle.bind(self)
             self.initialized = True
 
     def _set_hook(self,trigger, hook):
-            self.hooks[trigger] = hook
+            self.hooks[trigger] = [hook]
+
+    def add_hook(self, trigger, hook):
+        """
+        Adds a hook for a trigger, keeping the hooks already registered.
+
+        Args:
+            trigger (str): The trigger name, e.g. 'after_interaction'.
+            hook (callable): Called with a callable returning the interaction URL.
+        """
+        self.hooks.setdefault(trigger, []).append(hook)
+
+    def _run_hooks(self, trigger, url):
+        for hook in self.hooks.get(trigger, []):
+            hook(lambda: url)
+
+    def driver_label(self) -> str:
+        session_id = getattr(self.driver, 'session_id', None)
+        return session_id[:8] if session_id else ''
+
+    def replace_engine(self, engine):
+        """
+        Switches the browser to a new engine. The SessionManager forgets which sessions it restored,
+        so each domain's stored session is restored into the new driver on its next interaction.
+        The old engine is not closed.
+
+        Args:
+            engine: The new engine, e.g. a ChromeRemote.
+        """
+        self.engine = engine
+        self.driver = engine.get_driver()
+        if self.session_manager:
+            self.session_manager.set_driver(self.driver)
+            self.session_manager.history.clear()
+
+    @property
+    def identity(self) -> str:
+        return self.session_manager.identity if self.session_manager else None
+
+    def switch_identity(self, identity: str) -> None:
+        """
+        Binds the browser to another account. The current account's pending session changes are written,
+        the driver's cookies and the current page's storage are cleared, and each domain's session of the
+        new account is restored on its next interaction.
+
+        Args:
+            identity (str): The name of the account, e.g. from an IdentityPool.
+        """
+        if self.session_manager is None or self.session_manager.identity == identity:
+            return
+        self.session_manager.flush()
+        self.session_manager.identity = identity
+        self.session_manager.history.clear()
+        try:
+            DevTools(self.driver).execute('Network.clearBrowserCookies')
+        except Exception:
+            self.driver.delete_all_cookies()
+        self.driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        if self.logger:
+            self.logger.log_info(f"Browser {self.driver_label()} switched to identity {identity}.")
+
+    def _restore_session_for(self, url: str) -> None:
+        """
+        Loads the site's origin and restores its stored session before the page itself is read. A new,
+        replaced or re-bound driver would otherwise return its first page of each domain logged-out.
+        """
+        self.logger.log_info(f"Restoring the stored session before loading {url}.")
+        parts = urlsplit(url)
+        self.driver.get(f"{parts.scheme}://{parts.netloc}/")
+        self.session_manager.validate(url)
 
     def _close_browser(self):
         try:
@@ -36,7 +137,7 @@ class Browser:
                 self.logger.log_error(f"Error destroying session: {e}")
             raise            
 
-    def perform_interaction(self, url, data=None, method='GET'):
+    def perform_interaction(self, url, data=None, method='GET', extractor=None):
         """
         Perform an interaction with the web page.
 
@@ -44,19 +145,79 @@ class Browser:
             url (str): The URL to interact with.
             data (dict, optional): The data to send in a POST request.
             method (str): The HTTP method to use, either 'GET' or 'POST'.
+            extractor (Extractor, optional): If given, the extraction runs in the browser and its
+                result is returned instead of the page source.
 
         Returns:
             response: The response object from the interaction.
         """
+        if self.lifecycle:
+            return self.lifecycle.run(lambda: self._perform_interaction(url, data, method, extractor), url)
+        return self._perform_interaction(url, data, method, extractor)
+
+    def _perform_interaction(self, url, data, method, extractor):
+        variant = extractor.signature if extractor else ''
+        self.last_outcome = {}
+        labels = {'site': URLUtils.registrable_domain(url), 'driver': self.driver_label()}
         try:
-            self.logger.log_info(f"Performing interaction with URL: {url}")
-            self.driver.get(url)
-            if method == 'POST' and data:
-                self.driver.execute_script("fetch(arguments[0], {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify(arguments[1])})", url, data)
-            response = self.driver.page_source
-            self.logger.log_info(f"Interaction with URL: {url} completed successfully.")
-            self.hooks['after_interaction'](lambda: url)
-            return response
+            with self.instrumentation.span('interaction', url=url, method=method, **labels) as span:
+                if self.cache and method == 'GET':
+                    cached = self.cache.get(url, variant=variant)
+                    if cached is not None:
+                        self.logger.log_info(f"Served {url} from page cache.")
+                        span['mode'] = 'cache'
+                        self.instrumentation.emit('cache.hit', url=url, **labels)
+                        return cached
+                # Pace requests per domain; cache hits above never reach the site
+                with self.scheduler.slot(url) if self.scheduler else nullcontext({}) as outcome:
+                    self.last_outcome = outcome
+                    outcome['url'] = url
+                    # Extractors run JavaScript, so those pages always go through the browser
+                    if self.http_engine and not extractor and self.http_engine.handles(url):
+                        self.logger.log_info(f"Fetching URL over HTTP: {url}")
+                        span['mode'] = 'http'
+                        with self.instrumentation.span('http.fetch', url=url, **labels) as fetch_span:
+                            response = self.http_engine.fetch(url, data=data, method=method)
+                            fetch_span['bytes'] = len(response)
+                    else:
+                        self.logger.log_info(f"Performing interaction with URL: {url}")
+                        span['mode'] = 'browser'
+                        if self.session_manager:
+                            # Coalesced session changes of the page being left must be read before leaving it
+                            self.session_manager.before_navigation(url)
+                            if self.session_manager.needs_restore(url):
+                                self._restore_session_for(url)
+                        # DevTools engines load, check and read the page in one call
+                        load_page = getattr(self.engine, 'load_page', None) if not (method == 'POST' and data) else None
+                        self.instrumentation.emit('navigation.before', url=url, **labels)
+                        with self.instrumentation.span('navigation', url=url, devtools=bool(load_page), **labels) as navigation_span:
+                            if load_page:
+                                outcome['final_url'], outcome['status'], response = load_page(url, extractor)
+                                if isinstance(response, str):
+                                    navigation_span['bytes'] = len(response)
+                            else:
+                                self.driver.get(url)
+                                if method == 'POST' and data:
+                                    self.driver.execute_script("fetch(arguments[0], {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify(arguments[1])})", url, data)
+                        if not load_page:
+                            if self.scheduler:
+                                # One round-trip for the final URL and status, so throttling and login redirects are seen
+                                navigation = self.driver.execute_script(NAVIGATION_STATUS_SCRIPT)
+                                if navigation:
+                                    outcome['final_url'], outcome['status'] = navigation
+                            with self.instrumentation.span('page_source', url=url, extracted=bool(extractor), **labels) as source_span:
+                                response = extractor.run(self.driver) if extractor else self.driver.page_source
+                                if isinstance(response, str):
+                                    source_span['bytes'] = len(response)
+                        blocker = getattr(self.engine, 'blocker', None)
+                        if blocker and blocker.collect_stats:
+                            self.last_resource_stats = blocker.page_stats(self.driver)
+                            self.logger.log_debug(f"Resource requests for {url}: {self.last_resource_stats}")
+                        self._run_hooks('after_interaction', url)
+                self.logger.log_info(f"Interaction with URL: {url} completed successfully.")
+                if self.cache and method == 'GET':
+                    self.cache.put(url, response, variant=variant)
+                return response
         except Exception as e:
             self.logger.log_error(f"An error occurred during interaction with {url}: {e}")
             raise
@@ -64,6 +225,16 @@ class Browser:
     def close(self):
         try:
             self.logger.log_info(f"Shuting down browser.")            
+            if self.session_manager:
+                # Capture and write any coalesced session changes while the driver is still alive
+                self.session_manager.close()
+                if hasattr(self.engine, 'restored_domains'):
+                    self.engine.restored_domains = list(self.session_manager.history)
+            if self.http_engine:
+                self.http_engine.close()
+            if self.lifecycle:
+                self.lifecycle.close()
+                self.logger.log_info("Driver lifecycle: %s", self.lifecycle.report())
             self._close_browser()
         except Exception as e:
             if self.logger:
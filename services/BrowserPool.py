@@ -0,0 +1,226 @@
+# File: services/BrowserPool.py
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from interfaces.LoggerInterface import LoggerInterface
+from services.Browser import Browser
+from services.DomainScheduler import DomainScheduler, THROTTLE_STATUSES
+from services.IdentityPool import IdentityPoolExhausted
+
+class BrowserPoolExhausted(Exception):
+    pass
+
+class BrowserPool:
+    def __init__(self, engine_factory=None, logger: LoggerInterface = None, session_manager_factory=None, size: int = 4,
+                 browser_factory=None, instrumentation=None, scheduler=None, lifecycle_factory=None, identities=None,
+                 cache=None, http_engine=None):
+        """
+        Initializes a pool of independent Browser instances, each with its own remote driver.
+
+        Args:
+            engine_factory (callable): Returns a new engine (e.g. ChromeRemote) every time it is called.
+            logger (LoggerInterface): The logger instance for logging.
+            session_manager_factory (callable, optional): Returns a new SessionManager for each pooled browser.
+                If None, pooled browsers run without session persistence.
+            size (int): The number of browsers to keep in the pool.
+            browser_factory (callable, optional): Returns a ready Browser, e.g. StandbyPool.take. Used instead
+                of engine_factory and session_manager_factory when given.
+            instrumentation (Instrumentation, optional): Shared by every browser the pool creates.
+            scheduler (DomainScheduler, optional): Shared by every browser the pool creates, so per-domain
+                limits hold across the whole pool.
+            lifecycle_factory (callable, optional): Returns a new DriverLifecycleManager for each pooled browser.
+            identities (IdentityPool, optional): Accounts spread over the browsers. Browsers are bound to them
+                round-robin, lease their identity on every checkout and rotate to another one while theirs
+                is busy or cooling down. Throttling is reported back, which needs a scheduler for
+                browser-rendered pages.
+            cache (PageCache, optional): Shared by every browser the pool creates, so a page fetched by one
+                worker is served from the cache to the others.
+            http_engine (HttpEngine, optional): Shared by every browser the pool creates, so URLs its rules
+                map to 'http' are fetched without a browser. The pool does not close it.
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        if engine_factory is None and browser_factory is None:
+            raise ValueError("BrowserPool needs an engine_factory or a browser_factory.")
+        self.browser_factory = browser_factory
+        self.instrumentation = instrumentation
+        self.scheduler = scheduler
+        self.lifecycle_factory = lifecycle_factory
+        self.identities = identities
+        self.cache = cache
+        self.http_engine = http_engine
+        self.engine_factory = engine_factory
+        self.session_manager_factory = session_manager_factory
+        self.logger = logger
+        self.size = size
+        self.browsers = []
+        self._available = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._start()
+
+    def _create_browser(self, index: int) -> Browser:
+        """
+        Creates one pooled browser and wires its SessionManager hooks the same way a shared Browser does.
+
+        Args:
+            index (int): The position of the browser in the pool, used for logging.
+
+        Returns:
+            Browser: A non-shared Browser instance.
+        """
+        if self.logger:
+            self.logger.log_debug(f"Creating pooled browser {index + 1}/{self.size}.")
+        if self.browser_factory:
+            browser = self.browser_factory()
+        else:
+            engine = self.engine_factory()
+            session_manager = self.session_manager_factory() if self.session_manager_factory else None
+            browser = Browser(engine=engine, logger=self.logger, session_manager=session_manager, shared=False,
+                              cache=self.cache, http_engine=self.http_engine, instrumentation=self.instrumentation, scheduler=self.scheduler,
+                              lifecycle=self.lifecycle_factory() if self.lifecycle_factory else None)
+        if self.cache is not None and browser.cache is None:
+            # Browsers from a browser_factory are built elsewhere
+            browser.cache = self.cache
+        if self.http_engine is not None and browser.http_engine is None:
+            browser.http_engine = self.http_engine
+        if self.lifecycle_factory and browser.lifecycle is None:
+            browser.lifecycle = self.lifecycle_factory()
+            browser.lifecycle.bind(browser)
+        if self.identities and browser.session_manager:
+            names = self.identities.names
+            browser.session_manager.identity = names[index % len(names)]
+        return browser
+
+    def _start(self):
+        """
+        Creates all pooled browsers in parallel, since each remote session takes seconds to start.
+        """
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(self._create_browser, index) for index in range(self.size)]
+            errors = []
+            for future in futures:
+                try:
+                    self.browsers.append(future.result())
+                except Exception as e:
+                    errors.append(e)
+        for browser in self.browsers:
+            self._available.put(browser)
+        if errors:
+            if self.logger:
+                self.logger.log_error(f"Failed to create {len(errors)} of {self.size} pooled browsers: {errors[0]}")
+            self.close()
+            raise errors[0]
+        if self.logger:
+            self.logger.log_info(f"Browser pool started with {self.size} browsers.")
+
+    def acquire(self, timeout: float = None) -> Browser:
+        """
+        Checks a browser out of the pool, blocking until one is free.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a free browser. None waits forever.
+
+        Returns:
+            Browser: A browser reserved for the caller until it is released.
+
+        Raises:
+            BrowserPoolExhausted: If no browser became free within the timeout or the pool is closed.
+        """
+        if self._closed:
+            raise BrowserPoolExhausted("Browser pool is closed.")
+        try:
+            browser = self._available.get(timeout=timeout)
+        except queue.Empty:
+            raise BrowserPoolExhausted(f"No browser became available within {timeout} seconds.")
+        if self.identities and browser.session_manager:
+            try:
+                identity = self.identities.lease(preferred=browser.identity, timeout=timeout)
+            except IdentityPoolExhausted as e:
+                self._available.put(browser)
+                raise BrowserPoolExhausted(str(e))
+            try:
+                browser.switch_identity(identity)
+            except Exception:
+                # Neither the lease nor the browser may leak when the switch fails
+                self.identities.release(identity)
+                self._available.put(browser)
+                raise
+        return browser
+
+    def release(self, browser: Browser, throttled: bool = None) -> None:
+        """
+        Returns a browser to the pool, and its identity to the IdentityPool.
+
+        Args:
+            browser (Browser): A browser previously obtained from acquire().
+            throttled (bool, optional): Whether the site throttled the browser's identity. If None, it is
+                read from the browser's last interaction.
+        """
+        if self.identities and browser.session_manager:
+            if throttled is None:
+                throttled = self._was_throttled(browser)
+            self.identities.release(browser.identity, throttled=throttled)
+        if self._closed:
+            return
+        self._available.put(browser)
+
+    def _was_throttled(self, browser: Browser) -> bool:
+        outcome = browser.last_outcome
+        if outcome.get('status') in THROTTLE_STATUSES:
+            return True
+        return bool(self.scheduler and self.scheduler.is_login_redirect(outcome.get('url', ''), outcome.get('final_url')))
+
+    @contextmanager
+    def browser(self, timeout: float = None):
+        """
+        Context manager that checks a browser out and always returns it afterwards.
+        """
+        browser = self.acquire(timeout=timeout)
+        throttled = None
+        try:
+            yield browser
+        except Exception as e:
+            if DomainScheduler.is_throttle_error(e):
+                throttled = True
+            raise
+        finally:
+            self.release(browser, throttled=throttled)
+
+    def perform_interaction(self, url, data=None, method='GET', extractor=None, timeout: float = None):
+        """
+        Performs an interaction on whichever pooled browser is free.
+
+        Args:
+            url (str): The URL to interact with.
+            data (dict, optional): The data to send in a POST request.
+            method (str): The HTTP method to use, either 'GET' or 'POST'.
+            extractor (Extractor, optional): Returns extracted data instead of the page source.
+            timeout (float, optional): Seconds to wait for a free browser.
+
+        Returns:
+            response: The response object from the interaction.
+        """
+        with self.browser(timeout=timeout) as browser:
+            return browser.perform_interaction(url, data=data, method=method, extractor=extractor)
+
+    def close(self):
+        """
+        Closes every pooled browser. Errors are logged and the remaining browsers are still closed.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for browser in self.browsers:
+            if browser.http_engine is self.http_engine:
+                # The shared engine belongs to the caller
+                browser.http_engine = None
+            try:
+                browser.close()
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_error(f"Error closing pooled browser: {e}")
+        if self.logger:
+            self.logger.log_info("Browser pool closed.")
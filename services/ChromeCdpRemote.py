@@ -0,0 +1,205 @@
+# File: services/ChromeCdpRemote.py
+import json
+from interfaces.LoggerInterface import LoggerInterface
+from selenium.common.exceptions import WebDriverException
+from services.ChromeRemote import ChromeRemote
+from services.utils.CdpConnection import CdpConnection, CdpError
+from services.utils.DevTools import DevTools
+from config import Config
+
+# The navigation status, final URL and content, read in the same evaluation
+_PAGE_EXPRESSION = (
+    "(function () {"
+    " var entry = performance.getEntriesByType('navigation')[0];"
+    " return [location.href, (entry && entry.responseStatus) || 0, __CONTENT__];"
+    " })()"
+)
+_SOURCE_EXPRESSION = "document.documentElement.outerHTML"
+_STORAGE_EXPRESSION = "[Object.assign({}, window.localStorage), Object.assign({}, window.sessionStorage)]"
+_RESTORE_STORAGE_EXPRESSION = (
+    "(function (local, session) {"
+    " [[window.localStorage, local], [window.sessionStorage, session]].forEach(function (pair) {"
+    " Object.keys(pair[1]).forEach(function (key) { pair[0].setItem(key, pair[1][key]); }); });"
+    " return location.protocol.indexOf('http') === 0 && document.readyState !== 'loading'"
+    " && !!document.body && document.body.childElementCount > 0;"
+    " }).apply(null, __ARGS__)"
+)
+
+class ChromeCdpRemote(ChromeRemote):
+    def __init__(self, *args, cdp_timeout: float = None, load_event: str = 'Page.domContentEventFired', **kwargs):
+        """
+        Initializes a remote Chrome engine that also opens the session's DevTools WebSocket through the
+        Grid's CDP endpoint (the 'se:cdp' capability of Selenium Grid 4).
+
+        The session is created over WebDriver as with ChromeRemote, and WebDriver stays available for
+        everything else. Page loads, cookie reads and writes and session capture go over the socket:
+        navigation, the load event, the status and the content or extraction result take one call,
+        and cookie and storage commands are pipelined in one batch instead of one HTTP round-trip each.
+        DevTools commands sent through DevTools(driver) use the socket as well.
+
+        Args:
+            *args: Passed to ChromeRemote.
+            cdp_timeout (float, optional): Seconds to wait for a command or page load. Defaults to Config.CDP_TIMEOUT.
+            load_event (str): The event that ends a page load. DOMContentLoaded matches the 'eager' page load
+                strategy used over WebDriver; 'Page.loadEventFired' also waits for subresources.
+            **kwargs: Passed to ChromeRemote.
+        """
+        self.cdp_timeout = cdp_timeout or Config.CDP_TIMEOUT
+        self.load_event = load_event
+        self.cdp = None
+        self.cdp_session_id = None
+        self._network_enabled = False
+        super().__init__(*args, **kwargs)
+
+    def _initiate_driver(self):
+        super()._initiate_driver()
+        try:
+            self._open_cdp()
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error(f"Could not open the DevTools connection, closing the session: {e}")
+            self.persist_session = False
+            self.quit_driver()
+            raise
+
+    def _open_cdp(self) -> None:
+        ws_url = (self.driver.caps or {}).get('se:cdp')
+        if not ws_url:
+            raise WebDriverException("The session has no 'se:cdp' endpoint; ChromeCdpRemote needs Selenium Grid 4 with Chrome.")
+        self.cdp = CdpConnection(ws_url, logger=self.logger, timeout=self.cdp_timeout).open()
+        self.cdp_session_id = self.cdp.run(self._attach, self.driver.current_window_handle)
+        # Lets DevTools(driver) and the SessionManager find the socket from the driver alone
+        self.driver.cdp_engine = self
+        if self.logger:
+            self.logger.log_info("DevTools connection attached to the session's page.")
+
+    async def _attach(self, window_handle: str) -> str:
+        # Chrome's window handles are the target IDs of its pages
+        targets = (await self.cdp.send('Target.getTargets'))['targetInfos']
+        pages = [target for target in targets if target['type'] == 'page']
+        target = next((page for page in pages if page['targetId'] == window_handle), pages[0] if pages else None)
+        if target is None:
+            raise CdpError("The session has no page to attach to.")
+        attached = await self.cdp.send('Target.attachToTarget', {'targetId': target['targetId'], 'flatten': True})
+        await self.cdp.send('Page.enable', session_id=attached['sessionId'])
+        return attached['sessionId']
+
+    def execute(self, cmd: str, params: dict = None) -> dict:
+        """
+        Sends one DevTools command to the session's page.
+        """
+        return self.cdp.execute(cmd, params, self.cdp_session_id)
+
+    def execute_many(self, commands: list) -> list:
+        """
+        Sends (method, params) commands to the session's page in one pipelined batch.
+        """
+        return self.cdp.execute_many(commands, self.cdp_session_id)
+
+    def add_listener(self, event: str, callback) -> None:
+        """
+        Calls callback(params, session_id) for every occurrence of a DevTools event, e.g.
+        'Network.responseReceived'. The Network domain is enabled on first use.
+        """
+        if event.startswith('Network.') and not self._network_enabled:
+            self.execute('Network.enable')
+            self._network_enabled = True
+        self.cdp.add_listener(event, callback)
+
+    async def _evaluate(self, expression: str):
+        evaluation = await self.cdp.send('Runtime.evaluate', {'expression': expression, 'returnByValue': True,
+                                                              'awaitPromise': True}, self.cdp_session_id)
+        if 'exceptionDetails' in evaluation:
+            details = evaluation['exceptionDetails']
+            raise CdpError(f"Script failed: {details.get('exception', {}).get('description') or details.get('text')}")
+        return evaluation['result'].get('value')
+
+    async def _load(self, url: str, expression: str) -> list:
+        loaded = self.cdp.expect(self.load_event, self.cdp_session_id)
+        navigation = await self.cdp.send('Page.navigate', {'url': url}, self.cdp_session_id)
+        if navigation.get('errorText'):
+            self.cdp.discard(loaded)
+            raise CdpError(f"Navigation to {url} failed: {navigation['errorText']}")
+        # Same-document navigations have no loader and fire no load event
+        if navigation.get('loaderId'):
+            await self.cdp.wait_event(loaded)
+        else:
+            self.cdp.discard(loaded)
+        return await self._evaluate(expression)
+
+    def load_page(self, url: str, extractor=None) -> tuple:
+        """
+        Navigates to a URL, waits for the load event and reads the page in one call over the socket.
+
+        Args:
+            url (str): The URL to load.
+            extractor (Extractor, optional): Runs in the page instead of returning its source.
+
+        Returns:
+            tuple: (final_url, status, content). content is the page source or the extraction result.
+        """
+        content = extractor.expression() if extractor else _SOURCE_EXPRESSION
+        return tuple(self.cdp.run(self._load, url, _PAGE_EXPRESSION.replace('__CONTENT__', content)))
+
+    def get_cookies(self) -> list:
+        """
+        Returns the cookies of the current page in WebDriver format.
+        """
+        return [DevTools.from_cdp_cookie(cookie) for cookie in self.execute('Network.getCookies')['cookies']]
+
+    def set_cookies(self, cookies: list) -> None:
+        """
+        Adds cookies given in WebDriver format with one command.
+        """
+        self.execute('Network.setCookies', {'cookies': [DevTools.to_cdp_cookie(cookie) for cookie in cookies]})
+
+    def capture_session(self) -> dict:
+        """
+        Reads cookies, local storage and session storage in one pipelined batch.
+
+        Returns:
+            dict: The session data, in the format the SessionManager stores.
+        """
+        cookies, storage = self.execute_many([
+            ('Network.getCookies', {}),
+            ('Runtime.evaluate', {'expression': _STORAGE_EXPRESSION, 'returnByValue': True})
+        ])
+        local_storage, session_storage = storage['result'].get('value') or ({}, {})
+        return {
+            'cookies': [DevTools.from_cdp_cookie(cookie) for cookie in cookies['cookies']],
+            'local_storage': local_storage,
+            'session_storage': session_storage
+        }
+
+    async def _restore(self, cookies: list, storage_expression: str, refresh_unrendered: bool) -> bool:
+        commands = [('Runtime.evaluate', {'expression': storage_expression, 'returnByValue': True})]
+        if cookies:
+            commands.insert(0, ('Network.setCookies', {'cookies': [DevTools.to_cdp_cookie(cookie) for cookie in cookies]}))
+        rendered = (await self.cdp.send_batch(commands, self.cdp_session_id))[-1]['result'].get('value')
+        if rendered or refresh_unrendered:
+            loaded = self.cdp.expect(self.load_event, self.cdp_session_id)
+            await self.cdp.send('Page.reload', {}, self.cdp_session_id)
+            await self.cdp.wait_event(loaded)
+        return bool(rendered)
+
+    def restore_session(self, cookies: list, local_storage: dict, session_storage: dict,
+                        refresh_unrendered: bool = True) -> bool:
+        """
+        Writes cookies and storage in one pipelined batch, then reloads the page so it picks them up.
+
+        Args:
+            cookies (list): The cookies to add, in WebDriver format.
+            local_storage (dict): The localStorage entries.
+            session_storage (dict): The sessionStorage entries.
+            refresh_unrendered (bool): Reload even if the page has not rendered content yet.
+
+        Returns:
+            bool: True if the page had rendered content before the reload.
+        """
+        expression = _RESTORE_STORAGE_EXPRESSION.replace('__ARGS__', json.dumps([local_storage, session_storage]))
+        return self.cdp.run(self._restore, cookies, expression, refresh_unrendered)
+
+    def quit_driver(self):
+        if self.cdp:
+            self.cdp.close()
+        super().quit_driver()
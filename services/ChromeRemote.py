@@ -2,25 +2,119 @@
 from interfaces.WebDriverInterface import WebDriverInterface
 from interfaces.LoggerInterface import LoggerInterface
 from selenium import webdriver
-from selenium.webdriver.remote.remote_connection import RemoteConnection
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
 from selenium.common.exceptions import WebDriverException, TimeoutException, NoSuchElementException, WebDriverException
+from config import Config
+import json
+import os
+import threading
+import time
 import requests
+import urllib3
+
+class _AttachedRemote(webdriver.Remote):
+    """
+    A Remote WebDriver bound to an existing session instead of creating a new one.
+    """
+    def __init__(self, session_id: str, capabilities: dict, **kwargs):
+        self._attach_session_id = session_id
+        self._attach_capabilities = capabilities or {}
+        super().__init__(**kwargs)
+
+    def start_session(self, capabilities: dict) -> None:
+        self.session_id = self._attach_session_id
+        self.caps = self._attach_capabilities
 
 class ChromeRemote(WebDriverInterface):
-    def __init__(self, remote_server_url="http://10.10.10.185:4444", logger: LoggerInterface = None, options=None):
-        self.remote_server_url = remote_server_url
+    # Successful reachability probes per server URL, shared by all instances
+    _verified_servers = {}
+    _verified_lock = threading.Lock()
+    VERIFY_TTL = 60
+
+    def __init__(self, remote_server_url=None, logger: LoggerInterface = None, options=None, blocker=None,
+                 session_id=None, capabilities=None, persist_session=False, restored_domains=None, balancer=None):
+        """
+        Initializes the remote Chrome engine.
+
+        Args:
+            remote_server_url (str, optional): The Grid URL. Defaults to Config.REMOTE_URL, or to the endpoint
+                chosen by the balancer.
+            logger (LoggerInterface): The logger instance for logging.
+            options (list, optional): Chrome command-line arguments.
+            blocker (ResourceBlocker, optional): A blocking policy applied when the session is created.
+            session_id (str, optional): An existing Grid session to reattach to instead of creating one.
+            capabilities (dict, optional): The capabilities of the session being reattached.
+            persist_session (bool): If True, quit_driver() saves the session to Config.DRIVER_SESSION_FILE
+                and leaves it running so the next process can reattach.
+            restored_domains (list, optional): Domains whose sessions are already loaded in a reattached browser.
+            balancer (GridBalancer, optional): Places the new session on the least-loaded of several Grids.
+        """
+        self.balancer = balancer
+        self.remote_server_url = remote_server_url or (None if balancer else Config.REMOTE_URL)
         self.driver = None
         self.logger = logger
         self.options = options
+        # Optional ResourceBlocker applied when the session is created
+        self.blocker = blocker
+        self.session_id = session_id
+        self.capabilities = capabilities
+        self.persist_session = persist_session
+        self.restored_domains = list(restored_domains or [])
+        self.reattached = False
         self._initiate_driver()
 
+    @classmethod
+    def from_saved_session(cls, session_file: str = None, **kwargs) -> "ChromeRemote":
+        """
+        Creates an engine that reattaches to the session saved by a previous process, if any,
+        and falls back to creating a new session otherwise.
+
+        Args:
+            session_file (str, optional): Defaults to Config.DRIVER_SESSION_FILE.
+            **kwargs: Passed to the constructor.
+
+        Returns:
+            ChromeRemote: The engine, with persist_session enabled.
+        """
+        session_file = session_file or Config.DRIVER_SESSION_FILE
+        saved = {}
+        if os.path.exists(session_file):
+            with open(session_file, 'r') as file:
+                saved = json.load(file)
+        if saved.get('remote_server_url') and not kwargs.get('remote_server_url'):
+            kwargs['remote_server_url'] = saved['remote_server_url']
+        return cls(session_id=saved.get('session_id'), capabilities=saved.get('capabilities'),
+                   restored_domains=saved.get('restored_domains'), persist_session=True, **kwargs)
+
+    def save_session(self, session_file: str = None) -> None:
+        """
+        Writes the Grid session ID and capabilities so another process can reattach to this browser.
+        """
+        session_file = session_file or Config.DRIVER_SESSION_FILE
+        directory = os.path.dirname(session_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(session_file, 'w') as file:
+            json.dump({
+                'remote_server_url': self.remote_server_url,
+                'session_id': self.driver.session_id,
+                'capabilities': self.driver.caps,
+                'restored_domains': self.restored_domains
+            }, file)
+
     def _verify_remote_server(self):
         """
-        Verify if the remote server is reachable.
+        Verify if the remote server is reachable. A successful probe is reused for VERIFY_TTL seconds.
         """
+        with ChromeRemote._verified_lock:
+            verified_at = ChromeRemote._verified_servers.get(self.remote_server_url)
+        if verified_at and time.monotonic() - verified_at < self.VERIFY_TTL:
+            return
         try:
             response = requests.get(self.remote_server_url, timeout=5)
             response.raise_for_status()
+            with ChromeRemote._verified_lock:
+                ChromeRemote._verified_servers[self.remote_server_url] = time.monotonic()
             if self.logger:
                 self.logger.log_debug(f"Remote server {self.remote_server_url} is reachable.")
         except requests.RequestException as e:
@@ -28,6 +122,72 @@ class ChromeRemote(WebDriverInterface):
                 self.logger.log_error(f"Cannot reach remote server {self.remote_server_url}: {e}")
             raise WebDriverException(f"Cannot reach remote server {self.remote_server_url}: {e}")
 
+    def _attach_driver(self, chrome_options) -> bool:
+        """
+        Reattaches to self.session_id and checks that the browser still answers.
+
+        Returns:
+            bool: True if the session is alive, False if a new one must be created.
+        """
+        try:
+            self.driver = _AttachedRemote(
+                self.session_id,
+                self.capabilities,
+                command_executor=self.connection,
+                options=chrome_options,
+                keep_alive=True
+            )
+            self.driver.current_url
+            self.reattached = True
+            if self.logger:
+                self.logger.log_info(f"Reattached to existing browser session {self.session_id}.")
+            return True
+        except Exception as e:
+            if self.logger:
+                self.logger.log_info(f"Could not reattach to session {self.session_id}, creating a new one: {e}")
+            self.driver = None
+            self.restored_domains = []
+            return False
+
+    def _create_driver(self, chrome_options) -> None:
+        # Verify the remote server before attempting to create the driver
+        self._verify_remote_server()
+
+        if self.logger:
+            self.logger.log_debug("Attempting to create remote WebDriver session.")
+
+        # Set up the remote WebDriver with a timeout
+        self.driver = webdriver.Remote(
+            command_executor=self.connection,
+            options=chrome_options,
+            keep_alive=True  # Keep the connection alive to prevent timeouts
+        )
+        if self.blocker:
+            self.blocker.apply(self.driver)
+
+    def _create_balanced_driver(self, chrome_options) -> None:
+        """
+        Creates the session on the endpoint the balancer picks, moving on to the next one if it fails.
+        """
+        tried = set()
+        while True:
+            self.remote_server_url = self.balancer.choose(exclude=tried)
+            tried.add(self.remote_server_url)
+            self.connection = ChromeRemoteConnection(self.remote_server_url)
+            start = time.monotonic()
+            try:
+                self._create_driver(chrome_options)
+            except (WebDriverException, urllib3.exceptions.HTTPError, requests.RequestException, OSError) as e:
+                # A hub that died after its last successful probe fails with connection errors, not WebDriverException
+                with ChromeRemote._verified_lock:
+                    ChromeRemote._verified_servers.pop(self.remote_server_url, None)
+                self.balancer.report_failure(self.remote_server_url, e)
+                continue
+            self.balancer.session_started(self.remote_server_url, time.monotonic() - start)
+            if self.logger:
+                self.logger.log_info(f"Browser session placed on {self.remote_server_url}.")
+            return
+
     def _initiate_driver(self):
         """
         Set up the Selenium WebDriver with the specified options for remote execution.
@@ -38,28 +198,29 @@ class ChromeRemote(WebDriverInterface):
                 self.logger.log_debug(f"Remote server URL: {self.remote_server_url}")
                 self.logger.log_debug(f"Options: {self.options}")
 
-            # Verify the remote server before attempting to create the driver
-            self._verify_remote_server()
-
             chrome_options = webdriver.ChromeOptions()
             if self.options:
                 for option in self.options:
                     chrome_options.add_argument(option)
             chrome_options.page_load_strategy = 'eager'
+            if self.blocker:
+                self.blocker.configure_options(chrome_options)
 
-            # Create remote connection
-            self.connection = RemoteConnection(self.remote_server_url)
+            # Reattaching needs no probe: the attach itself checks the session is alive
+            if self.session_id and self.remote_server_url:
+                # Create remote connection; the Chrome flavour also registers the DevTools command endpoint
+                self.connection = ChromeRemoteConnection(self.remote_server_url)
+                if self._attach_driver(chrome_options):
+                    if self.balancer:
+                        self.balancer.session_started(self.remote_server_url)
+                    return
 
-            if self.logger:
-                self.logger.log_debug("Attempting to create remote WebDriver session.")
+            if self.balancer:
+                self._create_balanced_driver(chrome_options)
+            else:
+                self.connection = ChromeRemoteConnection(self.remote_server_url)
+                self._create_driver(chrome_options)
 
-            # Set up the remote WebDriver with a timeout
-            self.driver = webdriver.Remote(
-                command_executor=self.connection,
-                options=chrome_options,
-                keep_alive=True  # Keep the connection alive to prevent timeouts
-            )
-            
             if self.logger:
                 self.logger.log_info("Browser setup completed successfully.")
         except TimeoutException as e:
@@ -85,7 +246,14 @@ class ChromeRemote(WebDriverInterface):
         return self.driver
 
     def quit_driver(self):
+        if self.driver and self.persist_session:
+            self.save_session()
+            if self.logger:
+                self.logger.log_info(f"Browser session {self.driver.session_id} left running for reattach.")
+            return
         if self.driver:
             self.driver.quit()
+            if self.balancer:
+                self.balancer.session_ended(self.remote_server_url)
             if self.logger:
                 self.logger.log_info("Browser closed successfully.")
@@ -0,0 +1,236 @@
+# File: services/DomainScheduler.py
+import threading
+import time
+from contextlib import contextmanager
+import requests
+from config import Config
+from interfaces.LoggerInterface import LoggerInterface
+from services.utils.URLUtils import URLUtils
+
+# Response statuses that mean the site wants us to slow down
+THROTTLE_STATUSES = (429, 503)
+
+class SchedulerTimeout(Exception):
+    pass
+
+class _DomainState:
+    def __init__(self, rate: float, burst: float, limit: float, max_concurrency: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.refilled_at = time.monotonic()
+        self.limit = limit
+        self.max_concurrency = max_concurrency
+        self.active = 0
+        self.latency = None
+        self.paused_until = 0.0
+        self.backoff = 0.0
+        self.condition = None
+        self.stats = {'requests': 0, 'throttled': 0, 'errors': 0, 'slow': 0, 'waited': 0.0}
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+class DomainScheduler:
+    def __init__(self, rate: float = 2.0, burst: float = 4, max_concurrency: int = 4, min_concurrency: int = 1,
+                 initial_concurrency: int = 2, slow_factor: float = 2.0, decrease_factor: float = 0.5,
+                 max_backoff: float = 60.0, domains: dict = None, login_urls: list = None, ignore_urls: list = None,
+                 logger: LoggerInterface = None):
+        """
+        Initializes a per-domain pacer: a token bucket limits the request rate and an adaptive cap limits
+        concurrent requests. The cap grows additively while requests succeed at normal latency and is cut
+        multiplicatively (AIMD) on errors, slowdowns, throttling statuses and login redirects. Throttling
+        also pauses the domain with an exponential backoff.
+
+        Domains are registrable domains as computed by URLUtils.registrable_domain.
+
+        Args:
+            rate (float): Requests per second per domain.
+            burst (float): The token bucket size, i.e. requests allowed back to back.
+            max_concurrency (int): The upper bound of the adaptive concurrency cap.
+            min_concurrency (int): The lower bound of the adaptive concurrency cap.
+            initial_concurrency (int): The cap a domain starts with.
+            slow_factor (float): A request slower than this multiple of the domain's usual latency is a slowdown.
+            decrease_factor (float): The multiplier applied to the cap on a slowdown, error or throttle.
+            max_backoff (float): The longest pause, in seconds, after repeated throttling.
+            domains (dict, optional): Per-domain overrides of 'rate', 'burst' and 'max_concurrency'.
+            login_urls (list, optional): URL prefixes of login pages; landing on one means the session was rejected.
+            ignore_urls (list, optional): URL prefixes whose redirects to a login page are expected,
+                e.g. the authentication check.
+            logger (LoggerInterface): The logger instance for logging.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.initial_concurrency = initial_concurrency
+        self.slow_factor = slow_factor
+        self.decrease_factor = decrease_factor
+        self.max_backoff = max_backoff
+        self.domain_settings = domains or {}
+        self.login_urls = list(login_urls or [])
+        self.ignore_urls = list(ignore_urls or []) + self.login_urls
+        self.logger = logger
+        self._domains = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, logger: LoggerInterface = None) -> "DomainScheduler":
+        """
+        Builds a DomainScheduler from Config, using each site's 'rate_limit' overrides and login URLs.
+        """
+        domains, login_urls, ignore_urls = {}, [], []
+        for site in Config.SITES.values():
+            if site.get('rate_limit'):
+                domains[URLUtils.registrable_domain(site['open_url'])] = site['rate_limit']
+            if site.get('login_url'):
+                login_urls.append(site['login_url'])
+            if site.get('authed_url'):
+                ignore_urls.append(site['authed_url'])
+        return cls(
+            rate=Config.RATE_LIMIT,
+            burst=Config.RATE_BURST,
+            max_concurrency=Config.DOMAIN_MAX_CONCURRENCY,
+            domains=domains,
+            login_urls=login_urls,
+            ignore_urls=ignore_urls,
+            logger=logger
+        )
+
+    def domain_of(self, url: str) -> str:
+        return URLUtils.registrable_domain(url)
+
+    def _state(self, domain: str) -> _DomainState:
+        state = self._domains.get(domain)
+        if state is None:
+            settings = self.domain_settings.get(domain, {})
+            max_concurrency = settings.get('max_concurrency', self.max_concurrency)
+            state = _DomainState(
+                rate=settings.get('rate', self.rate),
+                burst=settings.get('burst', self.burst),
+                limit=float(min(self.initial_concurrency, max_concurrency)),
+                max_concurrency=max_concurrency
+            )
+            state.condition = threading.Condition(self._lock)
+            self._domains[domain] = state
+        return state
+
+    def acquire(self, url: str, timeout: float = None) -> str:
+        """
+        Blocks until the URL's domain has a free concurrency slot and a rate token, then takes both.
+
+        Args:
+            url (str): The URL about to be requested.
+            timeout (float, optional): Seconds to wait. None waits as long as needed.
+
+        Returns:
+            str: The domain, to be passed to release().
+
+        Raises:
+            SchedulerTimeout: If no slot became available within the timeout.
+        """
+        domain = self.domain_of(url)
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        with self._lock:
+            state = self._state(domain)
+            while True:
+                now = time.monotonic()
+                state.refill(now)
+                if now >= state.paused_until and state.active < max(1, int(state.limit)) and state.tokens >= 1:
+                    state.tokens -= 1
+                    state.active += 1
+                    state.stats['requests'] += 1
+                    state.stats['waited'] += now - start
+                    return domain
+                # Sleep until the next token or pause end; a release wakes us earlier
+                wait = max(state.paused_until - now, (1 - state.tokens) / state.rate if state.tokens < 1 else 0)
+                if deadline is not None:
+                    if now >= deadline:
+                        raise SchedulerTimeout(f"No request slot for {domain} within {timeout} seconds.")
+                    wait = min(wait or deadline - now, deadline - now)
+                state.condition.wait(wait or None)
+
+    def release(self, domain: str, duration: float = None, throttled: bool = False, error: bool = False) -> None:
+        """
+        Frees the slot taken by acquire() and adapts the domain's concurrency cap to the outcome.
+
+        Args:
+            domain (str): The value returned by acquire().
+            duration (float, optional): The request duration in seconds.
+            throttled (bool): The site answered with a throttling status or redirected to its login page.
+            error (bool): The request failed for another reason, e.g. a timeout.
+        """
+        with self._lock:
+            state = self._state(domain)
+            state.active = max(0, state.active - 1)
+            slow = (duration is not None and state.latency is not None and not throttled and not error
+                    and duration > state.latency * self.slow_factor)
+            if throttled:
+                state.stats['throttled'] += 1
+                state.backoff = min(self.max_backoff, state.backoff * 2 if state.backoff else 1.0)
+                state.paused_until = time.monotonic() + state.backoff
+            elif error:
+                state.stats['errors'] += 1
+            elif slow:
+                state.stats['slow'] += 1
+            if throttled or error or slow:
+                previous = state.limit
+                state.limit = max(float(self.min_concurrency), state.limit * self.decrease_factor)
+                if self.logger and int(state.limit) < int(previous):
+                    self.logger.log_info(f"Reduced concurrency for {domain} to {int(state.limit)} "
+                                         f"({'throttled' if throttled else 'error' if error else 'slow'}).")
+            else:
+                # Additive increase: about one more slot per cap-sized run of healthy requests
+                state.backoff = 0.0
+                state.limit = min(float(state.max_concurrency), state.limit + 1 / max(state.limit, 1.0))
+                if duration is not None:
+                    state.latency = duration if state.latency is None else 0.8 * state.latency + 0.2 * duration
+            state.condition.notify_all()
+
+    def is_login_redirect(self, url: str, final_url: str) -> bool:
+        """
+        Checks if a request for url ended on a login page although it was not expected to.
+        """
+        if not final_url or any(url.startswith(prefix) for prefix in self.ignore_urls):
+            return False
+        return any(final_url.startswith(prefix) for prefix in self.login_urls)
+
+    @staticmethod
+    def is_throttle_error(error: Exception) -> bool:
+        response = getattr(error, 'response', None)
+        return isinstance(error, requests.HTTPError) and response is not None and response.status_code in THROTTLE_STATUSES
+
+    @contextmanager
+    def slot(self, url: str, timeout: float = None):
+        """
+        Context manager around one request. The yielded dict may be updated with 'status' (the response
+        status code) and 'final_url' (the URL after redirects) so throttling can be detected. Exceptions
+        count as errors, or as throttling for HTTP 429/503 responses.
+        """
+        domain = self.acquire(url, timeout=timeout)
+        outcome = {}
+        start = time.monotonic()
+        try:
+            yield outcome
+        except Exception as e:
+            throttled = self.is_throttle_error(e)
+            # Other client errors (404 and the like) were served normally and say nothing about the site's load
+            response = getattr(e, 'response', None)
+            client_error = isinstance(e, requests.HTTPError) and response is not None and response.status_code < 500
+            self.release(domain, time.monotonic() - start, throttled=throttled, error=not (throttled or client_error))
+            raise
+        throttled = outcome.get('status') in THROTTLE_STATUSES or self.is_login_redirect(url, outcome.get('final_url'))
+        self.release(domain, time.monotonic() - start, throttled=throttled)
+
+    def stats(self) -> dict:
+        """
+        Returns the current cap, active requests, smoothed latency and counters of every domain.
+        """
+        with self._lock:
+            return {
+                domain: dict(state.stats, concurrency=int(state.limit), active=state.active, rate=state.rate,
+                             latency=state.latency, paused=max(0.0, state.paused_until - time.monotonic()))
+                for domain, state in self._domains.items()
+            }
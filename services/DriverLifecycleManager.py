@@ -0,0 +1,231 @@
+# File: services/DriverLifecycleManager.py
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from urllib.parse import urlsplit
+from urllib3.exceptions import HTTPError as Urllib3Error
+from selenium.common.exceptions import WebDriverException
+from config import Config
+from interfaces.LoggerInterface import LoggerInterface
+
+MEMORY_SCRIPT = "return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : 0;"
+
+class DriverLifecycleManager:
+    def __init__(self, engine_factory, logger: LoggerInterface = None, max_pages: int = 0, max_age: float = 0,
+                 max_memory_mb: float = 0, memory_check_every: int = 10, probe_interval: float = 60.0,
+                 probe_timeout: float = 10.0, retries: int = 1, warm_up=None):
+        """
+        Initializes a lifecycle policy for one Browser's remote driver.
+
+        Before each interaction, a driver that has been idle for probe_interval is probed, and a driver
+        that reached its page, age or memory budget is recycled. When an interaction fails with a
+        WebDriver or connection error and the probe shows the driver is dead or hung, it is replaced
+        with a new engine and the interaction is retried. Replacement restores the stored session of
+        the interaction's domain through the Browser's SessionManager before retrying.
+
+        Args:
+            engine_factory (callable): Returns a new engine (e.g. ChromeRemote) every time it is called.
+            logger (LoggerInterface): The logger instance for logging.
+            max_pages (int): Recycle after this many interactions. 0 disables the limit.
+            max_age (float): Recycle after this many seconds. 0 disables the limit.
+            max_memory_mb (float): Recycle once the page's JS heap exceeds this many MB. 0 disables the check.
+            memory_check_every (int): Check the heap every this many interactions.
+            probe_interval (float): Probe a driver before use once it has been idle this many seconds.
+            probe_timeout (float): Seconds a probe may take before the driver is considered hung.
+            retries (int): How many times an interaction is retried on a replacement driver.
+            warm_up (callable, optional): Called with the browser after a replacement, instead of restoring
+                the session of the failed interaction's domain.
+        """
+        self.engine_factory = engine_factory
+        self.logger = logger
+        self.max_pages = max_pages
+        self.max_age = max_age
+        self.max_memory_mb = max_memory_mb
+        self.memory_check_every = max(1, memory_check_every)
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.retries = retries
+        self.warm_up = warm_up
+        self.browser = None
+        self.reasons = Counter()
+        self.stats = {'pages': 0, 'drivers': 1, 'retries': 0, 'probe_failures': 0, 'recycle_seconds': 0.0}
+        self._pages = 0
+        self._started_at = time.monotonic()
+        self._created_at = time.monotonic()
+        self._last_used = time.monotonic()
+        self._probe_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="DriverProbe")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, engine_factory, logger: LoggerInterface = None, warm_up=None) -> "DriverLifecycleManager":
+        return cls(
+            engine_factory=engine_factory,
+            logger=logger,
+            max_pages=Config.DRIVER_MAX_PAGES,
+            max_age=Config.DRIVER_MAX_AGE,
+            max_memory_mb=Config.DRIVER_MAX_MEMORY_MB,
+            probe_interval=Config.DRIVER_PROBE_INTERVAL,
+            retries=Config.DRIVER_RETRIES,
+            warm_up=warm_up
+        )
+
+    def bind(self, browser) -> None:
+        self.browser = browser
+
+    def probe(self) -> bool:
+        """
+        Checks that the driver answers a trivial command within probe_timeout.
+
+        Returns:
+            bool: True if the driver is alive.
+        """
+        driver = self.browser.driver
+        future = self._probe_executor.submit(driver.execute_script, "return 1;")
+        try:
+            alive = future.result(timeout=self.probe_timeout) == 1
+        except FutureTimeoutError:
+            alive = False
+            # A hung command blocks the probe thread; later probes must not queue behind it
+            self._probe_executor.shutdown(wait=False)
+            self._probe_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="DriverProbe")
+        except Exception:
+            alive = False
+        if not alive:
+            self.stats['probe_failures'] += 1
+        return alive
+
+    def _memory_mb(self) -> float:
+        try:
+            return (self.browser.driver.execute_script(MEMORY_SCRIPT) or 0) / (1024 * 1024)
+        except WebDriverException:
+            return 0.0
+
+    def _recycle_reason(self) -> str:
+        if self.max_pages and self._pages >= self.max_pages:
+            return 'pages'
+        if self.max_age and time.monotonic() - self._created_at >= self.max_age:
+            return 'age'
+        if (self.max_memory_mb and self._pages and self._pages % self.memory_check_every == 0
+                and self._memory_mb() >= self.max_memory_mb):
+            return 'memory'
+        if self.probe_interval and time.monotonic() - self._last_used >= self.probe_interval and not self.probe():
+            return 'dead'
+        return None
+
+    def recycle(self, reason: str, url: str = None) -> None:
+        """
+        Replaces the browser's engine with a new one and restores its session.
+
+        Args:
+            reason (str): Why the driver is replaced, e.g. 'pages', 'age', 'memory', 'dead' or 'error'.
+            url (str, optional): The URL about to be retried, whose domain session is restored first.
+        """
+        start = time.monotonic()
+        alive = reason not in ('dead', 'error')
+        session_manager = self.browser.session_manager
+        if alive and session_manager:
+            # Capture coalesced session changes while the old driver can still answer
+            session_manager.flush()
+        old_engine = self.browser.engine
+        pages = self._pages
+        self.browser.replace_engine(self.engine_factory())
+        self._quit(old_engine, wait=alive)
+        self._pages = 0
+        self._created_at = self._last_used = time.monotonic()
+        try:
+            if self.warm_up:
+                self.warm_up(self.browser)
+            elif url and session_manager:
+                self._restore_for(url)
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error(f"Failed to restore the session on the replacement driver: {e}")
+        self.reasons[reason] += 1
+        self.stats['drivers'] += 1
+        self.stats['recycle_seconds'] += time.monotonic() - start
+        self.browser.instrumentation.emit('driver.recycle', reason=reason, pages=pages, driver=self.browser.driver_label())
+        if self.logger:
+            self.logger.log_info(f"Recycled driver after {pages} pages ({reason}) in {time.monotonic() - start:.1f}s.")
+
+    def _restore_for(self, url: str) -> None:
+        """
+        Loads the site's origin and restores its stored session, so the retried page is fetched with it.
+        """
+        parts = urlsplit(url)
+        self.browser.driver.get(f"{parts.scheme}://{parts.netloc}/")
+        self.browser.session_manager.validate(url)
+
+    def _quit(self, engine, wait: bool) -> None:
+        # A recycled browser must really go away, not be left running for reattach
+        if hasattr(engine, 'persist_session'):
+            engine.persist_session = False
+
+        def quit_engine():
+            try:
+                engine.quit_driver()
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_debug("Error quitting replaced driver: %s", e)
+        if wait:
+            quit_engine()
+        else:
+            # A dead or hung session can block quit until the HTTP timeout
+            threading.Thread(target=quit_engine, name="DriverQuit", daemon=True).start()
+
+    @staticmethod
+    def is_driver_error(error: Exception) -> bool:
+        return isinstance(error, (WebDriverException, Urllib3Error, ConnectionError))
+
+    def run(self, interaction, url: str):
+        """
+        Runs an interaction with lifecycle checks, replacing the driver and retrying when it died.
+
+        Args:
+            interaction (callable): Performs the interaction on the bound browser's current driver.
+            url (str): The URL of the interaction.
+
+        Returns:
+            The result of the interaction.
+        """
+        with self._lock:
+            reason = self._recycle_reason()
+            if reason:
+                self.recycle(reason, url=url)
+        attempt = 0
+        while True:
+            try:
+                result = interaction()
+                break
+            except Exception as e:
+                if attempt >= self.retries or not self.is_driver_error(e):
+                    raise
+                with self._lock:
+                    if self.probe():
+                        # The driver is fine; the error came from the page
+                        raise
+                    if self.logger:
+                        self.logger.log_error(f"Driver died during interaction with {url}, replacing it: {e}")
+                    self.recycle('error', url=url)
+                attempt += 1
+                self.stats['retries'] += 1
+        self._pages += 1
+        self._last_used = time.monotonic()
+        self.stats['pages'] += 1
+        return result
+
+    def report(self) -> dict:
+        """
+        Returns recycle counts by reason, pages per driver and overall pages per second, including
+        the time spent replacing drivers.
+        """
+        elapsed = time.monotonic() - self._started_at
+        return dict(
+            self.stats,
+            reasons=dict(self.reasons),
+            pages_per_driver=self.stats['pages'] / self.stats['drivers'],
+            pages_per_second=self.stats['pages'] / elapsed if elapsed else 0.0
+        )
+
+    def close(self) -> None:
+        self._probe_executor.shutdown(wait=False)
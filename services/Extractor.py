@@ -0,0 +1,82 @@
+# File: services/Extractor.py
+import json
+
+_FIELDS_SCRIPT = """
+var spec = arguments[0], includeSource = arguments[1], result = {};
+function read(element, attr) {
+    if (!element) { return null; }
+    if (attr === 'text') { return element.textContent.trim(); }
+    if (attr === 'html') { return element.innerHTML; }
+    return element.getAttribute(attr);
+}
+Object.keys(spec).forEach(function (name) {
+    var field = spec[name];
+    if (field.all) {
+        result[name] = Array.prototype.map.call(document.querySelectorAll(field.selector), function (element) {
+            return read(element, field.attr);
+        });
+    } else {
+        result[name] = read(document.querySelector(field.selector), field.attr);
+    }
+});
+if (includeSource) { result.page_source = document.documentElement.outerHTML; }
+return result;
+"""
+
+_CUSTOM_SCRIPT = """
+var result = (function () { __EXTRACTOR__ }).call(null);
+if (arguments[0]) { result = {data: result, page_source: document.documentElement.outerHTML}; }
+return result;
+"""
+
+class Extractor:
+    def __init__(self, fields: dict = None, script: str = None, include_source: bool = False):
+        """
+        Initializes an extractor that runs inside the browser and returns only the requested data.
+
+        Exactly one of fields or script must be given. The extraction is a single script call, so only
+        the compact JSON result travels over the WebDriver wire instead of the serialized DOM.
+
+        Args:
+            fields (dict, optional): Maps field names to a CSS selector, or to a dict with 'selector',
+                'attr' ('text' by default, 'html' or any attribute name) and 'all' (collect every match).
+            script (str, optional): The body of a JavaScript function that returns the extracted data.
+            include_source (bool): If True, the full page source is returned as well, under 'page_source'.
+                Script results are then wrapped as {'data': ..., 'page_source': ...}.
+        """
+        if (fields is None) == (script is None):
+            raise ValueError("Extractor needs either fields or script.")
+        self.fields = None
+        if fields is not None:
+            self.fields = {}
+            for name, field in fields.items():
+                if isinstance(field, str):
+                    field = {'selector': field}
+                self.fields[name] = {'selector': field['selector'], 'attr': field.get('attr', 'text'), 'all': bool(field.get('all', False))}
+        self.script = script
+        self.include_source = include_source
+        self.signature = json.dumps({'fields': self.fields, 'script': script, 'source': include_source}, sort_keys=True)
+
+    def run(self, driver) -> dict:
+        """
+        Runs the extraction on the page currently loaded in the driver.
+
+        Args:
+            driver: The WebDriver instance.
+
+        Returns:
+            The extracted data.
+        """
+        if self.fields is not None:
+            return driver.execute_script(_FIELDS_SCRIPT, self.fields, self.include_source)
+        return driver.execute_script(_CUSTOM_SCRIPT.replace('__EXTRACTOR__', self.script), self.include_source)
+
+    def expression(self) -> str:
+        """
+        Returns the extraction as a self-contained JavaScript expression, for DevTools Runtime.evaluate,
+        which takes no script arguments.
+        """
+        if self.fields is not None:
+            return f"(function () {{ {_FIELDS_SCRIPT} }}).apply(null, {json.dumps([self.fields, self.include_source])})"
+        script = _CUSTOM_SCRIPT.replace('__EXTRACTOR__', self.script)
+        return f"(function () {{ {script} }}).apply(null, {json.dumps([self.include_source])})"
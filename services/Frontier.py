@@ -0,0 +1,309 @@
+# File: services/Frontier.py
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Iterator
+from config import Config
+from interfaces.LoggerInterface import LoggerInterface
+from services.utils.BloomFilter import BloomFilter
+from services.utils.URLUtils import URLUtils
+
+PENDING, IN_FLIGHT, DONE, FAILED = 0, 1, 2, 3
+STATE_NAMES = {PENDING: 'pending', IN_FLIGHT: 'in_flight', DONE: 'done', FAILED: 'failed'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS frontier (
+    id INTEGER PRIMARY KEY,
+    url_key BLOB NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    state INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS frontier_state ON frontier (state, id);
+CREATE TABLE IF NOT EXISTS frontier_meta (
+    name TEXT PRIMARY KEY,
+    value BLOB
+) WITHOUT ROWID;
+"""
+
+class Frontier:
+    def __init__(self, db_file: str, logger: LoggerInterface = None, capacity: int = 1_000_000, error_rate: float = 0.01,
+                 max_attempts: int = 3, checkpoint_every: int = 500, checkpoint_interval: float = 5.0):
+        """
+        Initializes a disk-backed, deduplicating work queue of URLs that survives restarts.
+
+        URLs are normalized and identified by a 16-byte digest. A Bloom filter answers most
+        "seen before?" checks in memory, so only probable duplicates touch the database.
+        State changes are committed in batches (checkpoints); on reopening, URLs left in flight
+        by a crashed run go back to pending, so a resumed job only repeats the work that was in flight
+        or completed after the last checkpoint.
+
+        Args:
+            db_file (str): The path to the SQLite database.
+            logger (LoggerInterface): The logger instance for logging.
+            capacity (int): The number of URLs the Bloom filter is sized for.
+            error_rate (float): The Bloom filter false positive rate at capacity.
+            max_attempts (int): Failed URLs are retried until they have been attempted this many times.
+            checkpoint_every (int): Commit after this many additions or state changes.
+            checkpoint_interval (float): Commit at least this often, in seconds, while work is recorded.
+        """
+        self.db_file = db_file
+        self.logger = logger
+        self.max_attempts = max_attempts
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self.stats = {'added': 0, 'duplicates': 0, 'completed': 0, 'failed': 0, 'retried': 0, 'recovered': 0}
+        self._lock = threading.RLock()
+        self._new = {}
+        self._in_flight = {}
+        self._changes = 0
+        # Called before each checkpoint, e.g. to make results durable before their URLs are committed as done
+        self.checkpoint_hooks = []
+        self._last_checkpoint = time.monotonic()
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(db_file, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self.bloom = self._load_bloom(capacity, error_rate)
+        self._recover()
+
+    @classmethod
+    def from_config(cls, logger: LoggerInterface = None) -> "Frontier":
+        return cls(
+            db_file=Config.FRONTIER_DB,
+            logger=logger,
+            capacity=Config.FRONTIER_CAPACITY,
+            max_attempts=Config.FRONTIER_MAX_ATTEMPTS
+        )
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        return URLUtils.canonicalize(url)
+
+    def _meta(self, name: str):
+        row = self._connection.execute("SELECT value FROM frontier_meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _load_bloom(self, capacity: int, error_rate: float) -> BloomFilter:
+        """
+        Loads the Bloom filter saved at the last close and adds the rows inserted after it was saved.
+        If there is none, or it was sized differently, it is rebuilt from the table.
+        """
+        bloom, saved_id = None, 0
+        bits = self._meta('bloom')
+        if bits is not None and self._meta('bloom_params') == f"{capacity}:{error_rate}":
+            try:
+                bloom = BloomFilter(capacity, error_rate, bits=bytearray(bits))
+                saved_id = int(self._meta('bloom_max_id') or 0)
+            except ValueError:
+                bloom = None
+        if bloom is None:
+            bloom = BloomFilter(capacity, error_rate)
+        added = 0
+        for (url_key,) in self._connection.execute("SELECT url_key FROM frontier WHERE id > ?", (saved_id,)):
+            bloom.add(url_key)
+            added += 1
+        if added and self.logger:
+            self.logger.log_info("Frontier: added %s URLs to the membership filter.", added)
+        return bloom
+
+    def _save_bloom(self) -> None:
+        max_id = self._connection.execute("SELECT COALESCE(MAX(id), 0) FROM frontier").fetchone()[0]
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO frontier_meta (name, value) VALUES (?, ?)",
+            [('bloom', self.bloom.to_bytes()),
+             ('bloom_params', f"{self.bloom.capacity}:{self.bloom.error_rate}"),
+             ('bloom_max_id', str(max_id))]
+        )
+
+    def _recover(self) -> None:
+        """
+        Returns URLs left in flight by an interrupted run to pending.
+        """
+        with self._connection:
+            cursor = self._connection.execute(
+                "UPDATE frontier SET state = ?, updated_at = ? WHERE state = ?", (PENDING, time.time(), IN_FLIGHT)
+            )
+        self.stats['recovered'] = cursor.rowcount
+        if cursor.rowcount and self.logger:
+            self.logger.log_info("Frontier: resuming with %s URLs that were in flight.", cursor.rowcount)
+
+    def _record_change(self, count: int = 1) -> None:
+        self._changes += count
+        if self._changes >= self.checkpoint_every or time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+
+    def _flush_new(self) -> None:
+        if self._new:
+            now = time.time()
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO frontier (url_key, url, state, updated_at) VALUES (?, ?, ?, ?)",
+                ((url_key, url, PENDING, now) for url_key, url in self._new.items())
+            )
+            self._new.clear()
+
+    def checkpoint(self) -> None:
+        """
+        Writes buffered additions and commits every recorded state change.
+        """
+        with self._lock:
+            for hook in self.checkpoint_hooks:
+                hook()
+            self._flush_new()
+            self._connection.commit()
+            self._changes = 0
+            self._last_checkpoint = time.monotonic()
+
+    def add(self, url: str) -> bool:
+        """
+        Adds a URL unless it, or an equivalent normalized URL, was added before.
+
+        Returns:
+            bool: True if the URL was new.
+        """
+        url = self.normalize_url(url)
+        url_key = BloomFilter.digest(url)
+        with self._lock:
+            if url_key in self._new:
+                self.stats['duplicates'] += 1
+                return False
+            # A negative answer is definite; only probable duplicates need the index lookup
+            if self.bloom.contains(url_key) and self._connection.execute(
+                    "SELECT 1 FROM frontier WHERE url_key = ?", (url_key,)).fetchone():
+                self.stats['duplicates'] += 1
+                return False
+            self.bloom.add(url_key)
+            self._new[url_key] = url
+            self.stats['added'] += 1
+            self._record_change()
+            return True
+
+    def add_many(self, urls: Iterable[str]) -> int:
+        """
+        Adds URLs from an iterable, which is consumed lazily.
+
+        Returns:
+            int: The number of new URLs.
+        """
+        return sum(1 for url in urls if self.add(url))
+
+    def claim(self, limit: int = 1) -> list:
+        """
+        Marks up to limit pending URLs as in flight, oldest first, and returns them.
+        """
+        with self._lock:
+            self._flush_new()
+            rows = self._connection.execute(
+                "SELECT id, url, attempts FROM frontier WHERE state = ? ORDER BY id LIMIT ?", (PENDING, limit)
+            ).fetchall()
+            if not rows:
+                return []
+            now = time.time()
+            self._connection.executemany(
+                "UPDATE frontier SET state = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                ((IN_FLIGHT, now, row_id) for row_id, _, _ in rows)
+            )
+            for row_id, url, attempts in rows:
+                self._in_flight[url] = (row_id, attempts + 1)
+            self._record_change(len(rows))
+            return [url for _, url, _ in rows]
+
+    def _set_state(self, row_id: int, state: int, error: str = None) -> None:
+        self._connection.execute(
+            "UPDATE frontier SET state = ?, updated_at = ?, error = ? WHERE id = ?", (state, time.time(), error, row_id)
+        )
+
+    def release(self, url: str) -> None:
+        """
+        Returns a claimed URL to pending without counting the attempt.
+        """
+        with self._lock:
+            entry = self._in_flight.pop(url, None)
+            if entry is not None:
+                self._connection.execute(
+                    "UPDATE frontier SET state = ?, attempts = attempts - 1 WHERE id = ?", (PENDING, entry[0])
+                )
+                self._record_change()
+
+    def complete(self, url: str) -> None:
+        """
+        Marks a claimed URL as done.
+        """
+        with self._lock:
+            entry = self._in_flight.pop(url, None)
+            if entry is None:
+                return
+            self._set_state(entry[0], DONE)
+            self.stats['completed'] += 1
+            self._record_change()
+
+    def fail(self, url: str, error=None) -> bool:
+        """
+        Records a failed attempt. The URL goes back to pending until it reaches max_attempts.
+
+        Returns:
+            bool: True if the URL will be retried.
+        """
+        with self._lock:
+            entry = self._in_flight.pop(url, None)
+            if entry is None:
+                return False
+            row_id, attempts = entry
+            retry = attempts < self.max_attempts
+            self._set_state(row_id, PENDING if retry else FAILED, str(error) if error else None)
+            self.stats['retried' if retry else 'failed'] += 1
+            self._record_change()
+            return retry
+
+    def stream(self, batch_size: int = 8) -> Iterator[str]:
+        """
+        Yields pending URLs, claiming them in small batches so little work is in flight at a time.
+        URLs that fail and go back to pending before the last claim are picked up again. The stream
+        ends on the first empty claim, so failures of URLs still in flight at that point need another
+        stream; process_urls runs one for as long as URLs are queued for retry.
+        If the consumer stops early, claimed URLs it never received go back to pending.
+
+        Args:
+            batch_size (int): The number of URLs claimed at once.
+        """
+        batch = []
+        try:
+            while True:
+                batch = self.claim(batch_size)
+                if not batch:
+                    return
+                while batch:
+                    yield batch.pop(0)
+        finally:
+            for url in batch:
+                self.release(url)
+
+    def counts(self) -> dict:
+        """
+        Returns the number of URLs in each state.
+        """
+        with self._lock:
+            self._flush_new()
+            rows = self._connection.execute("SELECT state, COUNT(*) FROM frontier GROUP BY state").fetchall()
+        counts = {name: 0 for name in STATE_NAMES.values()}
+        for state, count in rows:
+            counts[STATE_NAMES[state]] = count
+        return counts
+
+    def close(self) -> None:
+        """
+        Checkpoints, saves the membership filter and closes the database.
+        """
+        with self._lock:
+            self._flush_new()
+            self._save_bloom()
+            self._connection.commit()
+            self._connection.close()
+        if self.logger:
+            self.logger.log_info("Frontier closed: %s", self.stats)
@@ -0,0 +1,210 @@
+# File: services/GridBalancer.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from selenium.common.exceptions import WebDriverException
+from config import Config
+from interfaces.LoggerInterface import LoggerInterface
+
+class GridBalancer:
+    def __init__(self, endpoints: list, logger: LoggerInterface = None, poll_interval: float = 5.0, timeout: float = 3.0,
+                 slow_threshold: float = 2.0, cooldown: float = 30.0):
+        """
+        Initializes a placement policy for new driver sessions across several Selenium Grids or standalone nodes.
+
+        Each endpoint's /status is polled for its slots. New sessions go to the healthy endpoint with the lowest
+        share of busy slots, counting sessions placed since the last poll, and endpoints that respond slowly are
+        only used when no fast one is healthy. An endpoint that fails a status poll or a session creation is
+        skipped for the cooldown period.
+
+        Args:
+            endpoints (list): The remote server URLs, as passed to ChromeRemote.
+            logger (LoggerInterface): The logger instance for logging.
+            poll_interval (float): Seconds between background status polls. 0 disables the poller; choose() then
+                refreshes status on demand once it is older than 10 seconds.
+            timeout (float): The status request timeout in seconds.
+            slow_threshold (float): Endpoints whose smoothed /status response time exceeds this many seconds
+                are deprioritized.
+            cooldown (float): Seconds a failed endpoint is skipped.
+        """
+        if not endpoints:
+            raise ValueError("At least one Grid endpoint is required.")
+        self.logger = logger
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.slow_threshold = slow_threshold
+        self.cooldown = cooldown
+        self.endpoints = {
+            url: {'url': url, 'healthy': True, 'ready': True, 'capacity': 0, 'busy': 0, 'placed': 0, 'sessions': 0,
+                  'created': 0, 'failures': 0, 'latency': None, 'startup': None, 'down_until': 0.0, 'polled_at': 0.0}
+            for url in endpoints
+        }
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._http = requests.Session()
+        self._poller = None
+        if poll_interval > 0:
+            self._poller = threading.Thread(target=self._poll_loop, name="GridBalancer-poller", daemon=True)
+            self._poller.start()
+
+    @classmethod
+    def from_config(cls, logger: LoggerInterface = None) -> "GridBalancer":
+        return cls(
+            endpoints=Config.REMOTE_URLS,
+            logger=logger,
+            poll_interval=Config.GRID_POLL_INTERVAL,
+            slow_threshold=Config.GRID_SLOW_THRESHOLD
+        )
+
+    @staticmethod
+    def status_url(url: str) -> str:
+        return url.rstrip('/') + '/status'
+
+    @staticmethod
+    def parse_status(payload: dict) -> tuple:
+        """
+        Reads (ready, capacity, busy) from a /status response. Grid 4 reports nodes and their slots;
+        older hubs and drivers only report readiness, counted as one free slot.
+        """
+        value = payload.get('value') or {}
+        ready = bool(value.get('ready', True))
+        nodes = value.get('nodes')
+        if not nodes:
+            return ready, 1, 0 if ready else 1
+        capacity = busy = 0
+        for node in nodes:
+            if node.get('availability', 'UP') != 'UP':
+                continue
+            for slot in node.get('slots', []):
+                capacity += 1
+                if slot.get('session'):
+                    busy += 1
+        return ready, capacity, busy
+
+    @staticmethod
+    def _smooth(previous: float, seconds: float) -> float:
+        # Exponentially weighted, so one slow response doesn't move load but a trend does
+        return seconds if previous is None else 0.7 * previous + 0.3 * seconds
+
+    def _poll_one(self, url: str) -> None:
+        start = time.monotonic()
+        try:
+            response = self._http.get(self.status_url(url), timeout=self.timeout)
+            response.raise_for_status()
+            ready, capacity, busy = self.parse_status(response.json())
+        except (requests.RequestException, ValueError) as e:
+            self.report_failure(url, e)
+            with self._lock:
+                self.endpoints[url]['polled_at'] = time.monotonic()
+            return
+        with self._lock:
+            endpoint = self.endpoints[url]
+            endpoint['latency'] = self._smooth(endpoint['latency'], time.monotonic() - start)
+            was_healthy = endpoint['healthy']
+            endpoint.update(ready=ready, capacity=capacity, busy=busy, placed=0, healthy=True, polled_at=time.monotonic())
+        if not was_healthy and self.logger:
+            self.logger.log_info("Grid endpoint %s is healthy again.", url)
+
+    def poll(self) -> None:
+        """
+        Refreshes the status of every endpoint concurrently.
+        """
+        with ThreadPoolExecutor(max_workers=len(self.endpoints)) as executor:
+            list(executor.map(self._poll_one, list(self.endpoints)))
+
+    def _poll_loop(self) -> None:
+        while not self._closed.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_error(f"Grid status poll failed: {e}")
+            self._closed.wait(self.poll_interval)
+
+    def _score(self, endpoint: dict) -> tuple:
+        slow = endpoint['latency'] is not None and endpoint['latency'] > self.slow_threshold
+        capacity = max(endpoint['capacity'], 1)
+        load = (endpoint['busy'] + endpoint['placed']) / capacity
+        # A full endpoint still queues the request, so it is a last resort rather than excluded
+        full = load >= 1 or not endpoint['ready']
+        return (full, slow, load, endpoint['latency'] or 0.0)
+
+    def choose(self, exclude: set = ()) -> str:
+        """
+        Picks the endpoint for a new session and reserves a slot on it until the next poll.
+
+        Args:
+            exclude (set): Endpoints not to use, e.g. ones that just failed for this request.
+
+        Returns:
+            str: The remote server URL.
+
+        Raises:
+            WebDriverException: If no endpoint is healthy.
+        """
+        stale = max(self.poll_interval, 5.0) * 2
+        if any(time.monotonic() - endpoint['polled_at'] > stale for endpoint in self.endpoints.values()):
+            self.poll()
+        now = time.monotonic()
+        with self._lock:
+            candidates = [
+                endpoint for url, endpoint in self.endpoints.items()
+                if url not in exclude and endpoint['healthy'] and endpoint['down_until'] <= now
+            ]
+            if not candidates:
+                raise WebDriverException("No healthy Selenium Grid endpoint is available.")
+            endpoint = min(candidates, key=self._score)
+            endpoint['placed'] += 1
+            return endpoint['url']
+
+    def session_started(self, url: str, seconds: float = None) -> None:
+        """
+        Records a session created on an endpoint, with the time the creation took (reported as 'startup').
+        """
+        with self._lock:
+            endpoint = self.endpoints.get(url)
+            if endpoint is None:
+                return
+            endpoint['sessions'] += 1
+            endpoint['created'] += 1
+            if seconds is not None:
+                endpoint['startup'] = self._smooth(endpoint['startup'], seconds)
+
+    def session_ended(self, url: str) -> None:
+        with self._lock:
+            endpoint = self.endpoints.get(url)
+            if endpoint is not None and endpoint['sessions'] > 0:
+                endpoint['sessions'] -= 1
+
+    def report_failure(self, url: str, error=None) -> None:
+        """
+        Marks an endpoint unhealthy and skips it for the cooldown period.
+        """
+        with self._lock:
+            endpoint = self.endpoints.get(url)
+            if endpoint is None:
+                return
+            was_healthy = endpoint['healthy']
+            endpoint['healthy'] = False
+            endpoint['failures'] += 1
+            endpoint['placed'] = max(0, endpoint['placed'] - 1)
+            endpoint['down_until'] = time.monotonic() + self.cooldown
+        if self.logger and was_healthy:
+            self.logger.log_error(f"Grid endpoint {url} failed, skipping it for {self.cooldown}s: {error}")
+        elif self.logger:
+            self.logger.log_debug("Grid endpoint %s is still failing: %s", url, error)
+
+    def stats(self) -> dict:
+        """
+        Returns per-endpoint health, slot usage, live session counts and smoothed latency.
+        """
+        with self._lock:
+            return {url: {key: value for key, value in endpoint.items() if key != 'url'}
+                    for url, endpoint in self.endpoints.items()}
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._poller:
+            self._poller.join(timeout=self.timeout + 1)
+        self._http.close()
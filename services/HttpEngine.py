@@ -0,0 +1,184 @@
+# File: services/HttpEngine.py
+import re
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from requests.cookies import create_cookie
+from config import Config
+from interfaces.LoggerInterface import LoggerInterface
+from services.utils.URLUtils import URLUtils
+
+FETCH_MODES = ('http', 'browser')
+
+class HttpEngine:
+    def __init__(self, session_manager=None, logger: LoggerInterface = None, rules: list = None,
+                 pool_size: int = 10, timeout: float = 30, headers: dict = None):
+        """
+        Initializes a plain HTTP fetch engine for server-rendered pages that don't need JavaScript.
+
+        It uses one keep-alive requests.Session with a connection pool, authenticated with the cookies
+        the SessionManager captured from the browser. Cookies set by responses are merged back into
+        the session store so the browser picks them up on its next restore.
+
+        Args:
+            session_manager (SessionManager, optional): The source and sink of session cookies.
+            logger (LoggerInterface): The logger instance for logging.
+            rules (list, optional): (regex, mode) pairs; the first pattern matching a URL decides whether
+                it is fetched over 'http' or in the 'browser'. URLs matching no rule use the browser.
+            pool_size (int): The maximum number of pooled connections per host.
+            timeout (float): The request timeout in seconds.
+            headers (dict, optional): Default headers, e.g. a User-Agent matching the browser.
+        """
+        self.session_manager = session_manager
+        self.logger = logger
+        self.timeout = timeout
+        self.rules = []
+        for pattern, mode in rules or []:
+            if mode not in FETCH_MODES:
+                raise ValueError(f"Unknown fetch mode '{mode}' for pattern {pattern}.")
+            self.rules.append((re.compile(pattern), mode))
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+        # The session version each domain's cookies were loaded at
+        self._synced_versions = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, session_manager=None, logger: LoggerInterface = None) -> "HttpEngine":
+        """
+        Builds an HttpEngine from each site's 'fetch_rules' and 'fetch_mode' settings in Config.SITES.
+        The site's open URL and its 'cache_exclude' pages (login and authed URLs) always stay in the
+        browser, since warm-up and authentication work on the driver after navigating to them.
+        """
+        rules = []
+        for site in Config.SITES.values():
+            rules.append((f"^{re.escape(site['open_url'].rstrip('/'))}/?$", 'browser'))
+            rules.extend((f"^{re.escape(prefix)}", 'browser') for prefix in site.get('cache_exclude', []))
+            rules.extend(site.get('fetch_rules', []))
+            domain = re.escape(URLUtils.registrable_domain(site['open_url']))
+            rules.append((rf"^https?://([^/]*\.)?{domain}(:\d+)?(/|$)", site.get('fetch_mode', 'browser')))
+        return cls(session_manager=session_manager, logger=logger, rules=rules,
+                   pool_size=Config.HTTP_POOL_SIZE, timeout=Config.HTTP_TIMEOUT)
+
+    def mode_for(self, url: str) -> str:
+        """
+        Returns 'http' or 'browser' for a URL according to the rules.
+        """
+        for pattern, mode in self.rules:
+            if pattern.search(url):
+                return mode
+        return 'browser'
+
+    def handles(self, url: str) -> bool:
+        return self.mode_for(url) == 'http'
+
+    def sync_cookies(self, url: str, force: bool = False) -> None:
+        """
+        Loads the stored session cookies for the URL's domain into the HTTP session. They are reloaded
+        whenever the stored session changed since the last load, e.g. after the browser signed in or
+        refreshed the session.
+
+        Args:
+            url (str): A URL of the domain to sync.
+            force (bool): Reload even if the stored session did not change.
+        """
+        if not self.session_manager:
+            return
+        domain = URLUtils.registrable_domain(url)
+        with self._lock:
+            version = self.session_manager.session_version(url)
+            if self._synced_versions.get(domain) == version and not force:
+                return
+            cookies = self.session_manager.get_cookies(url)
+            for cookie in cookies:
+                self.session.cookies.set_cookie(create_cookie(
+                    name=cookie['name'],
+                    value=cookie['value'],
+                    domain=cookie.get('domain', ''),
+                    path=cookie.get('path', '/'),
+                    secure=cookie.get('secure', False),
+                    expires=cookie.get('expiry'),
+                    rest={'HttpOnly': None} if cookie.get('httpOnly') else {}
+                ))
+            self._synced_versions[domain] = version
+        if self.logger:
+            self.logger.log_debug(f"Loaded {len(cookies)} session cookies for {domain} into the HTTP session.")
+
+    def fetch(self, url: str, data: dict = None, method: str = 'GET') -> str:
+        """
+        Fetches a page over HTTP with the browser's session cookies.
+
+        Args:
+            url (str): The URL to fetch.
+            data (dict, optional): The JSON body of a POST request.
+            method (str): The HTTP method to use, either 'GET' or 'POST'.
+
+        Returns:
+            str: The response body.
+
+        Raises:
+            requests.HTTPError: If the server answers with an error status.
+        """
+        self.sync_cookies(url)
+        if method == 'POST':
+            response = self.session.post(url, json=data, timeout=self.timeout)
+        else:
+            response = self.session.get(url, timeout=self.timeout)
+        self._store_response_cookies(url, response)
+        response.raise_for_status()
+        return response.text
+
+    def revalidate(self, url: str, etag: str = None, last_modified: str = None) -> requests.Response:
+        """
+        Sends a conditional GET with the session cookies. The server answers 304 if the page still
+        matches the validators from a previous fetch.
+
+        Args:
+            url (str): The URL to revalidate.
+            etag (str, optional): The ETag of the previous fetch, sent as If-None-Match.
+            last_modified (str, optional): The Last-Modified of the previous fetch, sent as If-Modified-Since.
+
+        Returns:
+            requests.Response: The response; error statuses are not raised.
+        """
+        self.sync_cookies(url)
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        self._store_response_cookies(url, response)
+        return response
+
+    def _store_response_cookies(self, url: str, response: requests.Response) -> None:
+        """
+        Merges cookies set by the response (including redirects) back into the session store.
+        """
+        if not self.session_manager:
+            return
+        set_cookies = []
+        for step in list(response.history) + [response]:
+            for cookie in step.cookies:
+                entry = {
+                    'name': cookie.name,
+                    'value': cookie.value,
+                    'domain': cookie.domain,
+                    'path': cookie.path,
+                    'secure': cookie.secure,
+                    'httpOnly': cookie.has_nonstandard_attr('HttpOnly')
+                }
+                if cookie.expires:
+                    entry['expiry'] = cookie.expires
+                set_cookies.append(entry)
+        if set_cookies:
+            self.session_manager.merge_cookies(url, set_cookies)
+            if self.logger:
+                self.logger.log_debug(f"Stored {len(set_cookies)} cookies set by {url}.")
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,138 @@
+# File: services/IdentityPool.py
+import threading
+import time
+from config import Config
+from interfaces.LoggerInterface import LoggerInterface
+
+class IdentityPoolExhausted(Exception):
+    pass
+
+class _Identity:
+    def __init__(self, name: str, credentials: dict):
+        self.name = name
+        self.credentials = credentials
+        self.leases = 0
+        self.strikes = 0
+        self.cooldown_until = 0.0
+        self.last_leased = 0.0
+        self.stats = {'leases': 0, 'throttled': 0}
+
+class IdentityPool:
+    def __init__(self, identities: list, logger: LoggerInterface = None, max_leases: int = 1,
+                 cooldown: float = 60.0, max_cooldown: float = 900.0):
+        """
+        Initializes a pool of accounts (identities) for one site, so parallel workers spread their
+        requests over several accounts instead of sharing one account's per-user limits.
+
+        Each browser is bound to one identity at a time, and its SessionManager keeps a separate session
+        for each (domain, identity). Workers lease an identity for every interaction: the browser's own
+        identity when it is free, otherwise the least recently used free one, which the browser rotates to.
+        An identity that was throttled cools down for an exponentially growing period before it is
+        leased again.
+
+        Args:
+            identities (list): Credential dicts, each with a unique 'name' plus the site's credential fields.
+            logger (LoggerInterface): The logger instance for logging.
+            max_leases (int): How many workers may use one identity at the same time.
+            cooldown (float): Seconds an identity rests after its first throttle; doubled on each repeat.
+            max_cooldown (float): The longest rest, in seconds.
+        """
+        if not identities:
+            raise ValueError("IdentityPool needs at least one identity.")
+        self.logger = logger
+        self.max_leases = max_leases
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._identities = {}
+        for identity in identities:
+            name = identity.get('name')
+            if not name or name in self._identities:
+                raise ValueError(f"Identities need unique names, got {name!r}.")
+            self._identities[name] = _Identity(name, {key: value for key, value in identity.items() if key != 'name'})
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_config(cls, site: dict, logger: LoggerInterface = None) -> "IdentityPool":
+        return cls(
+            identities=site['identities'],
+            logger=logger,
+            max_leases=Config.IDENTITY_MAX_LEASES,
+            cooldown=Config.IDENTITY_COOLDOWN
+        )
+
+    @property
+    def names(self) -> list:
+        return list(self._identities)
+
+    def credentials(self, name: str) -> dict:
+        return self._identities[name].credentials
+
+    def _available(self, identity: _Identity, now: float) -> bool:
+        return identity.leases < self.max_leases and identity.cooldown_until <= now
+
+    def lease(self, preferred: str = None, timeout: float = None) -> str:
+        """
+        Leases an identity, blocking until one is free and not cooling down.
+
+        Args:
+            preferred (str, optional): The identity to keep if it is available, e.g. the one the browser is bound to.
+            timeout (float, optional): Seconds to wait. None waits forever.
+
+        Returns:
+            str: The name of the leased identity.
+
+        Raises:
+            IdentityPoolExhausted: If no identity became available within the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                now = time.time()
+                identity = self._identities.get(preferred)
+                if identity is None or not self._available(identity, now):
+                    candidates = [identity for identity in self._identities.values() if self._available(identity, now)]
+                    identity = min(candidates, key=lambda candidate: candidate.last_leased) if candidates else None
+                if identity is not None:
+                    identity.leases += 1
+                    identity.last_leased = now
+                    identity.stats['leases'] += 1
+                    return identity.name
+                # Wake up when the first cooldown ends, or when a lease is released
+                wait = min((identity.cooldown_until - now for identity in self._identities.values()
+                            if identity.cooldown_until > now), default=None)
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise IdentityPoolExhausted(f"No identity became available within {timeout} seconds.")
+                    wait = remaining if wait is None else min(wait, remaining)
+                self._condition.wait(wait)
+
+    def release(self, name: str, throttled: bool = False) -> None:
+        """
+        Returns a leased identity. A throttled identity cools down; one that was used successfully
+        starts its next cooldown from the base period again.
+        """
+        with self._condition:
+            identity = self._identities[name]
+            identity.leases = max(0, identity.leases - 1)
+            if throttled:
+                identity.strikes += 1
+                identity.stats['throttled'] += 1
+                rest = min(self.max_cooldown, self.cooldown * 2 ** (identity.strikes - 1))
+                identity.cooldown_until = max(identity.cooldown_until, time.time() + rest)
+                if self.logger:
+                    self.logger.log_info(f"Identity {name} was throttled, resting it for {rest:.0f}s.")
+            elif identity.cooldown_until <= time.time():
+                identity.strikes = 0
+            self._condition.notify_all()
+
+    def stats(self) -> dict:
+        """
+        Returns the leases, throttles and remaining cooldown of every identity.
+        """
+        now = time.time()
+        with self._condition:
+            return {
+                name: dict(identity.stats, active=identity.leases, cooldown=max(0.0, identity.cooldown_until - now))
+                for name, identity in self._identities.items()
+            }
@@ -0,0 +1,253 @@
+# File: services/PageStore.py
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from typing import Iterable, Iterator
+from config import Config
+from interfaces.LoggerInterface import LoggerInterface
+
+# Every compressed batch in a segment starts with: magic, compressed length, raw length
+_BLOCK_HEADER = struct.Struct('<4sII')
+_BLOCK_MAGIC = b'PGB1'
+KIND_TEXT, KIND_JSON = 0, 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash BLOB PRIMARY KEY,
+    segment INTEGER NOT NULL,
+    block_offset INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    kind INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    hash BLOB NOT NULL,
+    PRIMARY KEY (url, fetched_at)
+) WITHOUT ROWID;
+"""
+
+class PageStore:
+    def __init__(self, store_dir: str, logger: LoggerInterface = None, batch_bytes: int = 1024 * 1024,
+                 segment_bytes: int = 1024 * 1024 * 1024, level: int = 6):
+        """
+        Initializes a content-addressed store for scraped pages.
+
+        Pages are identified by the SHA-256 of their content, so a page fetched many times, or
+        served identically under many URLs, is stored once. New contents are gathered into batches,
+        compressed together with zlib and appended to large segment files. A SQLite index maps
+        (url, fetch time) to the content hash and the hash to its segment, block and offset.
+        Single pages are read back through a memory map of the segment, decompressing only their block.
+
+        Args:
+            store_dir (str): The directory holding the segments and the index.
+            logger (LoggerInterface): The logger instance for logging.
+            batch_bytes (int): Uncompressed bytes gathered before a batch is compressed and written.
+            segment_bytes (int): Size after which a new segment file is started.
+            level (int): The zlib compression level.
+        """
+        self.store_dir = store_dir
+        self.logger = logger
+        self.batch_bytes = batch_bytes
+        self.segment_bytes = segment_bytes
+        self.level = level
+        self.stats = {'pages': 0, 'duplicates': 0, 'blocks': 0, 'raw_bytes': 0, 'stored_bytes': 0}
+        self._lock = threading.RLock()
+        self._batch = []
+        self._batch_size = 0
+        self._batch_hashes = {}
+        self._batch_pages = []
+        self._maps = {}
+        self._block_cache = (None, None)
+        os.makedirs(store_dir, exist_ok=True)
+        self._index = sqlite3.connect(os.path.join(store_dir, 'index.sqlite3'), timeout=30, check_same_thread=False)
+        self._index.execute("PRAGMA journal_mode=WAL")
+        self._index.execute("PRAGMA synchronous=NORMAL")
+        self._index.executescript(_SCHEMA)
+        segments = sorted(int(name[8:14]) for name in os.listdir(store_dir)
+                          if name.startswith('segment-') and name.endswith('.dat'))
+        self._segment = segments[-1] if segments else 1
+        self._writer = open(self._segment_path(self._segment), 'ab')
+
+    @classmethod
+    def from_config(cls, logger: LoggerInterface = None) -> "PageStore":
+        return cls(
+            store_dir=Config.PAGE_STORE_DIR,
+            logger=logger,
+            batch_bytes=Config.PAGE_STORE_BATCH_BYTES,
+            segment_bytes=Config.PAGE_STORE_SEGMENT_BYTES
+        )
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.store_dir, f"segment-{segment:06d}.dat")
+
+    @staticmethod
+    def _encode(content) -> tuple:
+        # Extracted fields are stored as canonical JSON, so equal data hashes equally
+        if isinstance(content, str):
+            return KIND_TEXT, content.encode('utf-8')
+        return KIND_JSON, json.dumps(content, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+    @staticmethod
+    def _decode(kind: int, payload: bytes):
+        text = payload.decode('utf-8')
+        return json.loads(text) if kind == KIND_JSON else text
+
+    def put(self, url: str, content, fetched_at: float = None) -> str:
+        """
+        Stores a page. Content already in the store only adds an index row.
+
+        Args:
+            url (str): The URL the content was fetched from.
+            content: The page source, or the JSON-serializable result of an extractor.
+            fetched_at (float, optional): The fetch time as a Unix timestamp. Defaults to now.
+
+        Returns:
+            str: The hex content hash.
+        """
+        kind, payload = self._encode(content)
+        digest = hashlib.sha256(payload).digest()
+        with self._lock:
+            self.stats['pages'] += 1
+            if digest in self._batch_hashes or self._index.execute(
+                    "SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone():
+                self.stats['duplicates'] += 1
+            else:
+                self._batch_hashes[digest] = (len(self._batch), kind)
+                self._batch.append(payload)
+                self._batch_size += len(payload)
+            self._batch_pages.append((url, fetched_at or time.time(), digest))
+            # Duplicates add only index rows, which are bounded separately
+            if self._batch_size >= self.batch_bytes or len(self._batch_pages) >= 1000:
+                self.flush()
+        return digest.hex()
+
+    def flush(self) -> None:
+        """
+        Compresses and appends the pending batch, then commits its index rows.
+        """
+        with self._lock:
+            if self._batch:
+                if self._writer.tell() >= self.segment_bytes:
+                    self._writer.close()
+                    self._segment += 1
+                    self._writer = open(self._segment_path(self._segment), 'ab')
+                raw = b''.join(self._batch)
+                compressed = zlib.compress(raw, self.level)
+                block_offset = self._writer.tell()
+                self._writer.write(_BLOCK_HEADER.pack(_BLOCK_MAGIC, len(compressed), len(raw)))
+                self._writer.write(compressed)
+                self._writer.flush()
+                os.fsync(self._writer.fileno())
+                offsets, position = [], 0
+                for payload in self._batch:
+                    offsets.append(position)
+                    position += len(payload)
+                self._index.executemany(
+                    "INSERT OR IGNORE INTO blobs (hash, segment, block_offset, offset, length, kind) VALUES (?, ?, ?, ?, ?, ?)",
+                    ((digest, self._segment, block_offset, offsets[index], len(self._batch[index]), kind)
+                     for digest, (index, kind) in self._batch_hashes.items())
+                )
+                self.stats['blocks'] += 1
+                self.stats['raw_bytes'] += len(raw)
+                self.stats['stored_bytes'] += _BLOCK_HEADER.size + len(compressed)
+            if self._batch_pages:
+                self._index.executemany("INSERT OR REPLACE INTO pages (url, fetched_at, hash) VALUES (?, ?, ?)",
+                                        self._batch_pages)
+            self._index.commit()
+            self._batch, self._batch_size, self._batch_hashes, self._batch_pages = [], 0, {}, []
+
+    def _map(self, segment: int, end: int) -> mmap.mmap:
+        mapped = self._maps.get(segment)
+        if mapped is None or len(mapped) < end:
+            # The active segment grows; remap it when a block lies past the current mapping
+            if mapped is not None:
+                mapped.close()
+            with open(self._segment_path(segment), 'rb') as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = mapped
+        return mapped
+
+    def _read_block(self, segment: int, block_offset: int) -> bytes:
+        key = (segment, block_offset)
+        if self._block_cache[0] == key:
+            return self._block_cache[1]
+        mapped = self._map(segment, block_offset + _BLOCK_HEADER.size)
+        magic, compressed_length, raw_length = _BLOCK_HEADER.unpack_from(mapped, block_offset)
+        if magic != _BLOCK_MAGIC:
+            raise ValueError(f"Corrupt page store block at segment {segment}, offset {block_offset}.")
+        start = block_offset + _BLOCK_HEADER.size
+        mapped = self._map(segment, start + compressed_length)
+        raw = zlib.decompress(mapped[start:start + compressed_length])
+        # Consecutive reads often hit the same batch
+        self._block_cache = (key, raw)
+        return raw
+
+    def get_by_hash(self, content_hash: str):
+        """
+        Returns the content with the given hex hash, or None if it is not stored.
+        """
+        digest = bytes.fromhex(content_hash)
+        with self._lock:
+            if digest in self._batch_hashes:
+                position, kind = self._batch_hashes[digest]
+                return self._decode(kind, self._batch[position])
+            row = self._index.execute(
+                "SELECT segment, block_offset, offset, length, kind FROM blobs WHERE hash = ?", (digest,)
+            ).fetchone()
+            if row is None:
+                return None
+            segment, block_offset, offset, length, kind = row
+            raw = self._read_block(segment, block_offset)
+        return self._decode(kind, raw[offset:offset + length])
+
+    def history(self, url: str) -> list:
+        """
+        Returns (fetched_at, hex hash) for every stored fetch of a URL, oldest first.
+        """
+        with self._lock:
+            pending = [(fetched_at, digest.hex()) for page_url, fetched_at, digest in self._batch_pages if page_url == url]
+            rows = self._index.execute(
+                "SELECT fetched_at, hash FROM pages WHERE url = ? ORDER BY fetched_at", (url,)
+            ).fetchall()
+        return [(fetched_at, digest.hex()) for fetched_at, digest in rows] + pending
+
+    def get(self, url: str, fetched_at: float = None):
+        """
+        Returns the content of a URL as fetched at the given time, or its latest fetch.
+
+        Returns:
+            The stored content, or None if the URL was never stored.
+        """
+        fetches = self.history(url)
+        if fetched_at is not None:
+            fetches = [fetch for fetch in fetches if fetch[0] == fetched_at]
+        return self.get_by_hash(fetches[-1][1]) if fetches else None
+
+    def write_results(self, results: Iterable) -> Iterator:
+        """
+        Stores each successful ScrapeResult as it passes through and yields it with its content hash,
+        so results stream to disk without being collected.
+        """
+        for result in results:
+            if result.ok and result.content is not None:
+                result.content_hash = self.put(result.url, result.content)
+            yield result
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._writer.close()
+            for mapped in self._maps.values():
+                mapped.close()
+            self._maps.clear()
+            self._index.close()
+        if self.logger:
+            self.logger.log_info("Page store closed: %s", self.stats)
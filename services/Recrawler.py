@@ -0,0 +1,168 @@
+# File: services/Recrawler.py
+import hashlib
+import re
+import threading
+import time
+from config import Config
+from interfaces.LoggerInterface import LoggerInterface
+from services.ValidatorStore import ValidatorStore
+from services.utils.URLUtils import URLUtils
+
+SKIPPED, UNCHANGED, FETCHED = 'skipped', 'unchanged', 'fetched'
+
+# Parts of a page that change on every response without the content changing
+_VOLATILE_PATTERNS = [re.compile(pattern, re.IGNORECASE | re.DOTALL) for pattern in (
+    r'<script\b.*?</script>',
+    r'<style\b.*?</style>',
+    r'<!--.*?-->',
+    r'<input\b[^>]*type=["\']?hidden[^>]*>',
+    r'<meta\b[^>]*name=["\']?csrf[^>]*>',
+    r'\bnonce=["\'][^"\']*["\']',
+)]
+_WHITESPACE = re.compile(r'\s+')
+_MAX_AGE = re.compile(r'max-age=(\d+)')
+
+class Recrawler:
+    def __init__(self, validators: ValidatorStore, http_engine, logger: LoggerInterface = None, min_age: float = 0,
+                 login_urls: list = None):
+        """
+        Initializes incremental recrawling, which renders a page in the browser only when it changed
+        since the last crawl.
+
+        For every URL it keeps the ETag, Last-Modified and a fingerprint of the normalized HTTP body.
+        A URL checked less than min_age seconds ago, or within the max-age its server sent, is skipped.
+        Otherwise a conditional GET is sent through the HttpEngine with the session cookies. A 304,
+        or a body whose fingerprint did not change, means the page is unchanged; anything else,
+        including a failed revalidation, is rendered in full and its new validators are recorded.
+        A revalidation that was redirected, e.g. to the login page, says nothing about the page itself:
+        the page is rendered and the redirect target's body is not recorded.
+
+        Args:
+            validators (ValidatorStore): The per-URL validators of previous crawls.
+            http_engine (HttpEngine): Sends the conditional requests.
+            logger (LoggerInterface): The logger instance for logging.
+            min_age (float): Seconds after a check during which a URL is not checked again.
+            login_urls (list, optional): URL prefixes of login pages, treated like a redirect when a
+                revalidation ends on them.
+        """
+        self.validators = validators
+        self.http_engine = http_engine
+        self.logger = logger
+        self.min_age = min_age
+        self.login_urls = list(login_urls or [])
+        self.stats = {SKIPPED: 0, 'revalidated': 0, 'refetched': 0, 'new': 0, 'revalidation_errors': 0, 'redirected': 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, http_engine, logger: LoggerInterface = None) -> "Recrawler":
+        return cls(
+            validators=ValidatorStore(Config.RECRAWL_DB),
+            http_engine=http_engine,
+            logger=logger,
+            min_age=Config.RECRAWL_MIN_AGE,
+            login_urls=[site['login_url'] for site in Config.SITES.values() if site.get('login_url')]
+        )
+
+    @staticmethod
+    def fingerprint(content) -> str:
+        """
+        Returns a hash of the content with scripts, comments, hidden inputs, nonces and whitespace
+        differences removed, so per-request tokens don't make an unchanged page look changed.
+        """
+        text = content if isinstance(content, str) else repr(content)
+        for pattern in _VOLATILE_PATTERNS:
+            text = pattern.sub('', text)
+        text = _WHITESPACE.sub(' ', text).strip()
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _max_age(response) -> float:
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        if 'no-cache' in cache_control or 'no-store' in cache_control:
+            return 0
+        match = _MAX_AGE.search(cache_control)
+        return float(match.group(1)) if match else 0
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def check(self, url: str) -> tuple:
+        """
+        Decides whether a URL needs a full render.
+
+        Returns:
+            tuple: (status, validators). status is SKIPPED, UNCHANGED or FETCHED. For FETCHED, validators
+                holds the fields to record once the render succeeds.
+        """
+        key = URLUtils.canonicalize(url)
+        record = self.validators.get(key)
+        now = time.time()
+        if record and now - record['checked_at'] < max(self.min_age, record['max_age'] or 0):
+            self._count(SKIPPED)
+            return SKIPPED, None
+        try:
+            response = self.http_engine.revalidate(url, etag=record and record['etag'],
+                                                   last_modified=record and record['last_modified'])
+        except Exception as e:
+            if self.logger:
+                self.logger.log_debug("Revalidation of %s failed, rendering it: %s", url, e)
+            self._count('revalidation_errors')
+            return FETCHED, {}
+        if response.history or URLUtils.canonicalize(response.url) != key or \
+                any(response.url.startswith(login_url) for login_url in self.login_urls):
+            # A login page or shell served in place of the page must not become its fingerprint
+            if self.logger:
+                self.logger.log_debug("Revalidation of %s ended on %s, rendering it.", url, response.url)
+            self._count('redirected')
+            return FETCHED, {}
+        max_age = self._max_age(response)
+        if record and response.status_code == 304:
+            self.validators.put(key, checked_at=now, max_age=max_age)
+            self._count('revalidated')
+            return UNCHANGED, None
+        if not response.ok:
+            self._count('revalidation_errors')
+            return FETCHED, {}
+        body_fingerprint = self.fingerprint(response.text)
+        if record and body_fingerprint == record['body_fingerprint']:
+            # Servers without validators still send the same body for an unchanged page
+            self.validators.put(key, etag=response.headers.get('ETag'),
+                                last_modified=response.headers.get('Last-Modified'), checked_at=now, max_age=max_age)
+            self._count('revalidated')
+            return UNCHANGED, None
+        self._count('refetched' if record else 'new')
+        return FETCHED, {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified'),
+                         'body_fingerprint': body_fingerprint, 'max_age': max_age}
+
+    def record(self, url: str, content, validators: dict) -> None:
+        """
+        Records the validators of a rendered page. They are only written after the render succeeded,
+        so a failed render is retried on the next crawl instead of being taken as unchanged.
+        """
+        now = time.time()
+        self.validators.put(URLUtils.canonicalize(url), fingerprint=self.fingerprint(content), checked_at=now,
+                            changed_at=now, **validators)
+
+    def process(self, url: str, render) -> tuple:
+        """
+        Checks a URL and renders it only if it changed.
+
+        Args:
+            url (str): The URL to process.
+            render (callable): Called with the URL to perform the full render.
+
+        Returns:
+            tuple: (status, content). content is None unless the page was rendered.
+        """
+        status, validators = self.check(url)
+        if status != FETCHED:
+            return status, None
+        content = render(url)
+        self.record(url, content, validators)
+        return status, content
+
+    def close(self) -> None:
+        self.validators.close()
+        if self.logger:
+            self.logger.log_info("Recrawl: %s", self.stats)
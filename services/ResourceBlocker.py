@@ -0,0 +1,118 @@
+# File: services/ResourceBlocker.py
+import json
+import threading
+from config import Config
+from interfaces.LoggerInterface import LoggerInterface
+from services.utils.DevTools import DevTools
+
+# URL patterns used by Network.setBlockedURLs for each resource type. Patterns must match the whole URL,
+# so each one is also applied with a query string, e.g. '*.png?*' for 'logo.png?v=3'
+RESOURCE_PATTERNS = {
+    'image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico', '*.bmp'],
+    'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'media': ['*.mp4', '*.webm', '*.mp3', '*.ogg', '*.wav', '*.m4a', '*.mov'],
+    'stylesheet': ['*.css'],
+}
+
+# Chrome content settings that stop a resource type from being requested at all (2 = block)
+CONTENT_SETTINGS = {
+    'image': 'profile.managed_default_content_settings.images',
+}
+
+class ResourceBlocker:
+    def __init__(self, resource_types: list = None, url_patterns: list = None, collect_stats: bool = False,
+                 logger: LoggerInterface = None):
+        """
+        Initializes a blocking policy applied to a Chrome session when it is created.
+
+        Args:
+            resource_types (list, optional): Resource types to block: 'image', 'font', 'media', 'stylesheet'.
+            url_patterns (list, optional): Extra Network.setBlockedURLs patterns, e.g. '*google-analytics.com*'.
+            collect_stats (bool): If True, Chrome performance logging is enabled so page_stats() can count
+                blocked and allowed requests per page.
+            logger (LoggerInterface): The logger instance for logging.
+        """
+        unknown = set(resource_types or []) - set(RESOURCE_PATTERNS)
+        if unknown:
+            raise ValueError(f"Unknown resource types: {sorted(unknown)}")
+        self.resource_types = list(resource_types or [])
+        self.url_patterns = list(url_patterns or [])
+        self.collect_stats = collect_stats
+        self.logger = logger
+        self.totals = {'pages': 0, 'blocked': 0, 'allowed': 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, logger: LoggerInterface = None) -> "ResourceBlocker":
+        """
+        Builds a policy from the 'block' settings of every site in Config.SITES. A driver may visit any
+        configured site, so the union of the site policies is applied.
+        """
+        resource_types, url_patterns = [], []
+        for site in Config.SITES.values():
+            block = site.get('block') or {}
+            resource_types.extend(t for t in block.get('resource_types', []) if t not in resource_types)
+            url_patterns.extend(p for p in block.get('url_patterns', []) if p not in url_patterns)
+        return cls(resource_types=resource_types, url_patterns=url_patterns, collect_stats=Config.BLOCK_STATS, logger=logger)
+
+    def blocked_url_patterns(self) -> list:
+        patterns = []
+        for resource_type in self.resource_types:
+            for pattern in RESOURCE_PATTERNS[resource_type]:
+                patterns.extend([pattern, f"{pattern}?*"])
+        return patterns + self.url_patterns
+
+    def configure_options(self, chrome_options) -> None:
+        """
+        Adds the Chrome preferences and logging capabilities for this policy to the session options.
+
+        Args:
+            chrome_options (ChromeOptions): The options used to create the session.
+        """
+        prefs = {CONTENT_SETTINGS[t]: 2 for t in self.resource_types if t in CONTENT_SETTINGS}
+        if prefs:
+            chrome_options.add_experimental_option('prefs', prefs)
+        if self.collect_stats:
+            chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    def apply(self, driver) -> None:
+        """
+        Installs DevTools request blocking on a newly created session.
+
+        Args:
+            driver: The WebDriver instance.
+        """
+        patterns = self.blocked_url_patterns()
+        if not patterns:
+            return
+        devtools = DevTools(driver)
+        devtools.execute('Network.enable')
+        devtools.execute('Network.setBlockedURLs', {'urls': patterns})
+        if self.logger:
+            self.logger.log_debug(f"Blocking {len(patterns)} URL patterns in the browser.")
+
+    def page_stats(self, driver) -> dict:
+        """
+        Counts the requests blocked and allowed since the last call, from Chrome's performance log.
+
+        Resources stopped by content settings (e.g. images) are never requested and so are not counted.
+
+        Args:
+            driver: The WebDriver instance.
+
+        Returns:
+            dict: {'blocked': int, 'allowed': int}
+        """
+        requested = blocked = 0
+        for entry in driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            if message['method'] == 'Network.requestWillBeSent':
+                requested += 1
+            elif message['method'] == 'Network.loadingFailed' and message['params'].get('blockedReason'):
+                blocked += 1
+        stats = {'blocked': blocked, 'allowed': requested - blocked}
+        with self._lock:
+            self.totals['pages'] += 1
+            self.totals['blocked'] += stats['blocked']
+            self.totals['allowed'] += stats['allowed']
+        return stats
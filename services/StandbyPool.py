@@ -0,0 +1,134 @@
+# File: services/StandbyPool.py
+import queue
+import threading
+from interfaces.LoggerInterface import LoggerInterface
+from services.Browser import Browser
+
+class StandbyPool:
+    def __init__(self, browser_factory, warm_up=None, size: int = 2, logger: LoggerInterface = None):
+        """
+        Initializes a pool that keeps browsers created, warmed up and session-restored in the background,
+        so handing one out costs no startup time.
+
+        Args:
+            browser_factory (callable): Returns a new non-shared Browser.
+            warm_up (callable, optional): Called with each new browser before it goes on standby, e.g. to load
+                the site's open URL so the SessionManager restores the stored session.
+            size (int): The number of browsers to keep on standby.
+            logger (LoggerInterface): The logger instance for logging.
+        """
+        if size < 1:
+            raise ValueError("Standby size must be at least 1.")
+        self.browser_factory = browser_factory
+        self.warm_up = warm_up
+        self.size = size
+        self.logger = logger
+        self.stats = {'created': 0, 'taken': 0, 'failed': 0}
+        self._ready = queue.Queue()
+        self._wanted = threading.Semaphore(0)
+        self._closed = threading.Event()
+        self._threads = []
+        for index in range(size):
+            self._wanted.release()
+            thread = threading.Thread(target=self._refill, name=f"StandbyPool-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _prepare(self) -> Browser:
+        browser = self.browser_factory()
+        try:
+            if self.warm_up:
+                self.warm_up(browser)
+        except Exception:
+            browser.close()
+            raise
+        return browser
+
+    def _refill(self):
+        """
+        Worker loop: creates one browser every time a standby slot is freed.
+        """
+        while not self._closed.is_set():
+            if not self._wanted.acquire(timeout=0.5):
+                continue
+            try:
+                browser = self._prepare()
+            except Exception as e:
+                self.stats['failed'] += 1
+                if self.logger:
+                    self.logger.log_error(f"Failed to prepare standby browser: {e}")
+                self._wanted.release()
+                self._closed.wait(5)
+                continue
+            if self._closed.is_set():
+                browser.close()
+                return
+            self.stats['created'] += 1
+            self._ready.put(browser)
+            if self.logger:
+                self.logger.log_debug(f"Standby browser ready ({self._ready.qsize()}/{self.size}).")
+
+    def take(self, timeout: float = None) -> Browser:
+        """
+        Hands out a warmed browser and schedules a replacement. The caller owns the browser and must close it.
+
+        Args:
+            timeout (float, optional): Seconds to wait if no browser is ready yet. None waits forever.
+
+        Returns:
+            Browser: A ready browser.
+
+        Raises:
+            queue.Empty: If no browser became ready within the timeout.
+        """
+        browser = self._ready.get(timeout=timeout)
+        self.stats['taken'] += 1
+        if not self._closed.is_set():
+            self._wanted.release()
+        return browser
+
+    def take_engine(self, fallback=None):
+        """
+        Hands out the engine of a warmed browser and schedules a replacement. Used as the engine_factory of a
+        DriverLifecycleManager, so recycled and replaced drivers start warm. The browser's pending session
+        changes are written first; the caller owns the engine and must quit its driver.
+
+        Args:
+            fallback (callable, optional): Returns a new engine when no browser is ready. Without one, waits
+                for the next browser.
+
+        Returns:
+            The engine, e.g. a ChromeRemote.
+        """
+        try:
+            browser = self.take(timeout=0 if fallback else None)
+        except queue.Empty:
+            if self.logger:
+                self.logger.log_debug("No standby browser ready, creating a new driver.")
+            return fallback()
+        if browser.session_manager:
+            browser.session_manager.close()
+        if browser.lifecycle:
+            browser.lifecycle.close()
+        return browser.engine
+
+    def ready_count(self) -> int:
+        return self._ready.qsize()
+
+    def close(self):
+        """
+        Stops refilling and closes the browsers still on standby.
+        """
+        self._closed.set()
+        for thread in self._threads:
+            thread.join(timeout=1)
+        while True:
+            try:
+                browser = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                browser.close()
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_error(f"Error closing standby browser: {e}")
@@ -0,0 +1,69 @@
+# File: services/ValidatorStore.py
+import os
+import sqlite3
+import threading
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS validators (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body_fingerprint TEXT,
+    fingerprint TEXT,
+    max_age REAL,
+    checked_at REAL NOT NULL,
+    changed_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+_FIELDS = ('etag', 'last_modified', 'body_fingerprint', 'fingerprint', 'max_age', 'checked_at', 'changed_at')
+
+class ValidatorStore:
+    def __init__(self, db_file: str):
+        """
+        Initializes a SQLite table of per-URL change validators: the ETag and Last-Modified of the last
+        HTTP response, fingerprints of the HTTP body and of the rendered result, and when the URL was
+        last checked and last found changed.
+
+        Args:
+            db_file (str): The path to the database.
+        """
+        self.db_file = db_file
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_file, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(_SCHEMA)
+
+    def get(self, url: str) -> dict:
+        """
+        Returns the validators of a URL, or None if it was never recorded.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {', '.join(_FIELDS)} FROM validators WHERE url = ?", (url,)
+            ).fetchone()
+        return dict(zip(_FIELDS, row)) if row else None
+
+    def put(self, url: str, **values) -> None:
+        """
+        Inserts or updates the given validator fields of a URL.
+        """
+        unknown = set(values) - set(_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown validator fields: {sorted(unknown)}")
+        record = self.get(url) or {'checked_at': 0.0, 'changed_at': 0.0}
+        record.update(values)
+        columns = ['url'] + list(record)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO validators ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [url] + list(record.values())
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
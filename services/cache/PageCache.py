@@ -0,0 +1,200 @@
+# File: services/cache/PageCache.py
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+from interfaces.LoggerInterface import LoggerInterface
+from services.utils.URLUtils import URLUtils
+
+class PageCache:
+    def __init__(self, cache_dir: str = None, max_entries: int = 256, max_disk_bytes: int = 512 * 1024 * 1024,
+                 default_ttl: float = 0, ttl_by_domain: dict = None, exclude: list = None, logger: LoggerInterface = None):
+        """
+        Initializes a two-tier response cache: an in-memory LRU in front of a size-bounded disk store.
+
+        Args:
+            cache_dir (str, optional): The directory of the disk tier. If None, only the memory tier is used.
+            max_entries (int): The maximum number of responses kept in memory.
+            max_disk_bytes (int): The maximum total size of the disk tier; least recently used entries are evicted.
+            default_ttl (float): Seconds a response stays valid for domains without their own TTL. 0 disables caching.
+            ttl_by_domain (dict, optional): Per-domain TTLs in seconds, keyed by registrable domain.
+            exclude (list, optional): URL prefixes that are never cached, e.g. pages whose final URL is inspected.
+            logger (LoggerInterface): The logger instance for logging.
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.default_ttl = default_ttl
+        self.ttl_by_domain = ttl_by_domain or {}
+        self.exclude = [self.normalize_url(prefix) for prefix in (exclude or [])]
+        self.logger = logger
+        self._memory = OrderedDict()
+        self._disk_index = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'expired': 0}
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._load_disk_index()
+
+    @classmethod
+    def from_config(cls, logger: LoggerInterface = None) -> "PageCache":
+        """
+        Builds a PageCache from Config, using each site's 'cache_ttl' and 'cache_exclude' settings.
+        """
+        ttl_by_domain = {}
+        exclude = []
+        for site in Config.SITES.values():
+            if 'cache_ttl' in site:
+                ttl_by_domain[URLUtils.registrable_domain(site['open_url'])] = site['cache_ttl']
+            exclude.extend(site.get('cache_exclude', []))
+        return cls(
+            cache_dir=Config.CACHE_DIR or None,
+            max_entries=Config.CACHE_MAX_ENTRIES,
+            max_disk_bytes=Config.CACHE_MAX_BYTES,
+            ttl_by_domain=ttl_by_domain,
+            exclude=exclude,
+            logger=logger
+        )
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """
+        Normalizes a URL for use as a cache key, see URLUtils.canonicalize.
+        """
+        return URLUtils.canonicalize(url)
+
+    def key(self, url: str, method: str = 'GET', variant: str = '') -> str:
+        """
+        Computes the cache key for a request.
+
+        Args:
+            url (str): The requested URL.
+            method (str): The HTTP method.
+            variant (str): Distinguishes different representations of the same URL, e.g. extracted fields.
+
+        Returns:
+            str: A hex digest identifying the request.
+        """
+        raw = f"{method.upper()} {self.normalize_url(url)} {variant}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def ttl_for(self, url: str) -> float:
+        normalized = self.normalize_url(url)
+        if any(normalized.startswith(prefix) for prefix in self.exclude):
+            return 0
+        domain = URLUtils.registrable_domain(url)
+        return self.ttl_by_domain.get(domain, self.default_ttl)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _load_disk_index(self):
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, name, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk_index[key] = size
+            self._disk_bytes += size
+
+    def get(self, url: str, method: str = 'GET', variant: str = ''):
+        """
+        Looks up a cached response.
+
+        Returns:
+            The cached value, or None on a miss or an expired entry.
+        """
+        if self.ttl_for(url) <= 0:
+            return None
+        key = self.key(url, method, variant)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    return entry[1]
+                del self._memory[key]
+                self.stats['expired'] += 1
+            if self.cache_dir and key in self._disk_index:
+                try:
+                    with open(self._path(key), 'rb') as file:
+                        expires_at, value = pickle.load(file)
+                except (OSError, pickle.UnpicklingError, EOFError):
+                    expires_at, value = 0, None
+                if expires_at > now:
+                    self._disk_index.move_to_end(key)
+                    self._remember(key, expires_at, value)
+                    self.stats['disk_hits'] += 1
+                    return value
+                self._remove_disk(key)
+                self.stats['expired'] += 1
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, url: str, value, method: str = 'GET', variant: str = '') -> None:
+        """
+        Stores a response if its URL is cacheable.
+        """
+        ttl = self.ttl_for(url)
+        if ttl <= 0 or value is None:
+            return
+        key = self.key(url, method, variant)
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self.cache_dir:
+                self._write_disk(key, expires_at, value)
+            self.stats['stores'] += 1
+
+    def _remember(self, key: str, expires_at: float, value) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def _write_disk(self, key: str, expires_at: float, value) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as file:
+            pickle.dump((expires_at, value), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        if key in self._disk_index:
+            self._disk_bytes -= self._disk_index.pop(key)
+        size = os.path.getsize(path)
+        self._disk_index[key] = size
+        self._disk_bytes += size
+        while self._disk_bytes > self.max_disk_bytes and len(self._disk_index) > 1:
+            oldest = next(iter(self._disk_index))
+            self._remove_disk(oldest)
+            self.stats['evictions'] += 1
+
+    def _remove_disk(self, key: str) -> None:
+        self._disk_bytes -= self._disk_index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """
+        Removes every cached response from both tiers.
+        """
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._disk_index):
+                self._remove_disk(key)
+
+    def hit_ratio(self) -> float:
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        total = hits + self.stats['misses']
+        return hits / total if total else 0.0
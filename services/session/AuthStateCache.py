@@ -0,0 +1,104 @@
+# File: services/session/AuthStateCache.py
+import json
+import os
+import threading
+import time
+from config import Config
+from interfaces.LoggerInterface import LoggerInterface
+
+class AuthStateCache:
+    def __init__(self, state_file: str, session_manager=None, logger: LoggerInterface = None):
+        """
+        Initializes a record of when each site's authentication last succeeded, so a worker with a fresh
+        session can skip the authentication probe.
+
+        A site is fresh while its last success is younger than the site's TTL and the cookies that were
+        present at that time are still in the stored session and have not expired.
+
+        Args:
+            state_file (str): The JSON file holding the authentication state of every site.
+            session_manager (SessionManager, optional): Reads the stored cookies without touching the driver.
+                Without it, only the TTL is checked.
+            logger (LoggerInterface): The logger instance for logging.
+        """
+        self.state_file = state_file
+        self.session_manager = session_manager
+        self.logger = logger
+        self._lock = threading.Lock()
+        try:
+            with open(state_file) as file:
+                self._state = json.load(file)
+        except (FileNotFoundError, ValueError):
+            self._state = {}
+
+    @classmethod
+    def from_config(cls, session_manager=None, logger: LoggerInterface = None) -> "AuthStateCache":
+        return cls(state_file=Config.AUTH_STATE_FILE, session_manager=session_manager, logger=logger)
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.state_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.state_file}.tmp"
+        with open(temporary, 'w') as file:
+            json.dump(self._state, file)
+        os.replace(temporary, self.state_file)
+
+    def _stored_cookies(self, url: str) -> list:
+        return self.session_manager.get_cookies(url) if self.session_manager else []
+
+    def record_success(self, site: str, url: str) -> None:
+        """
+        Records that the site is authenticated now, along with the names of the session cookies
+        stored for it at this moment.
+
+        Args:
+            site (str): The key of the site, e.g. its authed URL.
+            url (str): A URL of the site's domain, used to look up its stored cookies.
+        """
+        cookies = [cookie['name'] for cookie in self._stored_cookies(url)]
+        with self._lock:
+            self._state[site] = {'authenticated_at': time.time(), 'cookies': cookies}
+            self._save()
+
+    def invalidate(self, site: str) -> None:
+        """
+        Forgets the site's authentication, so the next check probes it again.
+        """
+        with self._lock:
+            if self._state.pop(site, None) is not None:
+                self._save()
+                if self.logger:
+                    self.logger.log_info(f"Authentication state of {site} invalidated.")
+
+    def expires_at(self, site: str, url: str, ttl: float = 0) -> float:
+        """
+        Returns when the site's authentication stops being fresh, as a Unix timestamp: the end of the TTL
+        or the earliest expiry of the cookies recorded at the last success. Returns 0 if a recorded cookie
+        is missing from the stored session, or if the site was never recorded.
+
+        Args:
+            site (str): The key of the site.
+            url (str): A URL of the site's domain, used to look up its stored cookies.
+            ttl (float): Seconds an authentication is trusted after it succeeded. 0 means no limit.
+        """
+        with self._lock:
+            state = self._state.get(site)
+        if state is None:
+            return 0.0
+        expiry = state['authenticated_at'] + ttl if ttl else float('inf')
+        if self.session_manager:
+            stored = {cookie['name']: cookie for cookie in self._stored_cookies(url)}
+            for name in state['cookies']:
+                if name not in stored:
+                    return 0.0
+                # Session cookies without an expiry last as long as the TTL allows
+                if stored[name].get('expiry'):
+                    expiry = min(expiry, float(stored[name]['expiry']))
+        return expiry
+
+    def is_fresh(self, site: str, url: str, ttl: float = 0) -> bool:
+        """
+        Checks if the site's last authentication can be trusted without probing it.
+        """
+        return self.expires_at(site, url, ttl) > time.time()
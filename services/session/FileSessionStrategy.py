@@ -1,6 +1,7 @@
 # File: services/sessions/FileSessionStrategy.py
 import pickle
 import os
+import threading
 from config import Config
 
 class FileSessionStrategy:
@@ -31,8 +32,11 @@ class FileSessionStrategy:
         Args:
             session_data (dict): The session data to save.
         """
-        with open(self.session_file, 'wb') as file:
+        # Write a temporary file and swap it in, so pooled browsers never read a half-written session
+        temporary = f"{self.session_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, 'wb') as file:
             pickle.dump(session_data, file)
+        os.replace(temporary, self.session_file)
 
     def load(self) -> dict:
         """
@@ -0,0 +1,207 @@
+# File: services/session/SQLiteSessionStrategy.py
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from config import Config
+
+SESSION_KINDS = ('cookies', 'local_storage', 'session_storage')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_entries (
+    session_key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    entry_key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (session_key, kind, entry_key)
+) WITHOUT ROWID
+"""
+
+_UPSERT = """
+INSERT INTO session_entries (session_key, kind, entry_key, value, updated_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (session_key, kind, entry_key)
+DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+WHERE session_entries.value != excluded.value
+"""
+
+class SQLiteSessionStore:
+    """
+    A SQLite database in WAL mode holding the sessions of every domain, one row per cookie
+    or storage entry. Connections are per thread so the store can be shared by pooled
+    browsers and the background SessionWriter.
+    """
+    _stores = {}
+    _stores_lock = threading.Lock()
+
+    def __init__(self, db_file: str) -> None:
+        self.db_file = db_file
+        self._local = threading.local()
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.connection() as connection:
+            connection.execute(_SCHEMA)
+
+    @classmethod
+    def get(cls, db_file: str) -> "SQLiteSessionStore":
+        """
+        Returns the shared store for a database file, creating it on first use.
+        """
+        db_file = os.path.abspath(db_file)
+        with cls._stores_lock:
+            if db_file not in cls._stores:
+                cls._stores[db_file] = cls(db_file)
+            return cls._stores[db_file]
+
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_file, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+class SQLiteSessionStrategy:
+    def __init__(self, session_key: str, db_file: str = None, migrate: bool = True) -> None:
+        """
+        Initializes the SQLiteSessionStrategy for one session.
+
+        Args:
+            session_key (str): The key of the session, usually the domain UUID.
+            db_file (str, optional): The path to the database. Defaults to sessions.sqlite3 in Config.SESSIONS_DIR.
+            migrate (bool): If True, a pickle file written by FileSessionStrategy for the same key
+                is imported the first time the session is looked up and not found in the database.
+        """
+        self.session_key = session_key
+        self.db_file = db_file or os.path.join(Config.SESSIONS_DIR, 'sessions.sqlite3')
+        self.store = SQLiteSessionStore.get(self.db_file)
+        self.migrate = migrate
+
+    def _has_rows(self) -> bool:
+        row = self.store.connection().execute(
+            "SELECT 1 FROM session_entries WHERE session_key = ? LIMIT 1", (self.session_key,)
+        ).fetchone()
+        return row is not None
+
+    def _migrate_pickle(self) -> bool:
+        """
+        Imports the pickle session file for this key, if one exists.
+
+        Returns:
+            bool: True if a session was imported.
+        """
+        session_file = os.path.join(Config.SESSIONS_DIR, self.session_key)
+        if not os.path.isfile(session_file):
+            return False
+        with open(session_file, 'rb') as file:
+            session_data = pickle.load(file)
+        self.save(session_data)
+        return True
+
+    def exists(self) -> bool:
+        """
+        Checks if the session has any stored entries.
+
+        Returns:
+            bool: True if the session exists, False otherwise.
+        """
+        if self._has_rows():
+            return True
+        return self.migrate and self._migrate_pickle()
+
+    def _rows(self, session_data: dict):
+        now = time.time()
+        for kind in SESSION_KINDS:
+            entries = session_data.get(kind) or {}
+            if kind == 'cookies':
+                entries = {cookie['name']: cookie for cookie in entries}
+            for entry_key, value in entries.items():
+                yield (self.session_key, kind, str(entry_key), json.dumps(value, sort_keys=True), now)
+
+    def merge(self, session_data: dict) -> None:
+        """
+        Upserts the given cookies and storage entries. Rows whose value did not change are not rewritten
+        and entries absent from session_data are kept.
+
+        Args:
+            session_data (dict): Session data with 'cookies', 'local_storage' and 'session_storage'.
+        """
+        connection = self.store.connection()
+        with connection:
+            connection.executemany(_UPSERT, self._rows(session_data))
+
+    def save(self, session_data: dict) -> None:
+        """
+        Saves the session data so the stored session matches it exactly, writing only the rows that changed.
+
+        Args:
+            session_data (dict): The session data to save.
+        """
+        rows = list(self._rows(session_data))
+        connection = self.store.connection()
+        with connection:
+            connection.executemany(_UPSERT, rows)
+            for kind in SESSION_KINDS:
+                keys = [row[2] for row in rows if row[1] == kind]
+                placeholders = ','.join('?' * len(keys))
+                connection.execute(
+                    f"DELETE FROM session_entries WHERE session_key = ? AND kind = ? AND entry_key NOT IN ({placeholders})",
+                    (self.session_key, kind, *keys)
+                )
+
+    def load(self) -> dict:
+        """
+        Loads the session data for this key only.
+
+        Returns:
+            dict: The loaded session data.
+
+        Raises:
+            FileNotFoundError: If the session does not exist.
+        """
+        if not self.exists():
+            raise FileNotFoundError(f"The session {self.session_key} does not exist in {self.db_file}.")
+        session_data = {'cookies': [], 'local_storage': {}, 'session_storage': {}}
+        rows = self.store.connection().execute(
+            "SELECT kind, entry_key, value FROM session_entries WHERE session_key = ?", (self.session_key,)
+        )
+        for kind, entry_key, value in rows:
+            if kind == 'cookies':
+                session_data['cookies'].append(json.loads(value))
+            else:
+                session_data.setdefault(kind, {})[entry_key] = json.loads(value)
+        return session_data
+
+    @classmethod
+    def migrate_from_files(cls, sessions_dir: str = None, db_file: str = None) -> int:
+        """
+        Imports every pickle session file in a directory into the database.
+
+        Args:
+            sessions_dir (str, optional): The directory of FileSessionStrategy files. Defaults to Config.SESSIONS_DIR.
+            db_file (str, optional): The path to the database.
+
+        Returns:
+            int: The number of sessions imported.
+        """
+        sessions_dir = sessions_dir or Config.SESSIONS_DIR
+        imported = 0
+        for name in os.listdir(sessions_dir):
+            path = os.path.join(sessions_dir, name)
+            if not os.path.isfile(path):
+                continue
+            try:
+                with open(path, 'rb') as file:
+                    session_data = pickle.load(file)
+            except Exception:
+                # Not a pickled session (e.g. the database itself)
+                continue
+            if isinstance(session_data, dict) and 'cookies' in session_data:
+                cls(name, db_file=db_file, migrate=False).save(session_data)
+                imported += 1
+        return imported
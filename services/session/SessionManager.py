@@ -1,31 +1,73 @@
 # services/session/SessionManager.py
+import copy
+import threading
+import time
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from interfaces.LoggerInterface import LoggerInterface
 from services.session.FileSessionStrategy import FileSessionStrategy
-from services.utils.URLBasedUUIDGenerator import URLBasedUUIDGenerator
+from services.session.SessionWriter import SessionWriter
+from services.utils.URLUtils import URLUtils
+from services.utils.DevTools import DevTools
+from services.utils.Instrumentation import Instrumentation
 
 class SessionNotFoundException(Exception):
     pass
 
 class SessionManager:
-    def __init__(self, strategy=None, logger: LoggerInterface = None):
+    # Per-session change counters, shared by every manager in the process so readers such as the
+    # HttpEngine notice sessions saved by pooled browsers too
+    _versions = {}
+    _versions_lock = threading.Lock()
+
+    def __init__(self, strategy=None, logger: LoggerInterface = None, write_behind: bool = False,
+                 flush_interval: float = 30.0, flush_every: int = 20, skip_unrendered_refresh: bool = True,
+                 identity: str = None):
         """
         Initializes the SessionManager with a given strategy and logger.
 
         Args:
-            strategy: The strategy to use for session management.
+            strategy: A callable that takes a session UUID and returns the strategy storing that
+                session, e.g. FileSessionStrategy (the default) or SQLiteSessionStrategy.
             logger (LoggerInterface): The logger instance for logging.
+            write_behind (bool): If True, sessions are cached in memory and updates of already
+                restored domains are coalesced and written by a background SessionWriter. A domain's
+                unsaved changes are captured at the latest when the driver navigates to another domain.
+            flush_interval (float): In write-behind mode, the maximum age in seconds of unsaved
+                changes before the next interaction on that domain captures and schedules them.
+            flush_every (int): In write-behind mode, the maximum number of interactions on a domain
+                before its session is captured, regardless of age.
+            skip_unrendered_refresh (bool): If True, the page is not refreshed after a restore when it
+                has not rendered any content yet, since the next navigation will pick the session up.
+            identity (str, optional): The account whose sessions are managed. Each (domain, identity)
+                has its own stored session; without an identity there is one session per domain.
         """
         self.driver = None
         self.logger = logger
-        self.strategy = strategy
-        self.history = []
+        self.strategy_factory = strategy or FileSessionStrategy
+        self.strategy = None
+        self.identity = identity
+        # Domains whose session was restored into (or first saved from) the current driver
+        self.history = set()
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self._cache = {}
+        self._dirty = {}
+        self._writer = SessionWriter(logger=logger) if write_behind else None
+        self.skip_unrendered_refresh = skip_unrendered_refresh
+        self._lock = threading.RLock()
+        # Replaced by the Browser's instrumentation when the manager is wired to a browser
+        self.instrumentation = Instrumentation()
 
     def set_driver(self, driver):
         self.driver = driver
 
+    def _driver_label(self) -> str:
+        session_id = getattr(self.driver, 'session_id', None)
+        return session_id[:8] if session_id else ''
+
     def validate(self, url: str) -> None:
         """
         Validates the given URL by checking its domain against the history.
@@ -39,28 +81,205 @@ class SessionManager:
         """
         try:
             self.logger.log_info(f"Check if request has previous session: {url}.")
-            domain = URLBasedUUIDGenerator().extract_domain(url)
-            uuid = URLBasedUUIDGenerator().get_uuid(url)
-            self.strategy = FileSessionStrategy(uuid)
-            # Check if domain is in history
-            if domain in self.history:
-                self.logger.log_info(f"Previous session data for {domain} was already restored.")
-                self.logger.log_info(f"Starting session update for: {domain}")
-                self._save_session(domain, uuid)
-                return
-            else:
-                if self.strategy.exists():
-                    self.logger.log_info(f"Previous session data for: {domain} was not restored yet. Restoring now.")
-                    self._restore_session(domain)
-                else:
-                    self.logger.log_info(f"Saving session for: {domain} for the first time.")
+            domain = URLUtils.registrable_domain(url)
+            uuid = URLUtils.session_uuid(url, self.identity)
+            self.strategy = self.strategy_factory(uuid)
+            with self.instrumentation.span('session.validate', site=domain, driver=self._driver_label()):
+                # Check if domain is in history
+                if domain in self.history:
+                    if self.write_behind:
+                        self._mark_dirty(domain, uuid)
+                        return
+                    self.logger.log_info(f"Previous session data for {domain} was already restored.")
+                    self.logger.log_info(f"Starting session update for: {domain}")
                     self._save_session(domain, uuid)
-                self.history.append(domain)
+                    return
+                else:
+                    if self.strategy.exists():
+                        self.logger.log_info(f"Previous session data for: {domain} was not restored yet. Restoring now.")
+                        self._restore_session(domain, uuid)
+                    else:
+                        self.logger.log_info(f"Saving session for: {domain} for the first time.")
+                        self._save_session(domain, uuid)
+                    self.history.add(domain)
         except Exception as e:
             if self.logger:
                 self.logger.log_error(f"Error validating URL: {e}")
             raise
 
+    def needs_restore(self, url: str) -> bool:
+        """
+        Checks if the URL's domain has a stored session that was not restored into the current driver yet.
+
+        Args:
+            url (str): A URL of the domain.
+
+        Returns:
+            bool: True if validate() would restore a session for the URL.
+        """
+        if URLUtils.registrable_domain(url) in self.history:
+            return False
+        uuid = URLUtils.session_uuid(url, self.identity)
+        return uuid in self._cache or self.strategy_factory(uuid).exists()
+
+    def get_cookies(self, url: str) -> list:
+        """
+        Returns the stored cookies for the URL's domain without touching the driver.
+
+        Args:
+            url (str): A URL of the domain.
+
+        Returns:
+            list: The stored cookies in WebDriver format, or an empty list if there is no session.
+        """
+        domain = URLUtils.registrable_domain(url)
+        uuid = URLUtils.session_uuid(url, self.identity)
+        with self._lock:
+            session_data = self._cache.get(uuid)
+            if session_data is None:
+                try:
+                    session_data = self.strategy_factory(uuid).load()
+                except FileNotFoundError:
+                    return []
+        return [cookie for cookie in session_data.get('cookies', []) if domain in cookie.get('domain', domain)]
+
+    @classmethod
+    def _bump_version(cls, uuid: str) -> None:
+        with cls._versions_lock:
+            cls._versions[uuid] = cls._versions.get(uuid, 0) + 1
+
+    def session_version(self, url: str) -> int:
+        """
+        Returns a counter that changes every time the stored session of the URL's domain is written,
+        so callers holding a copy of its cookies know when to reload them.
+        """
+        return SessionManager._versions.get(URLUtils.session_uuid(url, self.identity), 0)
+
+    def merge_cookies(self, url: str, cookies: list) -> None:
+        """
+        Merges cookies obtained outside the driver (e.g. from HTTP responses) into the stored session.
+
+        Args:
+            url (str): A URL of the domain the cookies belong to.
+            cookies (list): The cookies in WebDriver format.
+        """
+        uuid = URLUtils.session_uuid(url, self.identity)
+        strategy = self.strategy_factory(uuid)
+        with self._lock:
+            if uuid in self._cache:
+                session_data = self._cache[uuid]
+                session_data['cookies'] = self._merge_lists(session_data.get('cookies', []), cookies)
+                self._writer.submit(uuid, strategy, copy.deepcopy(session_data))
+            elif hasattr(strategy, 'merge'):
+                strategy.merge({'cookies': cookies})
+            else:
+                try:
+                    session_data = strategy.load()
+                except FileNotFoundError:
+                    session_data = {'cookies': [], 'local_storage': {}, 'session_storage': {}}
+                session_data['cookies'] = self._merge_lists(session_data.get('cookies', []), cookies)
+                strategy.save(session_data)
+        self._bump_version(uuid)
+
+    def _mark_dirty(self, domain: str, uuid: str) -> None:
+        """
+        Records an interaction on an already restored domain and captures its session only
+        once the configured interval or interaction count has been reached.
+
+        Args:
+            domain (str): The domain of the session.
+            uuid (str): The UUID of the session.
+        """
+        state = self._dirty.setdefault(uuid, {'domain': domain, 'count': 0, 'since': time.monotonic()})
+        state['count'] += 1
+        if state['count'] >= self.flush_every or time.monotonic() - state['since'] >= self.flush_interval:
+            self.logger.log_debug(f"Flushing session for {domain} after {state['count']} interactions.")
+            self._save_session(domain, uuid)
+
+    def _capture_dirty(self) -> None:
+        """
+        Captures the session of the domain currently loaded in the driver if it has unsaved changes.
+        """
+        if not (self._dirty and self.driver):
+            return
+        current_url = self.driver.current_url
+        domain = URLUtils.registrable_domain(current_url)
+        uuid = URLUtils.session_uuid(current_url, self.identity)
+        if uuid in self._dirty:
+            self.strategy = self.strategy_factory(uuid)
+            self._save_session(domain, uuid)
+        for stale in list(self._dirty):
+            # Left by a redirect to another domain; its page is gone, so there is nothing to capture
+            if self.logger:
+                self.logger.log_error(f"Unsaved session changes for {self._dirty[stale]['domain']} could not be captured.")
+            del self._dirty[stale]
+
+    def before_navigation(self, url: str) -> None:
+        """
+        In write-behind mode, captures the unsaved changes of the domain loaded in the driver before it
+        navigates to another domain. Only the current page's cookies and storage are reachable through
+        the driver, so they must be read before the page is left.
+
+        Args:
+            url (str): The URL the driver is about to load.
+        """
+        if not self.write_behind or not self._dirty:
+            return
+        if set(self._dirty) == {URLUtils.session_uuid(url, self.identity)}:
+            return
+        try:
+            self._capture_dirty()
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error(f"Error capturing session before leaving the domain: {e}")
+
+    def flush(self) -> None:
+        """
+        Captures the session of the domain currently loaded in the driver if it has unsaved
+        changes, then waits until every pending background write has completed.
+
+        Changes of other domains were already captured by before_navigation() when the driver left them.
+        """
+        if not self.write_behind:
+            return
+        try:
+            self._capture_dirty()
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error(f"Error capturing session during flush: {e}")
+        finally:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """
+        Flushes pending session changes and stops the background writer.
+        """
+        if self.write_behind:
+            self.flush()
+            self._writer.close()
+
+    def _capture_session(self) -> dict:
+        """
+        Reads cookies, local storage and session storage from the driver.
+
+        Both storages are read in one script call. With a DevTools engine, the cookies and both
+        storages are read in one pipelined batch over its socket.
+
+        Returns:
+            dict: The current session data.
+        """
+        engine = getattr(self.driver, 'cdp_engine', None)
+        if engine is not None:
+            return engine.capture_session()
+        local_storage, session_storage = self.driver.execute_script(
+            "return [Object.assign({}, window.localStorage), Object.assign({}, window.sessionStorage)];"
+        )
+        return {
+            'cookies': self.driver.get_cookies(),
+            'local_storage': local_storage,
+            'session_storage': session_storage
+        }
+
     def _save_session(self, domain: str, uuid: str) -> None:
         """
         Saves the current session's cookies, local storage, and session storage incrementally.
@@ -73,43 +292,54 @@ class SessionManager:
             Exception: If there is an issue with saving the session.
         """
         try:
-            if self.logger:
-                self.logger.log_info(f"Attempting to save session for domain: {domain} with UUID: {uuid}")
-            # Retrieve existing session data if any
-            try:
-                existing_session_data = self.strategy.load()
-                self.logger.log_info(f"Existing session data retrieved: {existing_session_data}")
-            except FileNotFoundError:
-                existing_session_data = None
+            with self.instrumentation.span('session.save', site=domain, driver=self._driver_label()):
                 if self.logger:
-                    self.logger.log_info("No existing session data found, creating new session data.")
-
-            # Get current session data
-            current_session_data = {
-                'cookies': self.driver.get_cookies(),
-                'local_storage': self.driver.execute_script("return window.localStorage;"),
-                'session_storage': self.driver.execute_script("return window.sessionStorage;")
-            }
-            if self.logger:
-                self.logger.log_debug(f"Current session data: {current_session_data}")
+                    self.logger.log_info(f"Attempting to save session for domain: {domain} with UUID: {uuid}")
+                if not self.write_behind and hasattr(self.strategy, 'merge'):
+                    # Incremental stores merge per entry, so the existing session need not be loaded
+                    current_session_data = self._capture_session()
+                    self.strategy.merge(current_session_data)
+                    self._bump_version(uuid)
+                    if self.logger:
+                        self.logger.log_info("Session merged incrementally.")
+                    return
 
-            # Merge and save session data
-            self._merge_session(existing_session_data, current_session_data)
+                # Retrieve existing session data if any, from memory when write-behind is enabled
+                if uuid in self._cache:
+                    existing_session_data = self._cache[uuid]
+                else:
+                    try:
+                        existing_session_data = self.strategy.load()
+                        self.logger.log_debug("Existing session data retrieved: %s", existing_session_data)
+                    except FileNotFoundError:
+                        existing_session_data = None
+                        if self.logger:
+                            self.logger.log_info("No existing session data found, creating new session data.")
 
-            if self.logger:
-                self.logger.log_info("Session saved successfully.")
+                # Get current session data
+                current_session_data = self._capture_session()
+                if self.logger:
+                    self.logger.log_debug("Current session data: %s", current_session_data)
+
+                # Merge and save session data
+                self._merge_session(existing_session_data, current_session_data, uuid)
+                self._dirty.pop(uuid, None)
+
+                if self.logger:
+                    self.logger.log_info("Session saved successfully.")
         except Exception as e:
             if self.logger:
                 self.logger.log_error(f"Error saving session: {e}")
             raise
         
-    def _merge_session(self, existing_session_data: dict, current_session_data: dict) -> None:
+    def _merge_session(self, existing_session_data: dict, current_session_data: dict, uuid: str = None) -> None:
         """
         Merges the existing session data with the current session data and saves it.
 
         Args:
             existing_session_data (dict): The existing session data.
             current_session_data (dict): The current session data to merge.
+            uuid (str, optional): The UUID of the session, used as the write-behind cache key.
 
         Raises:
             Exception: If there is an issue with saving the merged session.
@@ -126,18 +356,34 @@ class SessionManager:
                             existing_session_data[key].update(value)
                     else:
                         existing_session_data[key] = value
-                self.strategy.save(existing_session_data)
+                self._persist(uuid, existing_session_data)
                 if self.logger:
-                    self.logger.log_info(f"Merged existing session data: {existing_session_data}")
+                    self.logger.log_debug("Merged existing session data: %s", existing_session_data)
             else:
-                self.strategy.save(current_session_data)
+                self._persist(uuid, current_session_data)
                 if self.logger:
-                    self.logger.log_info(f"Saved new session data: {current_session_data}")
+                    self.logger.log_debug("Saved new session data: %s", current_session_data)
         except Exception as e:
             if self.logger:
                 self.logger.log_error(f"Error merging session data: {e}")
             raise
 
+    def _persist(self, uuid: str, session_data: dict) -> None:
+        """
+        Saves session data through the strategy, or hands a copy to the background writer
+        and keeps the merged data in memory when write-behind is enabled.
+
+        Args:
+            uuid (str): The UUID of the session.
+            session_data (dict): The merged session data.
+        """
+        if self.write_behind and uuid:
+            self._cache[uuid] = session_data
+            self._writer.submit(uuid, self.strategy, copy.deepcopy(session_data))
+        else:
+            self.strategy.save(session_data)
+        self._bump_version(uuid)
+
     def _merge_lists(self, existing_list: list, current_list: list) -> list:
         """
         Merges two lists of dictionaries, overwriting duplicates based on a key (e.g., 'name' for cookies).
@@ -155,33 +401,83 @@ class SessionManager:
             merged_dict[item[key_name]] = item
         return list(merged_dict.values())
 
-    def _restore_session(self, domain: str) -> None:
+    def _restore_cookies(self, cookies: list) -> None:
+        """
+        Adds all cookies with a single DevTools Network.setCookies command, falling back to one
+        add_cookie call per cookie when DevTools commands are not available.
+
+        Args:
+            cookies (list): The cookies to add, in WebDriver format.
+        """
+        if not cookies:
+            return
+        try:
+            DevTools(self.driver).execute('Network.setCookies', {'cookies': [DevTools.to_cdp_cookie(cookie) for cookie in cookies]})
+            return
+        except Exception as e:
+            if self.logger:
+                self.logger.log_debug(f"Bulk cookie restore unavailable, adding cookies one by one: {e}")
+        for cookie in cookies:
+            try:
+                self.driver.add_cookie(cookie)
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_error(f"Error adding cookie: {e}")
+
+    def _restore_storage(self, local_storage: dict, session_storage: dict) -> bool:
+        """
+        Writes local storage and session storage entries in one script call. Entries are passed as
+        script arguments, so keys and values are never spliced into JavaScript source.
+
+        Args:
+            local_storage (dict): The localStorage entries.
+            session_storage (dict): The sessionStorage entries.
+
+        Returns:
+            bool: True if the current page has already rendered content.
+        """
+        return self.driver.execute_script(
+            "var entries = [[window.localStorage, arguments[0]], [window.sessionStorage, arguments[1]]];"
+            "entries.forEach(function (pair) { Object.keys(pair[1]).forEach(function (key) { pair[0].setItem(key, pair[1][key]); }); });"
+            "return location.protocol.indexOf('http') === 0 && document.readyState !== 'loading'"
+            " && !!document.body && document.body.childElementCount > 0;",
+            local_storage, session_storage
+        )
+
+    def _restore_session(self, domain: str, uuid: str = None) -> None:
         """
         Restores the session for the given domain.
 
         Args:
             domain (str): The domain of the session to restore.
+            uuid (str, optional): The UUID of the session, used as the write-behind cache key.
 
         Raises:
             SessionNotFoundException: If the session file is not found.
             Exception: If there is an issue with restoring the session.
         """
         try:
-            session_data = self.strategy.load()
-            filtered_cookies = [cookie for cookie in session_data['cookies'] if domain in cookie['domain']]
-            for cookie in filtered_cookies:
-                try:
-                    self.driver.add_cookie(cookie)
-                except Exception as e:
-                    if self.logger:
-                        self.logger.log_error(f"Error adding cookie: {e}")
-            for key, value in session_data['local_storage'].items():
-                self.driver.execute_script(f"window.localStorage.setItem('{key}', '{value}');")
-            for key, value in session_data['session_storage'].items():
-                self.driver.execute_script(f"window.sessionStorage.setItem('{key}', '{value}');")
-            self.driver.refresh()
-            if self.logger:
-                self.logger.log_info("Session restored successfully.")
+            with self.instrumentation.span('session.restore', site=domain, driver=self._driver_label()) as span:
+                session_data = self.strategy.load()
+                if self.write_behind and uuid:
+                    self._cache[uuid] = session_data
+                filtered_cookies = [cookie for cookie in session_data['cookies'] if domain in cookie['domain']]
+                span['cookies'] = len(filtered_cookies)
+                local_storage, session_storage = session_data.get('local_storage') or {}, session_data.get('session_storage') or {}
+                engine = getattr(self.driver, 'cdp_engine', None)
+                if engine is not None:
+                    # Cookies, storage and the reload in one DevTools call
+                    rendered = engine.restore_session(filtered_cookies, local_storage, session_storage,
+                                                      refresh_unrendered=not self.skip_unrendered_refresh)
+                else:
+                    self._restore_cookies(filtered_cookies)
+                    rendered = self._restore_storage(local_storage, session_storage)
+                    if rendered or not self.skip_unrendered_refresh:
+                        self.driver.refresh()
+                if not rendered and self.skip_unrendered_refresh and self.logger:
+                    self.logger.log_debug("Page has not rendered yet, skipping refresh after restore.")
+                if self.logger:
+                    self.logger.log_info("Session restored successfully.")
         except FileNotFoundError:
             if self.logger:
                 self.logger.log_error("Session file not found.")
@@ -0,0 +1,81 @@
+# File: services/session/SessionWriter.py
+import threading
+from interfaces.LoggerInterface import LoggerInterface
+
+class SessionWriter:
+    def __init__(self, logger: LoggerInterface = None):
+        """
+        Initializes a background writer that persists session data off the interaction thread.
+
+        Writes are coalesced per key: if a key is submitted again before the previous data was
+        written, only the latest data is written.
+
+        Args:
+            logger (LoggerInterface): The logger instance for logging.
+        """
+        self.logger = logger
+        self._pending = {}
+        self._writing = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="SessionWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, key: str, strategy, session_data: dict) -> None:
+        """
+        Schedules session data to be saved with the given strategy.
+
+        Args:
+            key (str): The coalescing key, usually the session UUID.
+            strategy: The session strategy used to save the data.
+            session_data (dict): The data to save. It must not be mutated after submission.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("SessionWriter is closed.")
+            self._pending[key] = (strategy, session_data)
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending and self._closed:
+                    return
+                batch = self._pending
+                self._pending = {}
+                self._writing = True
+            for key, (strategy, session_data) in batch.items():
+                try:
+                    strategy.save(session_data)
+                    if self.logger:
+                        self.logger.log_debug(f"Session {key} written in background.")
+                except Exception as e:
+                    if self.logger:
+                        self.logger.log_error(f"Error writing session {key}: {e}")
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Blocks until every submitted write has been performed.
+
+        Args:
+            timeout (float, optional): Seconds to wait. None waits forever.
+
+        Returns:
+            bool: True if all writes completed, False on timeout.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._writing, timeout=timeout)
+
+    def close(self, timeout: float = None) -> None:
+        """
+        Flushes pending writes and stops the background thread.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
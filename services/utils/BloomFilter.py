@@ -0,0 +1,65 @@
+# File: services/utils/BloomFilter.py
+import hashlib
+import math
+
+class BloomFilter:
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.01, bits: bytearray = None):
+        """
+        Initializes a Bloom filter: a fixed-size bit array answering "definitely not added" or
+        "probably added". Memory is about 1.2 bytes per item at a 1% error rate, regardless of key length.
+
+        Args:
+            capacity (int): The number of items the filter is sized for. More items still work,
+                with a growing false positive rate.
+            error_rate (float): The target false positive rate at capacity.
+            bits (bytearray, optional): A previously saved bit array, see to_bytes.
+        """
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate between 0 and 1.")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        if bits is not None and len(bits) != (self.size + 7) // 8:
+            raise ValueError("Saved bit array does not match the filter size.")
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+
+    @staticmethod
+    def digest(key) -> bytes:
+        """
+        Returns the 16-byte digest of a key; callers that already hash their keys can pass it
+        to add/contains to avoid hashing twice.
+        """
+        if isinstance(key, str):
+            key = key.encode('utf-8')
+        return hashlib.blake2b(key, digest_size=16).digest()
+
+    def _positions(self, digest: bytes):
+        # Double hashing (Kirsch-Mitzenmacher): k positions from two 64-bit halves
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        for index in range(self.hashes):
+            yield (first + index * second) % self.size
+
+    def add(self, digest: bytes) -> bool:
+        """
+        Adds a digest to the filter.
+
+        Returns:
+            bool: True if it was definitely not present before.
+        """
+        added = False
+        bits = self.bits
+        for position in self._positions(digest):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                added = True
+        return added
+
+    def contains(self, digest: bytes) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.bits)
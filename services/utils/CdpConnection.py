@@ -0,0 +1,229 @@
+# File: services/utils/CdpConnection.py
+import itertools
+import json
+import threading
+import trio
+from trio_websocket import open_websocket_url, ConnectionClosed
+from selenium.common.exceptions import WebDriverException
+from interfaces.LoggerInterface import LoggerInterface
+
+MAX_MESSAGE_SIZE = 256 * 1024 * 1024
+
+class CdpError(WebDriverException):
+    pass
+
+class CdpConnection:
+    def __init__(self, ws_url: str, logger: LoggerInterface = None, timeout: float = 30.0):
+        """
+        Initializes a Chrome DevTools Protocol connection over a WebSocket, such as the one Selenium Grid
+        exposes for every session under the 'se:cdp' capability.
+
+        The socket is served by a trio event loop on a background thread, and callers use it synchronously.
+        Commands are pipelined: send_batch() writes every command before awaiting any response, so a batch
+        costs one round-trip instead of one per command. Events are dispatched to listeners, and a single
+        call to run() can combine commands with the events they trigger, e.g. a navigation and its load event.
+
+        Args:
+            ws_url (str): The DevTools WebSocket URL.
+            logger (LoggerInterface): The logger instance for logging.
+            timeout (float): Seconds to wait for a response or an awaited event.
+        """
+        self.ws_url = ws_url
+        self.logger = logger
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._waiters = []
+        self._listeners = {}
+        self._websocket = None
+        self._token = None
+        self._closing = None
+        self._error = None
+        self._ready = threading.Event()
+        self._thread = None
+
+    def open(self) -> "CdpConnection":
+        """
+        Connects the socket on a background thread.
+
+        Raises:
+            CdpError: If the connection cannot be opened within the timeout.
+        """
+        self._thread = threading.Thread(target=trio.run, args=(self._serve,), name='cdp-connection', daemon=True)
+        self._thread.start()
+        if not self._ready.wait(self.timeout):
+            raise CdpError(f"Timed out connecting to DevTools at {self.ws_url}")
+        if self._error is not None:
+            raise CdpError(f"Cannot connect to DevTools at {self.ws_url}: {self._error}")
+        if self.logger:
+            self.logger.log_debug("DevTools connection opened: %s", self.ws_url)
+        return self
+
+    @property
+    def connected(self) -> bool:
+        return self._websocket is not None and not self._websocket.closed
+
+    async def _serve(self) -> None:
+        try:
+            async with open_websocket_url(self.ws_url, max_message_size=MAX_MESSAGE_SIZE,
+                                          connect_timeout=self.timeout) as websocket:
+                self._websocket = websocket
+                self._token = trio.lowlevel.current_trio_token()
+                self._closing = trio.Event()
+                self._ready.set()
+                async with trio.open_nursery() as nursery:
+                    nursery.start_soon(self._read)
+                    await self._closing.wait()
+                    nursery.cancel_scope.cancel()
+        except Exception as e:
+            # Report the cause rather than the nursery's exception group around it
+            while len(getattr(e, 'exceptions', ())) == 1:
+                e = e.exceptions[0]
+            self._error = e.__cause__ or e
+            if self.logger and self._ready.is_set():
+                self.logger.log_error(f"DevTools connection to {self.ws_url} failed: {e}")
+        finally:
+            self._ready.set()
+            # Wake up every caller still waiting, so none of them hangs until its timeout
+            for slot in self._pending.values():
+                slot['error'] = {'message': 'DevTools connection closed'}
+                slot['event'].set()
+            self._pending.clear()
+
+    async def _read(self) -> None:
+        try:
+            while True:
+                message = json.loads(await self._websocket.get_message())
+                if 'id' in message:
+                    slot = self._pending.pop(message['id'], None)
+                    if slot is not None:
+                        slot['result'] = message.get('result', {})
+                        slot['error'] = message.get('error')
+                        slot['event'].set()
+                    continue
+                self._dispatch(message)
+        except ConnectionClosed:
+            self._closing.set()
+
+    def _dispatch(self, message: dict) -> None:
+        method, session_id = message.get('method'), message.get('sessionId')
+        params = message.get('params', {})
+        for waiter in list(self._waiters):
+            if waiter['method'] == method and waiter['session_id'] in (None, session_id):
+                self._waiters.remove(waiter)
+                waiter['params'] = params
+                waiter['event'].set()
+        for callback in self._listeners.get(method, ()):
+            try:
+                callback(params, session_id)
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_error(f"DevTools listener for {method} failed: {e}")
+
+    # Coroutines below run on the connection's event loop, through run()
+
+    async def send_batch(self, commands: list, session_id: str = None) -> list:
+        """
+        Sends all commands, then awaits all of their responses.
+
+        Args:
+            commands (list): (method, params) pairs.
+            session_id (str, optional): The attached target the commands go to.
+
+        Returns:
+            list: The result of each command, in order.
+
+        Raises:
+            CdpError: If a command failed or did not answer within the timeout.
+        """
+        slots = {}
+        for method, params in commands:
+            message = {'id': next(self._ids), 'method': method, 'params': params or {}}
+            if session_id:
+                message['sessionId'] = session_id
+            slot = {'method': method, 'event': trio.Event()}
+            self._pending[message['id']] = slots[message['id']] = slot
+            await self._websocket.send_message(json.dumps(message))
+        with trio.move_on_after(self.timeout) as scope:
+            for slot in slots.values():
+                await slot['event'].wait()
+        slots, ids = list(slots.values()), list(slots)
+        if scope.cancelled_caught:
+            for command_id in ids:
+                self._pending.pop(command_id, None)
+            raise CdpError(f"DevTools command {slots[-1]['method']} timed out after {self.timeout}s")
+        for slot in slots:
+            if slot.get('error'):
+                raise CdpError(f"DevTools command {slot['method']} failed: {slot['error'].get('message')}")
+        return [slot['result'] for slot in slots]
+
+    async def send(self, method: str, params: dict = None, session_id: str = None) -> dict:
+        return (await self.send_batch([(method, params)], session_id))[0]
+
+    def expect(self, method: str, session_id: str = None) -> dict:
+        """
+        Registers interest in the next occurrence of an event. Register before sending the command that
+        triggers it, so a fast event is not missed, then pass the returned waiter to wait_event().
+        """
+        waiter = {'method': method, 'session_id': session_id, 'event': trio.Event(), 'params': None}
+        self._waiters.append(waiter)
+        return waiter
+
+    def discard(self, waiter: dict) -> None:
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+
+    async def wait_event(self, waiter: dict, timeout: float = None) -> dict:
+        """
+        Awaits an event registered with expect().
+
+        Returns:
+            dict: The event's params.
+
+        Raises:
+            CdpError: If the event did not occur within the timeout.
+        """
+        with trio.move_on_after(timeout or self.timeout) as scope:
+            await waiter['event'].wait()
+        if scope.cancelled_caught:
+            self.discard(waiter)
+            raise CdpError(f"DevTools event {waiter['method']} did not arrive within {timeout or self.timeout}s")
+        return waiter['params']
+
+    # Synchronous API, callable from any other thread
+
+    def run(self, async_fn, *args):
+        """
+        Runs a coroutine function on the connection's event loop and returns its result.
+        """
+        if not self.connected:
+            raise CdpError(f"DevTools connection to {self.ws_url} is closed")
+        return trio.from_thread.run(async_fn, *args, trio_token=self._token)
+
+    def execute(self, method: str, params: dict = None, session_id: str = None) -> dict:
+        return self.run(self.send, method, params, session_id)
+
+    def execute_many(self, commands: list, session_id: str = None) -> list:
+        return self.run(self.send_batch, commands, session_id)
+
+    def add_listener(self, method: str, callback) -> None:
+        """
+        Calls callback(params, session_id) for every event of the given method. Callbacks run on the
+        connection's thread and must not block or call back into the connection synchronously.
+        """
+        self._listeners.setdefault(method, []).append(callback)
+
+    def remove_listener(self, method: str, callback) -> None:
+        if callback in self._listeners.get(method, ()):
+            self._listeners[method].remove(callback)
+
+    def close(self) -> None:
+        if self._token is not None and self._thread.is_alive():
+            try:
+                trio.from_thread.run_sync(self._closing.set, trio_token=self._token)
+            except trio.RunFinishedError:
+                pass
+            self._thread.join(self.timeout)
+        self._websocket = None
+        if self.logger:
+            self.logger.log_debug("DevTools connection closed: %s", self.ws_url)
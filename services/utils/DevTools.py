@@ -0,0 +1,68 @@
+# File: services/utils/DevTools.py
+
+class DevTools:
+    def __init__(self, driver):
+        """
+        Initializes a thin wrapper for sending Chrome DevTools Protocol commands through a WebDriver session.
+
+        Works with local Chrome drivers (execute_cdp_cmd) and with remote drivers whose connection
+        registers the 'executeCdpCommand' endpoint, such as ChromeRemoteConnection. Drivers of a
+        ChromeCdpRemote engine send the commands over its DevTools WebSocket instead.
+
+        Args:
+            driver: The WebDriver instance.
+        """
+        self.driver = driver
+
+    def execute(self, cmd: str, params: dict = None) -> dict:
+        """
+        Executes a DevTools command.
+
+        Args:
+            cmd (str): The command name, e.g. 'Network.setCookies'.
+            params (dict, optional): The command parameters.
+
+        Returns:
+            dict: The command result.
+
+        Raises:
+            Exception: If the driver or the remote end does not support DevTools commands.
+        """
+        engine = getattr(self.driver, 'cdp_engine', None)
+        if engine is not None and engine.cdp.connected:
+            return engine.execute(cmd, params)
+        if hasattr(self.driver, 'execute_cdp_cmd'):
+            return self.driver.execute_cdp_cmd(cmd, params or {})
+        return self.driver.execute("executeCdpCommand", {"cmd": cmd, "params": params or {}})["value"]
+
+    @staticmethod
+    def to_cdp_cookie(cookie: dict) -> dict:
+        """
+        Converts a WebDriver cookie dict to a Network.CookieParam.
+
+        Args:
+            cookie (dict): A cookie as returned by driver.get_cookies().
+
+        Returns:
+            dict: The cookie in DevTools format.
+        """
+        cdp_cookie = {key: cookie[key] for key in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite') if key in cookie}
+        if 'expiry' in cookie:
+            cdp_cookie['expires'] = cookie['expiry']
+        return cdp_cookie
+
+    @staticmethod
+    def from_cdp_cookie(cookie: dict) -> dict:
+        """
+        Converts a Network.Cookie to the WebDriver cookie format.
+
+        Args:
+            cookie (dict): A cookie as returned by Network.getCookies.
+
+        Returns:
+            dict: The cookie in WebDriver format.
+        """
+        webdriver_cookie = {key: cookie[key] for key in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite') if key in cookie}
+        if not cookie.get('session') and cookie.get('expires', -1) > 0:
+            webdriver_cookie['expiry'] = int(cookie['expires'])
+        return webdriver_cookie
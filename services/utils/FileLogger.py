@@ -1,15 +1,22 @@
 # File: services/FileLogger.py
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 from interfaces.LoggerInterface import LoggerInterface
-import inspect
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(caller_module)s - %(caller_funcName)s - %(caller_lineno)d - %(message)s'
 
 class CustomLogRecord(logging.LogRecord):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        frame = inspect.stack()[6]
-        self.caller_module = frame.filename.split('/')[-1]
-        self.caller_funcName = frame.function
-        self.caller_lineno = frame.lineno
+        # Records are only created for enabled levels, and the caller was already located by
+        # Logger.findCaller with a plain frame walk (FileLogger passes stacklevel so the wrapper
+        # method is skipped), so no stack inspection is needed here.
+        self.caller_module = os.path.basename(self.pathname)
+        self.caller_funcName = self.funcName
+        self.caller_lineno = self.lineno
 
 def log_record_factory(*args, **kwargs):
     record = CustomLogRecord(*args, **kwargs)
@@ -17,20 +24,64 @@ def log_record_factory(*args, **kwargs):
 
 logging.setLogRecordFactory(log_record_factory)
 
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that merges the message arguments and renders any traceback on the caller thread,
+    so later changes to the logged objects don't leak into the record. Applying the Formatter (time,
+    level, caller) and writing the file are left to the listener thread.
+    """
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
 class FileLogger(LoggerInterface):
-    def __init__(self, log_file='app.log', log_level=logging.INFO):
-        logging.basicConfig(
-            filename=log_file,
-            level=log_level,
-            format='%(asctime)s - %(levelname)s - %(caller_module)s - %(caller_funcName)s - %(caller_lineno)d - %(message)s'
-        )
+    def __init__(self, log_file='app.log', log_level=logging.INFO, async_mode=False):
+        """
+        Initializes the FileLogger.
+
+        Args:
+            log_file (str): The path to the log file.
+            log_level: The minimum level to log.
+            async_mode (bool): If True, records are passed through a queue to a background thread
+                that applies the log format and writes the file, so callers never block on disk I/O.
+                Message arguments are still merged on the calling thread.
+        """
+        self.listener = None
+        if async_mode:
+            file_handler = logging.FileHandler(log_file)
+            file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            log_queue = queue.SimpleQueue()
+            logging.basicConfig(level=log_level, handlers=[_DeferredQueueHandler(log_queue)])
+            self.listener = logging.handlers.QueueListener(log_queue, file_handler)
+            self.listener.start()
+            atexit.register(self.close)
+        else:
+            logging.basicConfig(
+                filename=log_file,
+                level=log_level,
+                format=LOG_FORMAT
+            )
         self.logger = logging.getLogger()
 
-    def log_info(self, message: str):
-        self.logger.info(message)
+    # Messages may use %-style placeholders with separate args so that formatting only
+    # happens for records that are actually emitted.
+    def log_info(self, message: str, *args):
+        self.logger.info(message, *args, stacklevel=2)
+
+    def log_error(self, message: str, *args):
+        self.logger.error(message, *args, stacklevel=2)
 
-    def log_error(self, message: str):
-        self.logger.error(message)
+    def log_debug(self, message: str, *args):
+        self.logger.debug(message, *args, stacklevel=2)
 
-    def log_debug(self, message: str):
-        self.logger.debug(message)
+    def close(self):
+        """
+        Stops the background listener, writing any queued records first.
+        """
+        if self.listener:
+            self.listener.stop()
+            self.listener = None
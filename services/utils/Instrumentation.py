@@ -0,0 +1,69 @@
+# File: services/utils/Instrumentation.py
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+class Instrumentation:
+    def __init__(self):
+        """
+        Initializes an event bus for timing spans. Any number of subscribers can listen to an event,
+        or to every event with '*'. With no subscribers, spans cost almost nothing.
+
+        Events emitted by the framework:
+            interaction, navigation.before, navigation, page_source, http.fetch, cache.hit,
+            session.validate, session.save, session.restore, auth.check, driver.recycle
+        """
+        self._subscribers = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, event: str, callback) -> None:
+        """
+        Registers a callback called as callback(event, payload).
+
+        Args:
+            event (str): The event name, or '*' for every event.
+            callback (callable): The subscriber.
+        """
+        with self._lock:
+            self._subscribers[event].append(callback)
+
+    def unsubscribe(self, event: str, callback) -> None:
+        with self._lock:
+            if callback in self._subscribers.get(event, []):
+                self._subscribers[event].remove(callback)
+
+    def enabled(self) -> bool:
+        return any(self._subscribers.values())
+
+    def emit(self, event: str, **payload) -> None:
+        """
+        Delivers an event to its subscribers. Subscriber errors are swallowed so instrumentation
+        can never break an interaction.
+        """
+        callbacks = self._subscribers.get(event, []) + self._subscribers.get('*', [])
+        for callback in callbacks:
+            try:
+                callback(event, payload)
+            except Exception:
+                pass
+
+    @contextmanager
+    def span(self, event: str, **payload):
+        """
+        Times the enclosed block and emits the event with 'duration' (seconds) and 'error' added.
+        The yielded payload dict may be updated inside the block, e.g. with 'bytes'.
+        """
+        if not self.enabled():
+            yield payload
+            return
+        start = time.perf_counter()
+        payload['error'] = None
+        try:
+            yield payload
+        except Exception as e:
+            payload['error'] = type(e).__name__
+            raise
+        finally:
+            payload['duration'] = time.perf_counter() - start
+            self.emit(event, **payload)
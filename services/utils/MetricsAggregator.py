@@ -0,0 +1,108 @@
+# File: services/utils/MetricsAggregator.py
+import bisect
+import json
+import os
+import threading
+import time
+
+# Latency histogram upper bounds in seconds, Prometheus style
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class MetricsAggregator:
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        """
+        Initializes an Instrumentation subscriber that aggregates span events into counters and
+        latency histograms per (event, site, driver).
+
+        Args:
+            buckets (tuple): Histogram upper bounds in seconds.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def attach(self, instrumentation) -> "MetricsAggregator":
+        instrumentation.subscribe('*', self)
+        return self
+
+    def __call__(self, event: str, payload: dict) -> None:
+        labels = (event, str(payload.get('site') or ''), str(payload.get('driver') or ''))
+        duration = payload.get('duration')
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = {'count': 0, 'errors': 0, 'bytes': 0, 'sum': 0.0, 'buckets': [0] * (len(self.buckets) + 1)}
+                self._series[labels] = series
+            series['count'] += 1
+            if payload.get('error'):
+                series['errors'] += 1
+            series['bytes'] += payload.get('bytes') or 0
+            if duration is not None:
+                series['sum'] += duration
+                series['buckets'][bisect.bisect_left(self.buckets, duration)] += 1
+
+    def snapshot(self) -> dict:
+        """
+        Returns the aggregated metrics as a JSON-serializable dict.
+        """
+        with self._lock:
+            series = [
+                {'event': event, 'site': site, 'driver': driver, **{key: (list(value) if key == 'buckets' else value) for key, value in data.items()}}
+                for (event, site, driver), data in sorted(self._series.items())
+            ]
+        return {'timestamp': time.time(), 'buckets': list(self.buckets), 'series': series}
+
+    def to_prometheus(self) -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+        """
+        lines = [
+            '# HELP scraper_events_total Events emitted by the scraper.',
+            '# TYPE scraper_events_total counter',
+        ]
+        snapshot = self.snapshot()
+        for item in snapshot['series']:
+            lines.append(f"scraper_events_total{{{self._labels(item)}}} {item['count']}")
+        lines += ['# HELP scraper_errors_total Events that ended with an error.', '# TYPE scraper_errors_total counter']
+        for item in snapshot['series']:
+            lines.append(f"scraper_errors_total{{{self._labels(item)}}} {item['errors']}")
+        lines += ['# HELP scraper_bytes_total Payload bytes transferred.', '# TYPE scraper_bytes_total counter']
+        for item in snapshot['series']:
+            lines.append(f"scraper_bytes_total{{{self._labels(item)}}} {item['bytes']}")
+        lines += ['# HELP scraper_duration_seconds Event duration.', '# TYPE scraper_duration_seconds histogram']
+        for item in snapshot['series']:
+            labels = self._labels(item)
+            cumulative = 0
+            for bound, count in zip(list(self.buckets) + ['+Inf'], item['buckets']):
+                cumulative += count
+                lines.append(f'scraper_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"scraper_duration_seconds_sum{{{labels}}} {item['sum']}")
+            lines.append(f"scraper_duration_seconds_count{{{labels}}} {cumulative}")
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _labels(item: dict) -> str:
+        escape = lambda value: value.replace('\\', '\\\\').replace('"', '\\"')
+        return f'event="{escape(item["event"])}",site="{escape(item["site"])}",driver="{escape(item["driver"])}"'
+
+    @staticmethod
+    def _write_atomic(path: str, content: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as file:
+            file.write(content)
+        os.replace(temp_path, path)
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Writes the metrics as a Prometheus text file, e.g. for the node_exporter textfile collector.
+        """
+        self._write_atomic(path, self.to_prometheus())
+
+    def write_json(self, path: str) -> None:
+        """
+        Writes a JSON snapshot of the metrics.
+        """
+        self._write_atomic(path, json.dumps(self.snapshot(), indent=2))
@@ -0,0 +1,150 @@
+# File: services/utils/PageReadiness.py
+import time
+from collections import deque
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from interfaces.LoggerInterface import LoggerInterface
+
+class PageReadiness:
+    def __init__(self, driver, logger: LoggerInterface = None, timeout: float = 10, poll_initial: float = 0.05,
+                 poll_max: float = 0.5, backoff: float = 1.5):
+        """
+        Initializes a helper that waits for declared readiness conditions instead of fixed sleeps.
+
+        Conditions are callables that take the driver and return a truthy value once satisfied.
+        Polling starts at poll_initial seconds and grows by backoff up to poll_max, so fast pages
+        return almost immediately while slow pages are not hammered with commands.
+
+        Args:
+            driver: The WebDriver instance.
+            logger (LoggerInterface): The logger instance for logging.
+            timeout (float): The default timeout in seconds.
+            poll_initial (float): The first polling interval in seconds.
+            poll_max (float): The maximum polling interval in seconds.
+            backoff (float): The factor applied to the polling interval after each attempt.
+        """
+        self.driver = driver
+        self.logger = logger
+        self.timeout = timeout
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.backoff = backoff
+        self.timings = deque(maxlen=1000)
+
+    def wait_for(self, condition, timeout: float = None, description: str = None):
+        """
+        Polls a condition until it returns a truthy value.
+
+        Args:
+            condition (callable): Takes the driver and returns a truthy value when ready.
+            timeout (float, optional): Overrides the default timeout.
+            description (str, optional): A label for logs and recorded timings.
+
+        Returns:
+            The first truthy value returned by the condition.
+
+        Raises:
+            TimeoutException: If the condition is not met in time.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        description = description or getattr(condition, '__name__', 'condition')
+        start = time.monotonic()
+        deadline = start + timeout
+        interval = self.poll_initial
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                result = condition(self.driver)
+            except WebDriverException:
+                result = None
+            now = time.monotonic()
+            if result:
+                self._record(description, now - start, attempts, True)
+                return result
+            if now >= deadline:
+                self._record(description, now - start, attempts, False)
+                raise TimeoutException(f"Timed out after {timeout}s waiting for {description}.")
+            time.sleep(min(interval, deadline - now))
+            interval = min(interval * self.backoff, self.poll_max)
+
+    def _record(self, description: str, elapsed: float, attempts: int, ready: bool) -> None:
+        self.timings.append({'condition': description, 'elapsed': elapsed, 'attempts': attempts, 'ready': ready})
+        if self.logger:
+            self.logger.log_debug(f"Waited {elapsed:.3f}s for {description} ({attempts} polls, ready={ready}).")
+
+    @staticmethod
+    def element_present(by: str, value: str):
+        """
+        Ready when an element matching the locator exists. Returns the element.
+        """
+        def condition(driver):
+            elements = driver.find_elements(by, value)
+            return elements[0] if elements else None
+        condition.__name__ = f"element {by}={value}"
+        return condition
+
+    @staticmethod
+    def element_interactable(by: str, value: str):
+        """
+        Ready when an element matching the locator is displayed and enabled. Returns the element.
+        """
+        def condition(driver):
+            for element in driver.find_elements(by, value):
+                if element.is_displayed() and element.is_enabled():
+                    return element
+            return None
+        condition.__name__ = f"interactable {by}={value}"
+        return condition
+
+    @staticmethod
+    def url_changed(old_url: str):
+        """
+        Ready when the current URL differs from old_url. Returns the new URL.
+        """
+        def condition(driver):
+            current_url = driver.current_url
+            return current_url if current_url != old_url else None
+        condition.__name__ = f"URL change from {old_url}"
+        return condition
+
+    @staticmethod
+    def document_ready(states: tuple = ('interactive', 'complete')):
+        """
+        Ready when document.readyState is one of the given states.
+        """
+        def condition(driver):
+            return driver.execute_script("return document.readyState;") in states
+        condition.__name__ = f"document readyState in {states}"
+        return condition
+
+    @staticmethod
+    def js_predicate(script: str, *args):
+        """
+        Ready when the script returns a truthy value. The script must use 'return'.
+        """
+        def condition(driver):
+            return driver.execute_script(script, *args)
+        condition.__name__ = f"script {script[:40]}"
+        return condition
+
+    @staticmethod
+    def network_idle(idle_ms: int = 500):
+        """
+        Ready when the document has loaded and no new resource has started loading for idle_ms.
+
+        Resource activity is measured in the page through the Performance API, in one script call
+        per poll: the condition keeps the resource count and the time it last changed.
+        """
+        state = {'count': -1, 'since': 0.0}
+
+        def condition(driver):
+            complete, count = driver.execute_script(
+                "return [document.readyState === 'complete', performance.getEntriesByType('resource').length];"
+            )
+            now = time.monotonic()
+            if count != state['count']:
+                state['count'], state['since'] = count, now
+                return False
+            return complete and (now - state['since']) * 1000 >= idle_ms
+        condition.__name__ = f"network idle {idle_ms}ms"
+        return condition
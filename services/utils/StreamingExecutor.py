@@ -0,0 +1,74 @@
+# File: services/utils/StreamingExecutor.py
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterable, Iterator, Tuple
+
+class StreamingExecutor:
+    def __init__(self, workers: int = 4, max_pending: int = None):
+        """
+        Initializes a thread-backed executor that consumes its input lazily.
+
+        Args:
+            workers (int): The number of worker threads.
+            max_pending (int, optional): The maximum number of submitted but not yet yielded items.
+                Defaults to twice the number of workers, which bounds memory regardless of input size.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        self.workers = workers
+        self.max_pending = max_pending or workers * 2
+
+    def map(self, fn: Callable, items: Iterable, ordered: bool = False) -> Iterator[Tuple[int, object, object, Exception]]:
+        """
+        Applies fn to every item and yields results as they complete.
+
+        Only max_pending items are pulled from the input at any time, so the input may be
+        an arbitrarily large iterator. Exceptions raised by fn are captured per item instead of
+        aborting the whole run.
+
+        Args:
+            fn (Callable): The function to apply to each item.
+            items (Iterable): The items to process.
+            ordered (bool): If True, results are yielded in input order.
+
+        Yields:
+            tuple: (index, item, result, error) where exactly one of result or error is meaningful.
+        """
+        iterator = enumerate(items)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque() if ordered else set()
+            exhausted = False
+
+            def fill():
+                nonlocal exhausted
+                while not exhausted and len(pending) < self.max_pending:
+                    try:
+                        index, item = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        return
+                    future = executor.submit(fn, item)
+                    future.index, future.item = index, item
+                    if ordered:
+                        pending.append(future)
+                    else:
+                        pending.add(future)
+
+            fill()
+            try:
+                while pending:
+                    if ordered:
+                        done = [pending.popleft()]
+                        wait(done)
+                    else:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        pending.difference_update(done)
+                    for future in done:
+                        error = future.exception()
+                        result = None if error else future.result()
+                        yield future.index, future.item, result, error
+                    fill()
+            finally:
+                # The consumer may stop early; don't start work nobody will read
+                for future in pending:
+                    future.cancel()
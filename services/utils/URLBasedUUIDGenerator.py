@@ -1,5 +1,5 @@
 import uuid
-from urllib.parse import urlparse
+from services.utils.URLUtils import URLUtils
 
 class URLBasedUUIDGenerator:
     def __init__(self, namespace=uuid.NAMESPACE_URL):
@@ -7,30 +7,26 @@ class URLBasedUUIDGenerator:
 
     def extract_domain(self, url: str) -> str:
         """
-        Extract the domain with TLD from the URL.
+        Extract the registrable domain from the URL, e.g. 'example.co.uk' for 'https://books.example.co.uk/'.
         
         Args:
             url (str): The URL to extract the domain from.
         
         Returns:
-            str: The extracted domain with TLD.
+            str: The domain under its public suffix, or the host itself for IP addresses and local hosts.
         """
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc
-        parts = domain.split('.')
-        if len(parts) > 2:
-            domain = '.'.join(parts[-2:])
-        return domain
+        return URLUtils.registrable_domain(url)
 
-    def get_uuid(self, url: str) -> str:
+    def get_uuid(self, url: str, identity: str = None) -> str:
         """
         Generate a UUID based on the provided URL.
         
         Args:
             url (str): The URL to generate a UUID for.
+            identity (str, optional): The account the session belongs to. Without one, the UUID
+                depends on the domain only.
         
         Returns:
             str: The generated UUID as a string.
         """
-        domain_with_tld = self.extract_domain(url)
-        return str(uuid.uuid5(self.namespace, domain_with_tld))
+        return URLUtils.session_uuid(url, identity, self.namespace)
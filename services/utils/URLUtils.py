@@ -0,0 +1,157 @@
+# File: services/utils/URLUtils.py
+import ipaddress
+import os
+import threading
+import uuid
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit
+from config import Config
+
+BUNDLED_SUFFIX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'public_suffix_list.dat')
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+MEMO_SIZE = 8192
+
+# Trie node markers: a rule ends here, or an exception rule ('!') ends here
+_RULE, _EXCEPTION = '$', '!'
+
+class PublicSuffixTrie:
+    def __init__(self, rules):
+        """
+        Initializes a trie of public suffix rules, keyed by labels from the TLD inwards.
+
+        Args:
+            rules (Iterable[str]): Rules in Public Suffix List format, e.g. 'co.uk', '*.ck' or '!www.ck'.
+                Comments and blank lines are ignored.
+        """
+        self.root = {}
+        for line in rules:
+            rule = line.strip().split(' ')[0].lower()
+            if not rule or rule.startswith('//'):
+                continue
+            exception = rule.startswith('!')
+            node = self.root
+            for label in reversed(rule.lstrip('!').split('.')):
+                node = node.setdefault(label, {})
+            node[_EXCEPTION if exception else _RULE] = True
+
+    @classmethod
+    def load(cls, path: str) -> "PublicSuffixTrie":
+        with open(path, encoding='utf-8') as file:
+            return cls(file)
+
+    def public_suffix_length(self, labels: list) -> int:
+        """
+        Returns how many trailing labels of a host form its public suffix. Hosts whose TLD has no rule
+        use the implicit '*' rule, so their suffix is the TLD.
+
+        Args:
+            labels (list): The host's labels, e.g. ['books', 'example', 'co', 'uk'].
+        """
+        length = 1
+        node = self.root
+        for depth, label in enumerate(reversed(labels), start=1):
+            wildcard = node.get('*')
+            node = node.get(label)
+            if node is not None and _EXCEPTION in node:
+                # An exception rule makes its parent the public suffix
+                return depth - 1
+            if node is not None and _RULE in node:
+                length = depth
+            elif wildcard is not None and _RULE in wildcard:
+                length = depth
+            if node is None:
+                break
+        return length
+
+    def registrable_domain(self, host: str) -> str:
+        """
+        Returns the public suffix plus one label, e.g. 'example.co.uk' for 'books.example.co.uk'.
+        A host that is itself a public suffix is returned unchanged.
+        """
+        labels = host.split('.')
+        suffix = self.public_suffix_length(labels)
+        return '.'.join(labels[-(suffix + 1):]) if len(labels) > suffix else host
+
+_trie = None
+_trie_lock = threading.Lock()
+
+def _suffix_trie() -> PublicSuffixTrie:
+    global _trie
+    if _trie is None:
+        with _trie_lock:
+            if _trie is None:
+                _trie = PublicSuffixTrie.load(Config.PUBLIC_SUFFIX_FILE or BUNDLED_SUFFIX_FILE)
+    return _trie
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+class URLUtils:
+    """
+    URL helpers shared by session lookup, caching, deduplication and pacing. Results are memoized in
+    bounded LRU caches, since the same few domains and URLs are looked up on every interaction.
+    """
+
+    @staticmethod
+    @lru_cache(maxsize=MEMO_SIZE)
+    def host(url: str) -> str:
+        """
+        Returns the URL's lower-case host without port or credentials.
+        """
+        return (urlsplit(url).hostname or '').rstrip('.')
+
+    @staticmethod
+    @lru_cache(maxsize=MEMO_SIZE)
+    def registrable_domain(url: str) -> str:
+        """
+        Returns the domain a site registered under its public suffix, e.g. 'example.co.uk' for
+        'https://books.example.co.uk/x'. IP addresses and single-label hosts such as 'localhost'
+        are returned as they are.
+        """
+        host = URLUtils.host(url)
+        if not host or '.' not in host or _is_ip(host):
+            return host
+        return _suffix_trie().registrable_domain(host)
+
+    @staticmethod
+    @lru_cache(maxsize=MEMO_SIZE)
+    def session_uuid(url: str, identity: str = None, namespace: uuid.UUID = uuid.NAMESPACE_URL) -> str:
+        """
+        Returns the UUID of the session for the URL's registrable domain and, optionally, an identity.
+        """
+        key = URLUtils.registrable_domain(url)
+        if identity:
+            key = f"{key}#{identity}"
+        return str(uuid.uuid5(namespace, key))
+
+    @staticmethod
+    @lru_cache(maxsize=MEMO_SIZE)
+    def canonicalize(url: str) -> str:
+        """
+        Returns a canonical form of the URL for cache keys and deduplication: lower-case scheme and host,
+        no default port, '/' for an empty path, query parameters sorted by name (keeping their encoding
+        and the order of repeated names) and no fragment.
+        """
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or '').rstrip('.')
+        if ':' in host:
+            host = f"[{host}]"
+        if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+            host = f"{host}:{parts.port}"
+        query = '&'.join(sorted((pair for pair in parts.query.split('&') if pair), key=lambda pair: pair.split('=', 1)[0]))
+        return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+    @staticmethod
+    def memo_stats() -> dict:
+        """
+        Returns the hits, misses and size of each memo.
+        """
+        return {
+            name: getattr(URLUtils, name).cache_info()._asdict()
+            for name in ('host', 'registrable_domain', 'session_uuid', 'canonicalize')
+        }